@@ -0,0 +1,144 @@
+"""
+puiastreDeBoorRibbon: de Boor ribbon solver in a single node.
+
+Takes the control world matrices and the joint parameters and outputs every joint world matrix in one compute, with
+the vectorized basis of de_boor_core_002 (see de_boor_core_002.ribbon_matrices). Replaces the wtAddMatrix, aimMatrix,
+pickMatrix and multMatrix network of de_boor_ribbon when it is built with mode=NODE.
+"""
+
+import maya.api.OpenMaya as om
+import numpy as np
+
+from puiastreTools.utils import de_boor_core_002 as de_boor
+
+
+def maya_useNewAPI():
+    pass
+
+
+class DeBoorRibbonNode(om.MPxNode):
+    type_name = de_boor.RIBBON_NODE_TYPE
+    # Local / development range (0x00000 - 0x7FFFF), no block is registered with Autodesk for these tools. Keep it
+    # unique among the studio plug-ins and move it to a registered block before .mb files with it are shipped
+    type_id = om.MTypeId(0x0007A5C0)
+
+    control_matrix = None
+    parameter = None
+    degree = None
+    knot_type = None
+    aim_axis = None
+    up_axis = None
+    tangent_offset = None
+    use_scale = None
+    negate_secondary = None
+    align = None
+    output_matrix = None
+
+    def compute(self, plug, data):
+        if plug != self.output_matrix and not (plug.isElement and plug.array() == self.output_matrix):
+            return None
+
+        matrices = []
+        control_handle = data.inputArrayValue(self.control_matrix)
+        for i in range(len(control_handle)):
+            control_handle.jumpToPhysicalElement(i)
+            matrices.append(list(control_handle.inputValue().asMatrix()))
+
+        params = []
+        parameter_handle = data.inputArrayValue(self.parameter)
+        for i in range(len(parameter_handle)):
+            parameter_handle.jumpToPhysicalElement(i)
+            params.append(parameter_handle.inputValue().asDouble())
+
+        degree = data.inputValue(self.degree).asInt()
+        output_handle = data.outputArrayValue(self.output_matrix)
+        builder = output_handle.builder()
+
+        if len(matrices) > degree >= 1 and params:
+            result = de_boor.ribbon_matrices(
+                np.array(matrices), params, degree,
+                kv_type=de_boor.PERIODIC if data.inputValue(self.knot_type).asShort() else de_boor.OPEN,
+                aim_axis=de_boor.AXIS_NAMES[data.inputValue(self.aim_axis).asShort()],
+                up_axis=de_boor.AXIS_NAMES[data.inputValue(self.up_axis).asShort()],
+                tangent_offset=data.inputValue(self.tangent_offset).asDouble(),
+                use_scale=data.inputValue(self.use_scale).asBool(),
+                negate_secondary=data.inputValue(self.negate_secondary).asBool(),
+                align=data.inputValue(self.align).asBool(),
+            )
+            for i, matrix in enumerate(result):
+                builder.addElement(i).setMMatrix(om.MMatrix(matrix.ravel().tolist()))
+
+        output_handle.set(builder)
+        output_handle.setAllClean()
+        data.setClean(plug)
+
+    @classmethod
+    def creator(cls):
+        return cls()
+
+    @classmethod
+    def initialize(cls):
+        matrix_attr = om.MFnMatrixAttribute()
+        numeric_attr = om.MFnNumericAttribute()
+        enum_attr = om.MFnEnumAttribute()
+
+        cls.control_matrix = matrix_attr.create("controlMatrix", "cm", om.MFnMatrixAttribute.kDouble)
+        matrix_attr.array = True
+        matrix_attr.readable = False
+
+        cls.parameter = numeric_attr.create("parameter", "p", om.MFnNumericData.kDouble, 0.0)
+        numeric_attr.array = True
+        numeric_attr.readable = False
+
+        cls.degree = numeric_attr.create("degree", "d", om.MFnNumericData.kInt, 3)
+        numeric_attr.setMin(1)
+
+        cls.tangent_offset = numeric_attr.create("tangentOffset", "to", om.MFnNumericData.kDouble, 0.001)
+        cls.use_scale = numeric_attr.create("useScale", "us", om.MFnNumericData.kBoolean, True)
+        cls.negate_secondary = numeric_attr.create("negateSecondary", "ns", om.MFnNumericData.kBoolean, False)
+        cls.align = numeric_attr.create("align", "al", om.MFnNumericData.kBoolean, False)
+
+        cls.knot_type = enum_attr.create("knotType", "kt", 0)
+        enum_attr.addField(de_boor.OPEN, 0)
+        enum_attr.addField(de_boor.PERIODIC, 1)
+
+        cls.aim_axis = enum_attr.create("aimAxis", "aa", 0)
+        for i, axis in enumerate(de_boor.AXIS_NAMES):
+            enum_attr.addField(axis, i)
+
+        cls.up_axis = enum_attr.create("upAxis", "ua", 2)
+        for i, axis in enumerate(de_boor.AXIS_NAMES):
+            enum_attr.addField(axis, i)
+
+        cls.output_matrix = matrix_attr.create("outputMatrix", "om", om.MFnMatrixAttribute.kDouble)
+        matrix_attr.array = True
+        matrix_attr.usesArrayDataBuilder = True
+        matrix_attr.writable = False
+        matrix_attr.storable = False
+
+        inputs = (cls.control_matrix, cls.parameter, cls.degree, cls.knot_type, cls.aim_axis, cls.up_axis,
+                  cls.tangent_offset, cls.use_scale, cls.negate_secondary, cls.align)
+        for attr in inputs:
+            cls.addAttribute(attr)
+        cls.addAttribute(cls.output_matrix)
+        for attr in inputs:
+            cls.attributeAffects(attr, cls.output_matrix)
+
+
+def initializePlugin(plugin):
+    fn_plugin = om.MFnPlugin(plugin, "Puiastre Productions", "1.0", "Any")
+    try:
+        fn_plugin.registerNode(DeBoorRibbonNode.type_name, DeBoorRibbonNode.type_id, DeBoorRibbonNode.creator,
+                               DeBoorRibbonNode.initialize, om.MPxNode.kDependNode)
+    except RuntimeError:
+        om.MGlobal.displayError(f"Failed to register node: {DeBoorRibbonNode.type_name}")
+        raise
+
+
+def uninitializePlugin(plugin):
+    fn_plugin = om.MFnPlugin(plugin)
+    try:
+        fn_plugin.deregisterNode(DeBoorRibbonNode.type_id)
+    except RuntimeError:
+        om.MGlobal.displayError(f"Failed to deregister node: {DeBoorRibbonNode.type_name}")
+        raise
@@ -4,6 +4,7 @@
 from puiastreTools.utils import basic_structure
 from puiastreTools.utils import data_export
 from puiastreTools.utils import core
+from puiastreTools.utils import graph_optimizer
 from puiastreTools.ui import project_manager
 
 # Rig modules import
@@ -38,6 +39,7 @@ from importlib import reload
 import json
 import maya.api.OpenMaya as om
 import os
+import time
 
 reload(basic_structure)
 reload(core)
@@ -115,7 +117,94 @@ def joint_label():
         cmds.setAttr(jnt + ".type", 18)
         cmds.setAttr(jnt + ".otherType", jnt.split("_")[1], type= "string")
 
-def make():
+def finalize_scene(ihi_value=0):
+    """
+    Single pass version of rename_ctl_shapes, joint_label and setIsHistoricallyInteresting.
+    One MItDependencyNodes traversal queues every rename and attribute change in one MDGModifier, applied with a
+    single doIt. Locked plugs, locked nodes and referenced nodes are skipped (the cmds versions fail on them).
+
+    Args:
+        ihi_value (int): isHistoricallyInteresting value for every node except the skinClusters.
+
+    Returns:
+        om.MDGModifier: The applied modifier, undoIt() reverts the whole pass.
+    """
+    modifier = om.MDGModifier()
+    sides = (("L_", 1), ("R_", 2), ("C_", 0))
+    skipped = []
+
+    it_dep = om.MItDependencyNodes()
+    while not it_dep.isDone():
+        node = it_dep.thisNode()
+        fn_dep = om.MFnDependencyNode(node)
+        name = fn_dep.name()
+        editable = not fn_dep.isLocked and not fn_dep.isFromReferencedFile
+
+        if node.hasFn(om.MFn.kNurbsCurve) and editable:
+            fn_dag = om.MFnDagNode(node)
+            if fn_dag.parentCount():
+                shape_name = f"{om.MFnDependencyNode(fn_dag.parent(0)).name()}Shape"
+                if shape_name != name:
+                    modifier.renameNode(node, shape_name)
+
+        elif node.hasFn(om.MFn.kJoint) and editable:
+            side = None
+            for token, value in sides:
+                if token in name:
+                    side = value
+            if side is not None:
+                modifier.newPlugValueInt(fn_dep.findPlug("side", False), side)
+            modifier.newPlugValueInt(fn_dep.findPlug("type", False), 18)
+            if "_" in name:
+                modifier.newPlugValueString(fn_dep.findPlug("otherType", False), name.split("_")[1])
+
+        if not node.hasFn(om.MFn.kSkinClusterFilter) and fn_dep.hasAttribute("isHistoricallyInteresting"):
+            plug = fn_dep.findPlug("isHistoricallyInteresting", False)
+            if plug.isLocked or fn_dep.isFromReferencedFile:
+                skipped.append(name)
+            elif plug.asInt() != ihi_value:
+                modifier.newPlugValueInt(plug, ihi_value)
+
+        it_dep.next()
+
+    modifier.doIt()
+    if skipped:
+        print("Skipped the following nodes {}".format(skipped))
+
+    return modifier
+
+def benchmark_finalize(ihi_value=0):
+    """
+    Time the cmds finalization (rename_ctl_shapes, joint_label, setIsHistoricallyInteresting) against finalize_scene
+    on the current scene. The cmds pass runs in an undo chunk and is undone, the finalize_scene pass is kept.
+
+    Returns:
+        dict: "cmds" / "modifier" -> seconds.
+    """
+    undo_state = cmds.undoInfo(query=True, state=True)
+    cmds.undoInfo(state=True)
+    cmds.undoInfo(openChunk=True, chunkName="benchmark_finalize")
+    try:
+        start = time.perf_counter()
+        rename_ctl_shapes()
+        joint_label()
+        setIsHistoricallyInteresting(ihi_value)
+        cmds_time = time.perf_counter() - start
+    finally:
+        cmds.undoInfo(closeChunk=True)
+    cmds.undo()
+    cmds.undoInfo(state=undo_state)
+    cmds.select(clear=True)
+
+    start = time.perf_counter()
+    finalize_scene(ihi_value)
+    modifier_time = time.perf_counter() - start
+
+    om.MGlobal.displayInfo(f"Scene finalization: cmds {cmds_time:.3f}s | modifier {modifier_time:.3f}s "
+                           f"({cmds_time / max(modifier_time, 1e-9):.1f}x)")
+    return {"cmds": cmds_time, "modifier": modifier_time}
+
+def make(optimize=False):
     """
     Build a complete dragon rig in Maya by creating basic structure, modules, and setting up space switching for controllers.
     This function initializes various modules, creates the basic structure, and sets up controllers and constraints for the rig.
@@ -124,8 +213,10 @@ def make():
         model_path (str): The file path to the model to be imported. (full path)
         guides_path (str): The file path to the guides data. (full path)
         ctls_path (str): The file path to the controllers data. (full path)
+        optimize (bool): Run the graph optimizer (utils/graph_optimizer) on the finished rig.
     """
     core.load_data()
+    core.NodeCache.clear()
 
     asset_name = core.DataManager.get_asset_name()
     progress_window = cmds.progressWindow(title='Rig builder',
@@ -387,9 +478,11 @@ def make():
 
     # End commands to clean the scene
     cmds.progressWindow(edit=True, progress=99, status=(f"Finalizing") )
-    rename_ctl_shapes()
-    joint_label()
-    setIsHistoricallyInteresting(0)
+    finalize_scene(0)
+    core.NodeCache.report()
+    if optimize:
+        cmds.progressWindow(edit=True, progress=99, status=(f"Optimizing the graph") )
+        graph_optimizer.optimize_graph()
 
     # End message
     cmds.inViewMessage(
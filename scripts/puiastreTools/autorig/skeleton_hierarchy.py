@@ -3,6 +3,7 @@ from maya import cmds
 from importlib import reload
 import os
 import json
+import time
 import maya.api.OpenMaya as om
 
 # Tools / utils import
@@ -13,11 +14,33 @@ from puiastreTools.utils import space_switch
 reload(core)
 
 
-def parented_chain(skinning_joints, parent, hand_value=False):
+def split_chains(skinning_joints, hand_value=False):
+    """
+    Splits the skinning joints in the chains parented_chain builds: one chain, or one per finger with hand_value.
+    """
+    if not hand_value:
+        return [skinning_joints]
+
+    def get_finger_key(joint):
+        name = joint.split("_", 1)[1]
+        name = name.replace("metacarpal", "")
+        name = ''.join([c for c in name if not c.isdigit()])
+        name = name.replace("JNT", "")
+        return name.lower()
+
+    finger_chains = {}
+    for joint in skinning_joints:
+        key = get_finger_key(joint)
+        if key not in finger_chains:
+            finger_chains[key] = []
+        finger_chains[key].append(joint)
+
+    return [finger_chains[key] for key in finger_chains]
 
-    data_exporter = data_export.DataExport()
+def parented_chain(skinning_joints, parent, hand_value=False, skelHierarchy_grp=None):
 
-    skelHierarchy_grp = data_exporter.get_data("basic_structure", "skeletonHierarchy_GRP")
+    if skelHierarchy_grp is None:
+        skelHierarchy_grp = data_export.DataExport().get_data("basic_structure", "skeletonHierarchy_GRP")
 
     try:
         env_replace = parent.replace("_JNT", "_ENV")
@@ -26,26 +49,7 @@ def parented_chain(skinning_joints, parent, hand_value=False):
     except Exception as e:
         parent = parent
 
-    complete_chain = []
-
-    if hand_value:
-        def get_finger_key(joint):
-            name = joint.split("_", 1)[1]
-            name = name.replace("metacarpal", "")
-            name = ''.join([c for c in name if not c.isdigit()])
-            name = name.replace("JNT", "")
-            return name.lower()
-
-        finger_chains = {}
-        for joint in skinning_joints:
-            key = get_finger_key(joint)
-            if key not in finger_chains:
-                finger_chains[key] = []
-            finger_chains[key].append(joint)
-
-        complete_chain = [finger_chains[key] for key in finger_chains]
-    else:
-        complete_chain = [skinning_joints]
+    complete_chain = split_chains(skinning_joints, hand_value)
 
     end_joints = []
     for index, chain in enumerate(complete_chain):
@@ -134,13 +138,293 @@ def parented_chain(skinning_joints, parent, hand_value=False):
 
     return end_joints
 
-def build_complete_hierarchy():
+def build_env_chains(specs, skelHierarchy_grp=None):
+    """
+    Batched parented_chain for a list of chains (see resolve_hierarchy).
+    Every ENV joint is created, named and parented through one MDagModifier, every Envelop multMatrix through one
+    MDGModifier and all the connections through a third one, so the whole skeleton takes three doIt calls instead of
+    a createNode / parent / listConnections / connectAttr / setAttr round trip per joint.
+    The joints are created directly under their parent (no world space compensation, no inverseScale connection to
+    remove and a zero jointOrient), and only the multMatrix driving each joint is created.
+
+    Args:
+        specs (list): (skinning_joints, parent, hand_value) per chain, parents may be ENV joints of earlier chains.
+        skelHierarchy_grp (str, optional): Parent of the chains without parent. Defaults to the build cache value.
+
+    Returns:
+        list: The created ENV joints, in creation order.
+    """
+    if skelHierarchy_grp is None:
+        skelHierarchy_grp = data_export.DataExport().get_data("basic_structure", "skeletonHierarchy_GRP")
+
+    dag_modifier = om.MDagModifier()
+    dg_modifier = om.MDGModifier()
+    connect_modifier = om.MDGModifier()
+    sel_list = om.MSelectionList()
+    created = {}
+
+    def get_object(name):
+        if name in created:
+            return created[name]
+        sel_list.clear()
+        sel_list.add(name)
+        return sel_list.getDependNode(0)
+
+    def resolve_parent(parent):
+        if parent:
+            env_replace = parent.replace("_JNT", "_ENV")
+            if env_replace in created or cmds.objExists(env_replace):
+                return env_replace
+        return parent
+
+    # (skinning joint, ENV joint, space joint or None, inverseScale source or None)
+    envelopes = []
+    for skinning_joints, parent, hand_value in specs:
+        parent = resolve_parent(parent)
+        for chain in split_chains(skinning_joints, hand_value):
+            joints = []
+            for joint in chain:
+                joint_env = joint.replace("_JNT", "_ENV")
+                if "localHip" in joint_env:
+                    dag_parent, space, inverse_scale = joints[0], joints[0], joints[0]
+                elif joints:
+                    dag_parent, space, inverse_scale = joints[-1], joints[-1], None
+                else:
+                    dag_parent, space, inverse_scale = parent or skelHierarchy_grp, parent, None
+
+                created[joint_env] = dag_modifier.createNode("joint", get_object(dag_parent))
+                dag_modifier.renameNode(created[joint_env], joint_env)
+                joints.append(joint_env)
+                envelopes.append((joint, joint_env, space, inverse_scale))
+
+    mult_matrices = {}
+    for joint, joint_env, space, inverse_scale in envelopes:
+        if space:
+            mult_matrices[joint_env] = dg_modifier.createNode("multMatrix")
+            dg_modifier.renameNode(mult_matrices[joint_env], joint_env.replace("_ENV", "Envelop_MMX"))
+
+    dag_modifier.doIt()
+    dg_modifier.doIt()
+
+    def plug(node, attribute, index=None):
+        result = om.MFnDependencyNode(node if isinstance(node, om.MObject) else get_object(node)).findPlug(attribute, False)
+        return result if index is None else result.elementByLogicalIndex(index)
+
+    for joint, joint_env, space, inverse_scale in envelopes:
+        if space is None:
+            connect_modifier.connect(plug(joint, "worldMatrix", 0), plug(joint_env, "offsetParentMatrix"))
+            continue
+        mult_matrix = mult_matrices[joint_env]
+        connect_modifier.connect(plug(joint, "worldMatrix", 0), plug(mult_matrix, "matrixIn", 0))
+        connect_modifier.connect(plug(space, "worldInverseMatrix", 0), plug(mult_matrix, "matrixIn", 1))
+        connect_modifier.connect(plug(mult_matrix, "matrixSum"), plug(joint_env, "offsetParentMatrix"))
+        if inverse_scale:
+            connect_modifier.connect(plug(inverse_scale, "scale"), plug(joint_env, "inverseScale"))
+
+    connect_modifier.doIt()
+
+    return [om.MFnDependencyNode(created[joint_env]).name() for joint, joint_env, space, inverse_scale in envelopes]
+
+def benchmark_env_chains(specs, skelHierarchy_grp=None):
+    """
+    Builds the ENV chains with parented_chain, deletes them and builds them again with build_env_chains, timing both.
+    Run before the skinning import (build_complete_hierarchy(benchmark=True)), the batched chains are kept.
+
+    Args:
+        specs (list): See build_env_chains.
+        skelHierarchy_grp (str, optional): See build_env_chains.
+
+    Returns:
+        dict: "legacy" / "batched" -> {"seconds", "nodes", "max_error"}, max_error being the largest distance
+              between an ENV joint and its skinning joint world matrix.
+    """
+    if skelHierarchy_grp is None:
+        skelHierarchy_grp = data_export.DataExport().get_data("basic_structure", "skeletonHierarchy_GRP")
+
+    def max_error(env_joints):
+        error = 0.0
+        for joint_env in env_joints:
+            env_matrix = om.MMatrix(cmds.getAttr(f"{joint_env}.worldMatrix[0]"))
+            joint_matrix = om.MMatrix(cmds.getAttr(f"{joint_env.replace('_ENV', '_JNT')}.worldMatrix[0]"))
+            error = max(error, max(abs(a - b) for a, b in zip(env_matrix, joint_matrix)))
+        return error
+
+    results = {}
+
+    before = set(cmds.ls())
+    start = time.perf_counter()
+    for joints, parent, hand_value in specs:
+        parented_chain(joints, parent, hand_value, skelHierarchy_grp)
+    seconds = time.perf_counter() - start
+    created = [node for node in cmds.ls() if node not in before]
+    results["legacy"] = {"seconds": seconds, "nodes": len(created), "max_error": max_error(cmds.ls(created, type="joint"))}
+    cmds.delete([node for node in created if cmds.objExists(node)])
+
+    before = set(cmds.ls())
+    start = time.perf_counter()
+    env_joints = build_env_chains(specs, skelHierarchy_grp)
+    seconds = time.perf_counter() - start
+    created = [node for node in cmds.ls() if node not in before]
+    results["batched"] = {"seconds": seconds, "nodes": len(created), "max_error": max_error(env_joints)}
+
+    om.MGlobal.displayInfo(
+        f"ENV chains ({len(env_joints)} joints): "
+        f"legacy {results['legacy']['seconds']:.3f}s, {results['legacy']['nodes']} nodes, error {results['legacy']['max_error']:.2e} | "
+        f"batched {results['batched']['seconds']:.3f}s, {results['batched']['nodes']} nodes, error {results['batched']['max_error']:.2e}"
+    )
+    return results
+
+def collect_chains(build_data):
+    """
+    Collects the skinning chain of every module of the build cache, in build order, and classifies it once.
+
+    Args:
+        build_data (dict): Build cache data (module -> data).
+
+    Returns:
+        list: One dict per chain with "module", "group" (skinning_transform), "joints", "side", "role"
+              (spine, facial, leg, digit, scapula, limb or None), "digit_role" (thumb_metacarpal, thumb, finger or None)
+              and "membrane".
+    """
+    chains = []
+    for module, data in build_data.items():
+        if "skinning_transform" not in data:
+            continue
+        group = data["skinning_transform"]
+        joints = cmds.listRelatives(group, allDescendents=True, type="joint") or []
+        chains.append({"module": module, "group": group, "joints": joints, "side": None, "role": None,
+                       "digit_role": None, "membrane": False})
+
+    spine = next((chain for chain in chains if "spine" in chain["group"].lower()), None)
+
+    for chain in chains:
+        if not chain["joints"]:
+            continue
+        first = chain["joints"][0]
+        name = first.split("_", 1)[-1]
+        chain["side"] = first.split("_")[0]
+        chain["membrane"] = "Membran" in first
+
+        if chain is spine:
+            chain["role"] = "spine"
+        elif "Facial" in chain["group"] or "spikes" in chain["group"].lower():
+            chain["role"] = "facial"
+        elif "backLeg" in first or "tail" in first or "leg" in first:
+            chain["role"] = "leg"
+        elif "Finger" in first or "Membran" in first or "thumb01" in name.lower() or "Metacarpal" in first or "handThumb" in first:
+            chain["role"] = "digit"
+        elif "Scapula" in first:
+            chain["role"] = "scapula"
+        elif len(chain["joints"]) >= 2:
+            chain["role"] = "limb"
+
+        if "thumbMetacarpal" in first or "handThumb" in first:
+            chain["digit_role"] = "thumb_metacarpal"
+        elif "thumb01" in name.lower():
+            chain["digit_role"] = "thumb"
+        elif "Finger" in first:
+            chain["digit_role"] = "finger"
+
+    return chains
+
+def resolve_hierarchy(chains):
+    """
+    Resolves the parent of every ENV chain, in creation order, without creating anything: the ENV names are derived
+    from the skinning joints (_JNT -> _ENV), so the arm and leg end joints are indexed by side as soon as their chain
+    is resolved and the hand, foot and membrane chains look them up directly.
+
+    Args:
+        chains (list): Result of collect_chains.
+
+    Returns:
+        tuple: (list of (skinning_joints, parent, hand_value) to pass to parented_chain, dict side -> arm end ENV).
+    """
+    specs = []
+    arms = {}
+    legs = {}
+    arm_chain = []
+
+    def add(joints, parent, hand_value=False):
+        if joints:
+            specs.append((joints, parent, hand_value))
+        return [joint.replace("_JNT", "_ENV") for joint in joints]
+
+    def add_leg(env_joint):
+        side = env_joint.split("_")[0]
+        legs[(side, None)] = env_joint
+        for kind in ("back", "front"):
+            if kind in env_joint.lower():
+                legs[(side, kind)] = env_joint
+
+    spine = next((chain for chain in chains if chain["role"] == "spine"), None)
+    spine_env = add(spine["joints"], None) if spine else []
+    spine_end = spine_env[-1] if spine_env else None
+    spine_chest = spine_env[-2] if len(spine_env) > 1 else spine_end
+
+    for chain in chains:
+        joints = chain["joints"]
+
+        if chain["role"] == "facial":
+            add(joints, None)
+
+        elif chain["role"] == "leg":
+            add_leg(add(joints, spine_end)[-1])
+
+        elif chain["role"] == "scapula":
+            add(joints[:2], spine_chest)
+            env = add(joints[2:], spine_chest)
+            if env:
+                add_leg(env[-1])
+
+        elif chain["role"] == "limb":
+            env = add(joints, spine_chest)
+            if "clavicle" in joints[0]:
+                arms.setdefault(chain["side"], env[-1])
+                arm_chain.extend(joints)
+
+    for chain in chains:
+        joints, side = chain["joints"], chain["side"]
+
+        if chain["digit_role"] == "thumb_metacarpal":
+            parent = arms.get(side)
+            child_joints = []
+            for joint in joints:
+                if "Metacarpal" in joint:
+                    add(child_joints, parent)
+                    child_joints = []
+                child_joints.append(joint)
+            add(child_joints, parent)
+
+        elif chain["digit_role"] == "thumb":
+            lower = joints[0].lower()
+            kind = "back" if "back" in lower else "front" if "front" in lower else None
+            parent = legs.get((side, kind))
+            for index in range(0, 12, 3):
+                add(joints[index:index + 3], parent)
+
+        elif chain["digit_role"] == "finger":
+            add(joints, arms.get(side))
+
+        if chain["membrane"]:
+            for index, joint in enumerate(joints):
+                if "PrimaryMembrane01" in joint:
+                    add(joints[index:index + 2], core.get_closest_transform(joint, arm_chain))
+                elif "Membrane01" in joint:
+                    add(joints[index:index + 4], arms.get(side), hand_value=True)
+
+    return specs, arms
+
+def build_complete_hierarchy(benchmark=False):
     """
     Reads the build and guide files, interprets the desired hierarchy, and
     constructs it in Maya by parenting the corresponding skinning groups.
     Uses file locations relative to the current script.
+    The build cache is read once, the chains are resolved first (resolve_hierarchy) and then created in one batch
+    (build_env_chains), the space switches read the same cache data.
+
+    Args:
+        benchmark (bool): Time the batched ENV chains against parented_chain (see benchmark_env_chains).
     """
-    data_exporter = data_export.DataExport()
     try:
         complete_path = os.path.realpath(__file__)
         relative_path = complete_path.split("scripts")[0]
@@ -164,169 +448,36 @@ def build_complete_hierarchy():
         om.MGlobal.displayError(f"Unexpected error while loading files: {e}")
         return
 
-    skelHierarchy_grp = data_exporter.get_data("basic_structure", "skeletonHierarchy_GRP")
+    def get_data(module_name, attribute_name):
+        return build_data.get(module_name, {}).get(attribute_name)
 
-    freeze_joint = cmds.createNode("joint", n="C_freeze_JNT", ss=True, parent=skelHierarchy_grp)
+    skelHierarchy_grp = get_data("basic_structure", "skeletonHierarchy_GRP")
 
-    skel_grps = []
-    skinning_joints = []
-    modules_name = []
-    for module, data in build_data.items():
-        for value in data.items():
-            if "skinning_transform" in value:
-                    joints = cmds.listRelatives(value[1], allDescendents=True, type="joint")
-                    skel_grps.append((value[1]))
-                    skinning_joints.append(joints)
-                    modules_name.append(module)
-    spine_index = next((i for i, grp in enumerate(skel_grps) if "spine" in grp.lower()), None)
-    l_arm_index = next((i for i, grp in enumerate(skel_grps) if "L_arm" in grp), None)
-    r_arm_index = next((i for i, grp in enumerate(skel_grps) if "R_arm" in grp), None)
-    neck_index =  next((i for i, grp in enumerate(skel_grps) if "neck" in grp.lower()), None)
-
-
-    arm_joints = []
-    leg_joints = []
-
-    complete_arm_chain = []
-    if spine_index:
-        spine_joints = parented_chain(skinning_joints=skinning_joints[spine_index], parent=None, hand_value=False)
-
-    facial_joints_list = []
-    head_joint= None
-
-    for i, skinning_joint_list in enumerate(skinning_joints):
-        if i != spine_index:
-            if "Facial" in skel_grps[i] or "spikes" in skel_grps[i].lower():    
-                parented_chain(skinning_joints=skinning_joint_list, parent=None, hand_value=False)
-            elif "backLeg" in skinning_joint_list[0] or "tail" in skinning_joint_list[0] or "leg" in skinning_joint_list[0]:
-                joints = parented_chain(skinning_joints=skinning_joint_list, parent=spine_joints[-1], hand_value=False)
-                leg_joints.append(joints[-1])
-            elif "Finger" in skinning_joint_list[0] or "Membran" in skinning_joint_list[0] or "thumb01" in skinning_joint_list[0].split("_", 1)[1].lower() or "Metacarpal" in skinning_joint_list[0] or "handThumb" in skinning_joint_list[0]:
-                pass
-            elif "Scapula" in skinning_joint_list[0]:
-                joints = parented_chain(skinning_joints=[skinning_joint_list[0], skinning_joint_list[1]], parent=spine_joints[-2], hand_value=False)
-                joints = parented_chain(skinning_joints=skinning_joint_list[2:], parent=spine_joints[-2], hand_value=False)
-                leg_joints.append(joints[-1])
-                continue     
-            
-                
-
-                #facial_joints_list.append(skinning_joint_list)
-            else:
-                if len(skinning_joint_list) >= 2:
-                    joints = parented_chain(skinning_joints=skinning_joint_list, parent=spine_joints[-2], hand_value=False)
-                    if "clavicle" in skinning_joint_list[0]:
-                        arm_joints.append(joints[-1])
-                        complete_arm_chain.extend(skinning_joint_list)
-                    if "neck" in skinning_joint_list[0]:
-                        head_joint = joints[-1]
+    freeze_joint = cmds.createNode("joint", n="C_freeze_JNT", ss=True, parent=skelHierarchy_grp)
 
-    """
+    chains = collect_chains(build_data)
+    specs, arm_joints = resolve_hierarchy(chains)
 
-    if head_joint:
-        for list in facial_joints_list:
-            joints = parented_chain(skinning_joints=list, parent=head_joint, hand_value=False)
-    """
+    if benchmark:
+        benchmark_env_chains(specs, skelHierarchy_grp)
+    else:
+        build_env_chains(specs, skelHierarchy_grp)
 
     hand_settings_value = None
-    for i, skinning_joint_list in enumerate(skinning_joints):
-        if "thumbMetacarpal" in skinning_joint_list[0] or "handThumb" in skinning_joint_list[0]:
-            side = skinning_joint_list[0].split("_")[0]
-            index = l_arm_index if side == "L" else r_arm_index
-            parent_joint = next((j for j in arm_joints if f"{side}_" in j), None)
-
-            child_joints = []
-            for item in skinning_joint_list:
-                if "Metacarpal" in item:
-                    parented_chain(skinning_joints=child_joints, parent=parent_joint, hand_value=False)
-                    child_joints = []
-                    child_joints.append(item)
-                else:
-                    child_joints.append(item)
-            if child_joints:                    
-                parented_chain(skinning_joints=child_joints, parent=parent_joint, hand_value=False)
-
-            attributes = data_exporter.get_data(f"{side}_FkFingersModule", "attributes_ctl")
-            # try:
-            #     space_switch.fk_switch(target = attributes, sources= [parent_joint], sources_names=["Wrist"])
-            # except:
-            #     pass
-            
-
-
-        elif "thumb01" in skinning_joint_list[0].split("_", 1)[1].lower():
-            side = skinning_joint_list[0].split("_")[0]
-
-            if "back" in skinning_joint_list[0].lower():
-                for joint in leg_joints:
-                    if f"{side}_" in joint and "back" in joint.lower():
-                        parent_joint = joint
-            elif "front" in skinning_joint_list[0].lower():
-                for joint in leg_joints:
-                    if f"{side}_" in joint and "front" in joint.lower():
-                        parent_joint = joint 
-            else:
-               for joint in leg_joints:
-                    if f"{side}_" in joint:
-                        parent_joint = joint
-                        
-            for index in range(0, 12, 3):
-                joint_list = skinning_joint_list[index:index+3]
-                parented_chain(skinning_joints=joint_list, parent=parent_joint, hand_value=False)
-
-        
-        elif "Finger" in skinning_joint_list[0]:
-            side = skinning_joint_list[0].split("_")[0]
-            index = l_arm_index if side == "L" else r_arm_index
-            parent_joint = next((j for j in arm_joints if f"{side}_" in j), None)
-            parented_chain(skinning_joints=skinning_joint_list, parent=parent_joint, hand_value=False)
-
-
-        if "Membran" in skinning_joint_list[0]:
-            side = skinning_joint_list[0].split("_")[0]
-
-            parent_joint = None
-
-            for joint_arm in arm_joints:
-                side_arm = joint_arm.split("_")[0]
-                if side == side_arm:
-                    parent_joint = joint_arm
-                    break
-
-            membrane_groups = []
-            current_group = []
-
-            for index, joint in enumerate(skinning_joint_list):
-                if "Membrane01" in joint and not "PrimaryMembrane01" in joint:
-                    current_group = [joint, skinning_joint_list[index + 1], skinning_joint_list[index + 2], skinning_joint_list[index + 3]]
-                    membrane_groups.append(current_group)
-
-
-                elif "PrimaryMembrane01" in joint:
-                    current_group = [joint, skinning_joint_list[index + 1]]#, skinning_joint_list[index + 2]]
-                    membrane_groups.append(current_group)                
-
-            for joint_list in membrane_groups:
-                if joint_list:
-                    if "PrimaryMembrane01" in joint_list[0]:
-                        closest01 = core.get_closest_transform(joint_list[0], complete_arm_chain)
-                        parented_chain(skinning_joints=joint_list, parent=closest01, hand_value=False)
-                    else:
-                        parented_chain(skinning_joints=joint_list, parent=parent_joint, hand_value=True)
-
-
+    for chain in chains:
+        group, module = chain["group"], chain["module"]
 
         # ===== SPACE SWITCHES ===== #
-        if "fkFingers" in skel_grps[i]:
+        if "fkFingers" in group:
             continue
 
-        if "backLeg" in skel_grps[i] or "leg" in skel_grps[i]:
-            fk = data_exporter.get_data(modules_name[i], "fk_ctl")[0]
-            pv = data_exporter.get_data(modules_name[i], "pv_ctl")
-            root = data_exporter.get_data(modules_name[i], "root_ctl")
-            ik = data_exporter.get_data(modules_name[i], "end_ik")
+        if "backLeg" in group or "leg" in group:
+            fk = get_data(module, "fk_ctl")[0]
+            pv = get_data(module, "pv_ctl")
+            root = get_data(module, "root_ctl")
+            ik = get_data(module, "end_ik")
 
-            parents = [data_exporter.get_data("C_spineModule", "localHip"), data_exporter.get_data("C_spineModule", "body_ctl")]
+            parents = [get_data("C_spineModule", "localHip"), get_data("C_spineModule", "body_ctl")]
 
             space_switch.fk_switch(target = fk, sources= parents, sources_names=["LocalHip", "Body"])
             space_switch.fk_switch(target = root, sources= parents, sources_names=["LocalHip", "Body"])
@@ -334,17 +485,17 @@ def build_complete_hierarchy():
             parents.insert(0, ik)
             space_switch.fk_switch(target = pv, sources= parents, sources_names=["AnkleIK", "LocalHip", "Body"], pv=True)
 
-        if "frontLeg" in skel_grps[i]:
-            fk = data_exporter.get_data(modules_name[i], "fk_ctl")[0]
-            pv = data_exporter.get_data(modules_name[i], "pv_ctl")
-            root = data_exporter.get_data(modules_name[i], "root_ctl")
-            ik = data_exporter.get_data(modules_name[i], "end_ik")
-            scapula = data_exporter.get_data(modules_name[i], "scapula_ctl")
-            first_bendy = data_exporter.get_data(modules_name[i], "first_bendy_joints")
-            scapula_end = data_exporter.get_data(modules_name[i], "scapula_end_ctl")
-            scapula_master = data_exporter.get_data(modules_name[i], "scapula_master_ctl")
+        if "frontLeg" in group:
+            fk = get_data(module, "fk_ctl")[0]
+            pv = get_data(module, "pv_ctl")
+            root = get_data(module, "root_ctl")
+            ik = get_data(module, "end_ik")
+            scapula = get_data(module, "scapula_ctl")
+            first_bendy = get_data(module, "first_bendy_joints")
+            scapula_end = get_data(module, "scapula_end_ctl")
+            scapula_master = get_data(module, "scapula_master_ctl")
 
-            parents = [data_exporter.get_data("C_spineModule", "localChest"), data_exporter.get_data("C_spineModule", "end_main_ctl")]
+            parents = [get_data("C_spineModule", "localChest"), get_data("C_spineModule", "end_main_ctl")]
 
             parents.insert(0, scapula_master)
             space_switch.fk_switch(target = fk, sources= parents, sources_names=["ScapulaMaster", "LocalChest", "SpineEnd"])
@@ -364,24 +515,24 @@ def build_complete_hierarchy():
             parents.insert(0, ik)
             space_switch.fk_switch(target = pv, sources= parents, sources_names=["AnkleIK", "LocalChest", "SpineEnd"], pv=True)
 
-        if "tail" in skel_grps[i] and not "spikes" in skel_grps[i].lower():
-            main_ctl= data_exporter.get_data(modules_name[i], "main_ctl")
-            parents = [data_exporter.get_data("C_spineModule", "localHip"), data_exporter.get_data("C_spineModule", "body_ctl")]
+        if "tail" in group and not "spikes" in group.lower():
+            main_ctl= get_data(module, "main_ctl")
+            parents = [get_data("C_spineModule", "localHip"), get_data("C_spineModule", "body_ctl")]
             space_switch.fk_switch(target = main_ctl, sources= parents, sources_names=["LocalHip", "Body"])
 
-        if "neck" in skel_grps[i] and len(skinning_joints[i]) >= 2:
-            main_ctl= data_exporter.get_data(modules_name[i], "neck_ctl")
-            parents = [data_exporter.get_data("C_spineModule", "localChest"), data_exporter.get_data("C_spineModule", "end_main_ctl")]
+        if "neck" in group and len(chain["joints"]) >= 2:
+            main_ctl= get_data(module, "neck_ctl")
+            parents = [get_data("C_spineModule", "localChest"), get_data("C_spineModule", "end_main_ctl")]
             space_switch.fk_switch(target = main_ctl, sources= parents, sources_names=["LocalChest", "SpineEnd"])
 
-        if "arm" in skel_grps[i]:
-            fk = data_exporter.get_data(modules_name[i], "fk_ctl")[0]
-            pv = data_exporter.get_data(modules_name[i], "pv_ctl")
-            root = data_exporter.get_data(modules_name[i], "root_ctl")
-            ik = data_exporter.get_data(modules_name[i], "end_ik")
-            scapula = data_exporter.get_data(modules_name[i], "scapula_ctl")
+        if "arm" in group:
+            fk = get_data(module, "fk_ctl")[0]
+            pv = get_data(module, "pv_ctl")
+            root = get_data(module, "root_ctl")
+            ik = get_data(module, "end_ik")
+            scapula = get_data(module, "scapula_ctl")
 
-            parents = [data_exporter.get_data("C_spineModule", "localChest"), data_exporter.get_data("C_spineModule", "end_main_ctl")]
+            parents = [get_data("C_spineModule", "localChest"), get_data("C_spineModule", "end_main_ctl")]
 
             space_switch.fk_switch(target = scapula, sources= parents, sources_names=["LocalChest", "SpineEnd"])
             parents.insert(0, scapula)
@@ -394,23 +545,21 @@ def build_complete_hierarchy():
             space_switch.fk_switch(target = pv, sources= parents, sources_names=["WristIK", "Scapula", "LocalChest", "SpineEnd"], pv=True)
 
 
-        if "Finger00" in skel_grps[i]:
+        if "Finger00" in group:
 
-            fk = data_exporter.get_data(modules_name[i], "fk_ctls")[0]
-            pv = data_exporter.get_data(modules_name[i], "pv_ctl")
-            root = data_exporter.get_data(modules_name[i], "root_ctl")
-            ik = data_exporter.get_data(modules_name[i], "end_ik")
-            metacarpal = data_exporter.get_data(modules_name[i], "metacarpal_ctl")
+            fk = get_data(module, "fk_ctls")[0]
+            pv = get_data(module, "pv_ctl")
+            root = get_data(module, "root_ctl")
+            ik = get_data(module, "end_ik")
+            metacarpal = get_data(module, "metacarpal_ctl")
 
 
-            side = skel_grps[i].split("_")[0]
-            index = l_arm_index if side == "L" else r_arm_index
-            parent_joint = next((j for j in arm_joints if f"{side}_" in j), None)
-            hand_settings = data_exporter.get_data(modules_name[i], "settings_ctl")
+            parent_joint = arm_joints.get(group.split("_")[0])
+            hand_settings = get_data(module, "settings_ctl")
 
-            if hand_settings_value is None or hand_settings_value != modules_name[i].split("_")[0]:
+            if hand_settings_value is None or hand_settings_value != module.split("_")[0]:
                 space_switch.fk_switch(target = hand_settings, sources=[parent_joint])
-                hand_settings_value = modules_name[i].split("_")[0]
+                hand_settings_value = module.split("_")[0]
             parents = [parent_joint]
 
             space_switch.fk_switch(target = metacarpal, sources= parents, sources_names=["Hand"])
@@ -423,10 +572,10 @@ def build_complete_hierarchy():
 
         # ===== SCAPULA SPACES ===== #
 
-        if "scapula" in skel_grps[i]:
-            scapula_ctl = data_exporter.get_data(modules_name[i], "scapula_ctl")
-            spine_end = data_exporter.get_data("C_spineModule", "end_main_ctl")
-            local_chest = data_exporter.get_data("C_spineModule", "localChest")
-            front_leg = data_exporter.get_data("C_dragonFrontLegModule", "root_ctl")
+        if "scapula" in group:
+            scapula_ctl = get_data(module, "scapula_ctl")
+            spine_end = get_data("C_spineModule", "end_main_ctl")
+            local_chest = get_data("C_spineModule", "localChest")
+            front_leg = get_data("C_dragonFrontLegModule", "root_ctl")
 
             space_switch.fk_switch(target = scapula_ctl, sources= [front_leg, local_chest, spine_end], sources_names=["Front Leg", "LocalChest", "SpineEnd"])
@@ -1,15 +1,199 @@
+import time
+
 import maya.cmds as cmds
 import maya.api.OpenMaya as om2
+import maya.api.OpenMayaAnim as oma2
+import numpy as np
+
+from puiastreTools.utils import skin_weights
+from puiastreTools.utils import spatial
+from puiastreTools.utils import symmetry
+
 
-def transfer_multi_skin_clusters():
+class SkinTransfer:
+    """
+    Transfers skin weights between two meshes with spatial maps computed once.
+    The closest point map (target -> source) is built with one KD-tree and the YZ mirror map of the target comes from
+    the symmetry cache (object space rest positions), then every skinCluster of a stack is a gather through them
+    instead of a new copySkinWeights search.
+
+    The results are not the same as the copySkinWeights path (transfer_multi_skin_clusters(legacy=True)):
+    - Surface association: the closest source vertex (or the 4 closest blended) instead of closestPoint on the surface.
+    - Mirror: across the YZ plane of the target object space (rest positions) instead of world YZ.
+    - Influence association: by exact name, and by L_ / R_ prefix swap for the mirror, instead of label / oneToOne /
+      closestJoint. Source influences missing on the target are dropped.
+    """
+
+    def __init__(self, source_shape, target_shape, mirror=True, mode="closest"):
+        """
+        Args:
+            source_shape (str): Source mesh shape.
+            target_shape (str): Target mesh shape.
+            mirror (bool): Mirror the transferred weights from +X to -X.
+            mode (str): "closest" takes the closest source vertex, "interpolate" blends the 4 closest ones.
+        """
+        self.source_path = self._dag_path(source_shape)
+        self.target_path = self._dag_path(target_shape)
+        self.mirror = mirror
+
+        source_points = self._points(self.source_path)
+        self.target_points = self._points(self.target_path)
+
+        if mode == "interpolate":
+            self.vertex_map = spatial.interpolation_map(source_points, self.target_points)
+        else:
+            self.vertex_map = spatial.closest_point_map(source_points, self.target_points)
+
+        self.mirror_map = symmetry.mesh_symmetry(target_shape) if mirror else None
+        self.rest_points = symmetry.rest_points(target_shape) if mirror else None
+
+    def _dag_path(self, node):
+        sel = om2.MSelectionList()
+        sel.add(node)
+        return sel.getDagPath(0)
+
+    def _points(self, dag_path):
+        return symmetry._mesh_points(om2.MFnMesh(dag_path), om2.MSpace.kWorld)
+
+    def apply(self, source_skin, target_skin):
+        """
+        Transfer (and mirror) the weights of source_skin to target_skin. Influences are matched by name.
+
+        Args:
+            source_skin (str): SkinCluster of the source mesh.
+            target_skin (str): SkinCluster of the target mesh.
+        """
+        source_weights, source_infs = get_weights(source_skin, self.source_path)
+
+        weights = skin_weights.transfer_dense(source_weights, *self.vertex_map)
+        if self.mirror:
+            mirror_indices, found = self.mirror_map
+            inf_mirror = skin_weights.mirror_influence_indices(source_infs)
+            weights = skin_weights.mirror_dense(weights, self.rest_points, mirror_indices, inf_mirror, found=found)
+
+        fn_skin = _skin_fn(target_skin)
+        target_infs = [p.partialPathName() for p in fn_skin.influenceObjects()]
+        target_map = {name: i for i, name in enumerate(target_infs)}
+        columns = [i for i, name in enumerate(source_infs) if name in target_map]
+        influence_indices = om2.MIntArray([target_map[source_infs[i]] for i in columns])
+
+        set_weights(fn_skin, self.target_path, weights[:, columns], influence_indices)
+
+
+def _skin_fn(skin_name):
+    sel = om2.MSelectionList()
+    sel.add(skin_name)
+    return oma2.MFnSkinCluster(sel.getDependNode(0))
+
+
+def _vertex_component(vtx_count):
+    single_comp = om2.MFnSingleIndexedComponent()
+    vertex_comp = single_comp.create(om2.MFn.kMeshVertComponent)
+    single_comp.setCompleteData(vtx_count)
+    return vertex_comp
+
+
+def get_weights(skin_name, dag_path):
+    """
+    Dense weights of a skinCluster as a (vertices, influences) array, plus the influence names.
+    """
+    fn_skin = _skin_fn(skin_name)
+    inf_names = [p.partialPathName() for p in fn_skin.influenceObjects()]
+    vtx_count = om2.MFnMesh(dag_path).numVertices
+    weights, _ = fn_skin.getWeights(dag_path, _vertex_component(vtx_count))
+    return skin_weights.weights_matrix(weights, vtx_count, len(inf_names)), inf_names
+
+
+def set_weights(fn_skin, dag_path, weights, influence_indices):
+    """
+    Set a (vertices, influences) weight array on the listed influences of a skinCluster.
+    """
+    fn_skin.setWeights(dag_path, _vertex_component(weights.shape[0]), influence_indices, om2.MDoubleArray(weights.ravel().tolist()), False)
+
+
+def _get_skin_clusters(shape):
+    history = cmds.listHistory(shape, pruneDagObjects=False, fullNodeName=True) or []
+    source_skins = [node for node in history if cmds.nodeType(node) == "skinCluster"]
+    source_skins.reverse()
+    return source_skins
+
+
+def _create_copy_skin(src_skin, target_node):
+    influences = cmds.skinCluster(src_skin, query=True, influence=True)
+
+    new_name = f"{src_skin}_COPY"
+
+    if cmds.objExists(new_name):
+        om2.MGlobal.displayWarning(f"{new_name} already exists. Maya will rename it automatically.")
+
+    om2.MGlobal.displayInfo(f"Processing: {src_skin} -> {new_name}")
+
+    new_skin = cmds.skinCluster(
+        influences,
+        target_node,
+        name=new_name,
+        toSelectedBones=False,
+        bindMethod=0,
+        normalizeWeights=1,
+        weightDistribution=0,
+        mi=1,
+        omi=False,
+        dr=4.0,
+        rui=False,
+        multi=True
+    )[0]
+
+
+    method = cmds.getAttr(f"{src_skin}.skinningMethod")
+    cmds.setAttr(f"{new_skin}.skinningMethod", method)
+
+    return new_skin
+
+
+def _legacy_copy(src_skin, new_skin, mirror=True):
+    """
+    Original copySkinWeights transfer: a closestPoint copy and a YZ self-mirror.
+    """
+    cmds.copySkinWeights(
+        ss=src_skin,
+        ds=new_skin,
+        noMirror=True,
+        surfaceAssociation='closestPoint',
+        influenceAssociation=['label', 'oneToOne', 'closestJoint'],
+        normalize=True
+    )
+
+    if mirror:
+        cmds.copySkinWeights(
+            ss=new_skin,
+            ds=new_skin,
+            mirrorMode='YZ',
+            surfaceAssociation='closestPoint',
+            influenceAssociation=['label', 'oneToOne'],
+            normalize=True
+        )
+
+
+def transfer_multi_skin_clusters(mirror=True, mode="closest", legacy=True):
     """
     Transfers all skinClusters from Source to Target mesh.
     - Matches joints exactly.
     - Appends _COPY to the name.
     - Copies weights.
     - Performs a self-mirror on the result.
+
+    Args:
+        mirror (bool): Mirror the result from +X to -X.
+        mode (str): "closest" or "interpolate" surface association of the SkinTransfer engine.
+        legacy (bool): Use the copySkinWeights commands (closestPoint, world YZ mirror, label / oneToOne /
+                       closestJoint influence association). False uses the faster SkinTransfer engine, whose results
+                       differ (closest vertex, target object space mirror, name matching, see SkinTransfer).
+                       Defaults to True until both give the same weights.
+
+    Returns:
+        list: The created skinClusters.
     """
-    
+
     sel = cmds.ls(sl=True)
     if not sel or len(sel) != 2:
         cmds.warning("Please select exactly two meshes: Source then Target.")
@@ -18,18 +202,14 @@ def transfer_multi_skin_clusters():
     source_node = sel[0]
     target_node = sel[1]
 
-    source_shapes = cmds.listRelatives(source_node, shapes=True) or []
-    target_shapes = cmds.listRelatives(target_node, shapes=True) or []
-    
+    source_shapes = cmds.listRelatives(source_node, shapes=True, noIntermediate=True, fullPath=True) or []
+    target_shapes = cmds.listRelatives(target_node, shapes=True, noIntermediate=True, fullPath=True) or []
+
     if not source_shapes or not target_shapes:
         om2.MGlobal.displayError("Selection must be geometry with valid shapes.")
         return
 
-
-    history = cmds.listHistory(source_shapes[0], pruneDagObjects=False, fullNodeName=True) or []
-    source_skins = [node for node in history if cmds.nodeType(node) == "skinCluster"]
-
-    source_skins.reverse()
+    source_skins = _get_skin_clusters(source_shapes[0])
 
     if not source_skins:
         om2.MGlobal.displayWarning(f"No skinClusters found on {source_node}.")
@@ -37,59 +217,81 @@ def transfer_multi_skin_clusters():
 
     om2.MGlobal.displayInfo(f"Found {len(source_skins)} skinClusters on {source_node}. Beginning transfer...")
 
+    transfer = None if legacy else SkinTransfer(source_shapes[0], target_shapes[0], mirror=mirror, mode=mode)
+    created = []
+
     for src_skin in source_skins:
-        
-
-        influences = cmds.skinCluster(src_skin, query=True, influence=True)
-
-        new_name = f"{src_skin}_COPY"
-        
-        if cmds.objExists(new_name):
-            om2.MGlobal.displayWarning(f"{new_name} already exists. Maya will rename it automatically.")
-
-        om2.MGlobal.displayInfo(f"Processing: {src_skin} -> {new_name}")
-
-        new_skin = cmds.skinCluster(
-            influences, 
-            target_node, 
-            name=new_name, 
-            toSelectedBones=False, 
-            bindMethod=0, 
-            normalizeWeights=1, 
-            weightDistribution=0,
-            mi=1,
-            omi=False,
-            dr=4.0,
-            rui=False,
-            multi=True 
-        )[0]
-
-      
-        method = cmds.getAttr(f"{src_skin}.skinningMethod")
-        cmds.setAttr(f"{new_skin}.skinningMethod", method)
-        
-     
-        cmds.copySkinWeights(
-            ss=src_skin, 
-            ds=new_skin, 
-            noMirror=True, 
-            surfaceAssociation='closestPoint', 
-            influenceAssociation=['label', 'oneToOne', 'closestJoint'],
-            normalize=True 
-        )
+        new_skin = _create_copy_skin(src_skin, target_node)
 
-      
-        cmds.copySkinWeights(
-            ss=new_skin, 
-            ds=new_skin, 
-            mirrorMode='YZ', 
-            surfaceAssociation='closestPoint', 
-            influenceAssociation=['label', 'oneToOne'], 
-            normalize=True
-        )
-        
+        if legacy:
+            _legacy_copy(src_skin, new_skin, mirror)
+        else:
+            transfer.apply(src_skin, new_skin)
+
+        created.append(new_skin)
         om2.MGlobal.displayInfo(f"Successfully created and mirrored: {new_skin}")
 
     om2.MGlobal.displayInfo("--- Transfer Complete ---")
 
+    return created
+
+
+def mirror_skin_clusters(direction=1):
+    """
+    Mirror every skinCluster of the selected meshes across YZ using the cached symmetry map of the mesh, so repeated
+    mirrors on the same model skip the vertex search.
+
+    Args:
+        direction (int): 1 mirrors +X to -X, -1 mirrors -X to +X.
+    """
+    meshes = cmds.ls(sl=True, long=True) or []
+    if not meshes:
+        cmds.warning("Please select the skinned meshes to mirror.")
+        return
+
+    for mesh in meshes:
+        shapes = cmds.listRelatives(mesh, shapes=True, noIntermediate=True, fullPath=True) or [mesh]
+        skins = _get_skin_clusters(shapes[0])
+        if not skins:
+            om2.MGlobal.displayWarning(f"No skinClusters found on {mesh}.")
+            continue
+
+        mirror_indices, found = symmetry.mesh_symmetry(shapes[0])
+        points = symmetry.rest_points(shapes[0])
+
+        sel = om2.MSelectionList()
+        sel.add(shapes[0])
+        dag_path = sel.getDagPath(0)
+
+        for skin in skins:
+            weights, inf_names = get_weights(skin, dag_path)
+            mirrored = skin_weights.mirror_dense(weights, points, mirror_indices, skin_weights.mirror_influence_indices(inf_names),
+                                                 direction=direction, found=found)
+            set_weights(_skin_fn(skin), dag_path, mirrored, om2.MIntArray(range(len(inf_names))))
+            om2.MGlobal.displayInfo(f"Mirrored: {skin}")
+
+
+def benchmark_transfer(mirror=True):
+    """
+    Time the copySkinWeights loop against the SkinTransfer engine on the selected Source and Target meshes.
+    The skinClusters created by each run are deleted afterwards and the selection restored.
+
+    Returns:
+        dict: Seconds of the "legacy" and "engine" runs.
+    """
+    sel = cmds.ls(sl=True)
+    timings = {}
+
+    for label, legacy in (("legacy", True), ("engine", False)):
+        cmds.select(sel, replace=True)
+        start = time.perf_counter()
+        created = transfer_multi_skin_clusters(mirror=mirror, legacy=legacy) or []
+        timings[label] = time.perf_counter() - start
+        if created:
+            cmds.delete(created)
+
+    cmds.select(sel, replace=True)
+    om2.MGlobal.displayInfo(f"Transfer benchmark: copySkinWeights {timings['legacy']:.2f}s | engine {timings['engine']:.2f}s "
+                            f"({timings['legacy'] / max(timings['engine'], 1e-9):.1f}x)")
 
+    return timings
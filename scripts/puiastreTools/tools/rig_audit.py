@@ -0,0 +1,132 @@
+import re
+
+import maya.cmds as cmds
+import maya.api.OpenMaya as om
+
+from puiastreTools.utils import profile_report
+from puiastreTools.tools import rig_profiler
+
+SIMULATION_TYPES = ("nucleus", "nCloth", "nRigid", "hairSystem", "rigidSolver", "AdnMuscle", "AdnSkin", "AdnRibbonMuscle")
+
+FIXES = {
+    "cycle": "Break the cycle, the evaluation manager evaluates the whole cluster serially every time.",
+    "time": "Evaluated on every frame change. Keep procedural setups (waves) optional, simulations force cached playback "
+            "into safe mode unless dynamics caching is enabled.",
+    "expression": "Replace the expression with utility nodes, expressions run through the interpreter serially.",
+    "script_node": "Remove the scriptNode from the rig file, it runs code on open / on time change.",
+    "script_job": "Kill the scriptJob and bake its result, attribute change callbacks fire on every evaluation.",
+    "serialized": "Node type evaluated serially by the evaluation manager, look for a native node alternative.",
+    "untrusted": "Node type untrusted by the evaluation manager, it forces the DG fallback on its cluster.",
+    "simulation": "Simulation node, cached playback needs dynamics caching or it falls back to safe mode.",
+    "python_node": "Python plugin node, its compute holds the interpreter lock so these nodes never run in parallel.",
+}
+
+
+def _em_node_types(flag):
+    try:
+        return set(cmds.evaluationManager(query=True, **{flag: True}) or [])
+    except (RuntimeError, TypeError):
+        return set()
+
+
+def _cycles():
+    """
+    Nodes of the DG cycles. cycleCheck lists plugs ("node.attr"), several per node, so they are reduced to their node.
+    """
+    try:
+        plugs = cmds.cycleCheck(all=True, list=True) or []
+    except RuntimeError:
+        return []
+    return list(dict.fromkeys(plug.split(".", 1)[0] for plug in plugs))
+
+
+def _future_count(node):
+    return len(cmds.listHistory(node, future=True, pruneDagObjects=False) or [])
+
+
+def collect_findings():
+    """
+    Everything in the scene that forces serial evaluation or invalidates cached playback.
+
+    Returns:
+        list: (category, node, detail) tuples.
+    """
+    findings = []
+
+    for node in _cycles():
+        findings.append(("cycle", node, "Part of a DG cycle"))
+
+    for node in dict.fromkeys(cmds.listConnections("time1.outTime", source=False, destination=True) or []):
+        findings.append(("time", node, f"Driven by time1.outTime ({cmds.nodeType(node)}, {_future_count(node)} nodes downstream)"))
+
+    for node in cmds.ls(type="expression") or []:
+        outputs = cmds.listConnections(node, source=False, destination=True, plugs=True) or []
+        findings.append(("expression", node, f"Drives {', '.join(outputs[:5]) or 'nothing'}"))
+
+    for node in cmds.ls(type="scriptNode") or []:
+        findings.append(("script_node", node, f"scriptType {cmds.getAttr(f'{node}.scriptType')}"))
+
+    for job in cmds.scriptJob(listJobs=True) or []:
+        if "attributeChange" in job or "connectionChange" in job or "timeChange" in job:
+            # "12: attributeChange=['L_arm_CTL.translateX', ...]"
+            match = re.search(r"['\"]([\w:|]+)\.\w+", job)
+            node = match.group(1) if match else job.split(":")[0]
+            findings.append(("script_job", node, job.strip()))
+
+    serialized = _em_node_types("nodeTypeSerialize") | _em_node_types("nodeTypeGloballySerialize")
+    untrusted = _em_node_types("nodeTypeUntrusted")
+    for node_type in sorted(serialized | untrusted):
+        for node in cmds.ls(type=node_type) or []:
+            findings.append(("untrusted" if node_type in untrusted else "serialized", node, node_type))
+
+    existing_types = set(cmds.ls(nodeTypes=True) or [])
+    for node_type in SIMULATION_TYPES:
+        if node_type in existing_types:
+            for node in cmds.ls(type=node_type) or []:
+                findings.append(("simulation", node, node_type))
+
+    for plugin in cmds.pluginInfo(query=True, listPlugins=True) or []:
+        if not cmds.pluginInfo(plugin, query=True, path=True).endswith(".py"):
+            continue
+        for node_type in cmds.pluginInfo(plugin, query=True, dependNode=True) or []:
+            for node in cmds.ls(type=node_type) or []:
+                findings.append(("python_node", node, f"{node_type} ({plugin})"))
+
+    return findings
+
+
+def audit_rig():
+    """
+    Audit the built rig for parallel evaluation and cached playback: DG cycles, time driven nodes, expressions,
+    scriptNodes and scriptJobs, node types the evaluation manager serializes or does not trust, simulation nodes and
+    Python plugin nodes.
+    Findings are grouped per module (see profile_report.node_module) and printed with the fix for each category.
+
+    Returns:
+        dict: module -> list of (category, node, detail).
+    """
+    module_groups = rig_profiler.list_module_groups()
+    prefixes = profile_report.module_prefixes(module_groups)
+
+    report = {}
+    for category, node, detail in collect_findings():
+        owner = rig_profiler.owning_module(node, module_groups) if cmds.objExists(node) else None
+        module = profile_report.node_module(node, {"module": owner}, prefixes)
+        report.setdefault(module, []).append((category, node, detail))
+
+    if not report:
+        om.MGlobal.displayInfo("Rig audit: nothing forces serial evaluation or invalidates cached playback.")
+        return report
+
+    om.MGlobal.displayWarning(f"Rig audit: {sum(len(findings) for findings in report.values())} finding(s) in {len(report)} module(s)")
+    for module, findings in sorted(report.items(), key=lambda item: len(item[1]), reverse=True):
+        print(f"{module} ({len(findings)})")
+        categories = {}
+        for category, node, detail in findings:
+            categories.setdefault(category, []).append((node, detail))
+        for category, entries in categories.items():
+            print(f"    [{category}] {FIXES[category]}")
+            for node, detail in entries:
+                print(f"        {node}: {detail}")
+
+    return report
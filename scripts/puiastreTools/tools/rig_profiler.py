@@ -0,0 +1,106 @@
+import os
+
+import maya.cmds as cmds
+import maya.api.OpenMaya as om
+
+from puiastreTools.utils import profile_report
+
+BUFFER_SIZE = 200
+
+
+def list_module_groups():
+    return cmds.ls(f"*{profile_report.MODULE_SUFFIX}", type="transform") or []
+
+
+def owning_module(node, module_groups):
+    """
+    Module _GRP above a DAG node, None for DG nodes or nodes outside the modules.
+    """
+    if not cmds.objectType(node, isAType="dagNode"):
+        return None
+    for path in cmds.ls(node, long=True) or []:
+        for parent in reversed(path.split("|")[1:-1]):
+            if parent in module_groups:
+                return parent
+    return None
+
+
+def record_playback(start=None, end=None, file_path=None, buffer_size=BUFFER_SIZE):
+    """
+    Play the frame range with the Maya profiler recording and store its events as a dump for profile_report.
+    The native profiler file is saved next to it (.txt) to be opened in the Profiler window.
+
+    Args:
+        start (float, optional): First frame. Defaults to the playback range start.
+        end (float, optional): Last frame. Defaults to the playback range end.
+        file_path (str, optional): Dump path (.json). Defaults to the scene folder (or the temp folder).
+        buffer_size (int): Profiler buffer size in MB.
+
+    Returns:
+        str: Path of the dump.
+    """
+    start = cmds.playbackOptions(query=True, minTime=True) if start is None else start
+    end = cmds.playbackOptions(query=True, maxTime=True) if end is None else end
+    if not file_path:
+        scene = cmds.file(query=True, sceneName=True)
+        folder = os.path.dirname(scene) if scene else cmds.internalVar(userTmpDir=True)
+        file_path = os.path.join(folder, f"{os.path.splitext(os.path.basename(scene))[0] or 'untitled'}_profile.json")
+
+    current = cmds.currentTime(query=True)
+    frames = [start + i for i in range(int(end - start) + 1)]
+
+    cmds.profiler(bufferSize=buffer_size)
+    cmds.profiler(reset=True)
+    cmds.profiler(sampling=True)
+    for frame in frames:
+        cmds.currentTime(frame, update=True)
+    cmds.profiler(sampling=False)
+    cmds.currentTime(current, update=True)
+
+    events = []
+    for i in range(cmds.profiler(query=True, eventCount=True)):
+        events.append([
+            cmds.profiler(eventIndex=i, query=True, eventName=True),
+            cmds.profiler(eventIndex=i, query=True, eventDescription=True),
+            cmds.profiler(eventIndex=i, query=True, eventCategory=True),
+            cmds.profiler(eventIndex=i, query=True, eventStartTime=True),
+            cmds.profiler(eventIndex=i, query=True, eventDuration=True),
+            cmds.profiler(eventIndex=i, query=True, eventThreadId=True),
+        ])
+
+    module_groups = list_module_groups()
+    names = {name for event in events for name in event[:2] if name}
+    nodes = {
+        name: {"type": cmds.nodeType(name), "module": owning_module(name, module_groups)}
+        for name in names if cmds.objExists(name)
+    }
+
+    profile_report.save_dump(file_path, {"frames": len(frames), "events": events, "nodes": nodes, "modules": module_groups})
+    cmds.profiler(output=os.path.splitext(file_path)[0] + ".txt")
+    om.MGlobal.displayInfo(f"Profiled {len(frames)} frames ({len(events)} events) to {file_path}")
+
+    return file_path
+
+
+def profile_modules(start=None, end=None, file_path=None):
+    """
+    Record the playback and print the ranked module report.
+
+    Returns:
+        list: See profile_report.module_report.
+    """
+    dump_path = record_playback(start, end, file_path)
+    return display_report(dump_path)
+
+
+def display_report(dump_path):
+    """
+    Print the ranked module report of a recorded dump in the script editor.
+
+    Returns:
+        list: See profile_report.module_report.
+    """
+    report = profile_report.module_report(profile_report.load_dump(dump_path))
+    om.MGlobal.displayInfo(f"Rig module evaluation cost ({os.path.basename(dump_path)}):")
+    print(profile_report.format_report(report))
+    return report
@@ -0,0 +1,290 @@
+import os
+import tempfile
+import time
+
+import maya.cmds as cmds
+import maya.api.OpenMaya as om
+import maya.api.OpenMayaAnim as oma
+
+from puiastreTools.utils import skin_file
+from puiastreTools.utils import skin_weights
+from puiastreTools.tools import skincluster_manager
+
+SAMPLE_SIZE = 10
+
+
+def _format_vertices(vertices):
+    sample = ", ".join(str(v) for v in vertices[:SAMPLE_SIZE].tolist())
+    return f"{len(vertices)} ({sample}{', ...' if len(vertices) > SAMPLE_SIZE else ''})"
+
+
+def display_report(label, report, max_influences=None):
+    """
+    Print a health report in the script editor, as a warning if something is wrong.
+
+    Args:
+        label (str): Mesh / skinCluster shown in the header.
+        report (dict): Report of skin_weights.health_report.
+        max_influences (int, optional): Influence budget used for the report.
+
+    Returns:
+        bool: True if the skin is healthy.
+    """
+    lines = []
+    if len(report["unweighted"]):
+        lines.append(f"Unweighted vertices: {_format_vertices(report['unweighted'])}")
+    if len(report["unnormalized"]):
+        lines.append(f"Unnormalized vertices: {_format_vertices(report['unnormalized'])}")
+    if len(report["over_budget"]):
+        lines.append(f"Vertices over {max_influences} influences (max {report['max_count']}): {_format_vertices(report['over_budget'])}")
+    if report["unused"]:
+        lines.append(f"Influences without weights ({len(report['unused'])}, can be pruned): {', '.join(report['unused'])}")
+    if report["missing"]:
+        lines.append(f"Weights on missing joints ({len(report['missing'])}): {', '.join(report['missing'])}")
+    for first, second, similarity in report["duplicates"]:
+        lines.append(f"Near duplicate influences: {first} / {second} (similarity {similarity:.4f})")
+
+    if not lines:
+        om.MGlobal.displayInfo(f"{label}: healthy ({report['vertices']} vertices, max {report['max_count']} influences per vertex).")
+        return True
+
+    om.MGlobal.displayWarning(f"{label}: {len(lines)} problem(s)")
+    for line in lines:
+        print(f"    {line}")
+    return False
+
+
+def _budget(attributes, max_influences):
+    if max_influences is not None:
+        return max_influences
+    if attributes.get("maintainMaxInfluences"):
+        return attributes.get("maxInfluences")
+    return 4
+
+
+def check_file(file_path, max_influences=None):
+    """
+    Health report of every skin of a .skn file (v1 or v2), checking the joints against the open scene.
+
+    Args:
+        file_path (str): Path to the .skn file.
+        max_influences (int, optional): Influence budget. Defaults to the skinCluster maxInfluences when maintained,
+                                        4 otherwise.
+
+    Returns:
+        dict: (mesh, skinCluster) -> report.
+    """
+    reports = {}
+    for mesh_name, skins_list in skin_file.iter_records(file_path):
+        for skin_data in skins_list:
+            budget = _budget(skin_data.get("attributes", {}), max_influences)
+            report = skin_weights.health_report(
+                skin_data.get("sparse_weights", {}), skin_data["vertex_count"], skin_data["influences"],
+                max_influences=budget, exists=cmds.objExists
+            )
+            display_report(f"{mesh_name} | {skin_data['name']}", report, budget)
+            reports[(mesh_name, skin_data["name"])] = report
+
+    return reports
+
+
+def _skin_fn(skin_name):
+    sel = om.MSelectionList()
+    sel.add(skin_name)
+    return oma.MFnSkinCluster(sel.getDependNode(0))
+
+
+def check_skin_cluster(skin_name, max_influences=None):
+    """
+    Health report of a live skinCluster, one report per deformed mesh.
+
+    Args:
+        skin_name (str): SkinCluster name.
+        max_influences (int, optional): Influence budget, see check_file.
+
+    Returns:
+        dict: mesh -> report.
+    """
+    fn_skin = _skin_fn(skin_name)
+    inf_names = [p.partialPathName() for p in fn_skin.influenceObjects()]
+    attributes = {
+        "maintainMaxInfluences": cmds.getAttr(f"{skin_name}.maintainMaxInfluences"),
+        "maxInfluences": cmds.getAttr(f"{skin_name}.maxInfluences"),
+    }
+    budget = _budget(attributes, max_influences)
+
+    reports = {}
+    for i in range(fn_skin.numOutputConnections()):
+        mesh_path = fn_skin.getPathAtIndex(fn_skin.indexForOutputConnection(i))
+        vtx_count = om.MFnMesh(mesh_path).numVertices
+
+        def fetch_weights(start, stop):
+            single_comp = om.MFnSingleIndexedComponent()
+            vertex_comp = single_comp.create(om.MFn.kMeshVertComponent)
+            single_comp.addElements(range(start, stop))
+            weights, _ = fn_skin.getWeights(mesh_path, vertex_comp)
+            return weights
+
+        sparse_weights = skin_weights.sparse_encode_chunked(fetch_weights, vtx_count, inf_names)
+        report = skin_weights.health_report(sparse_weights, vtx_count, inf_names, max_influences=budget, exists=cmds.objExists)
+        display_report(f"{mesh_path.partialPathName()} | {skin_name}", report, budget)
+        reports[mesh_path.partialPathName()] = report
+
+    return reports
+
+
+def check_scene(max_influences=None):
+    """
+    Health report of the skinClusters of the selection (meshes or skinClusters), or of every skinCluster in the scene.
+
+    Returns:
+        dict: skinCluster -> {mesh: report}.
+    """
+    skins = cmds.ls(sl=True, type="skinCluster") or []
+    for node in cmds.ls(sl=True, long=True) or []:
+        history = cmds.listHistory(node, pruneDagObjects=True) or []
+        skins.extend(h for h in history if cmds.nodeType(h) == "skinCluster")
+    if not skins:
+        skins = cmds.ls(type="skinCluster") or []
+
+    return {skin: check_skin_cluster(skin, max_influences) for skin in dict.fromkeys(skins)}
+
+
+def prune_unused_influences(skin_name):
+    """
+    Remove the influences without weights from a skinCluster, every influence costs evaluation time even at zero.
+
+    Args:
+        skin_name (str): SkinCluster name.
+
+    Returns:
+        list: Removed influences.
+    """
+    reports = check_skin_cluster(skin_name)
+    unused = set.intersection(*[set(report["unused"]) for report in reports.values()]) if reports else set()
+
+    inf_names = cmds.skinCluster(skin_name, query=True, influence=True) or []
+    removed = [inf for inf in inf_names if inf in unused]
+    if len(removed) == len(inf_names):
+        removed = removed[1:]
+
+    if removed:
+        cmds.skinCluster(skin_name, edit=True, removeInfluence=removed)
+        om.MGlobal.displayInfo(f"{skin_name}: removed {len(removed)} unused influences.")
+
+    return removed
+
+
+def time_playback(start=None, end=None, repeats=3):
+    """
+    Average frames per second of evaluating the scene frame by frame, restoring the current time afterwards.
+
+    Args:
+        start (float, optional): First frame. Defaults to the playback range start.
+        end (float, optional): Last frame. Defaults to the playback range end.
+        repeats (int): Number of passes over the range, the first one is also timed.
+
+    Returns:
+        float: Frames per second.
+    """
+    start = cmds.playbackOptions(query=True, minTime=True) if start is None else start
+    end = cmds.playbackOptions(query=True, maxTime=True) if end is None else end
+    current = cmds.currentTime(query=True)
+    frames = [start + i for i in range(int(end - start) + 1)]
+
+    elapsed = 0.0
+    for _ in range(repeats):
+        begin = time.perf_counter()
+        for frame in frames:
+            cmds.currentTime(frame, update=True)
+        elapsed += time.perf_counter() - begin
+
+    cmds.currentTime(current, update=True)
+    return len(frames) * repeats / max(elapsed, 1e-9)
+
+
+def _unbind_skins(skins):
+    """
+    Delete the skinClusters of the scene matching the given names, so the next import binds them from scratch.
+
+    Args:
+        skins (list): SkinCluster names.
+    """
+    existing = [skin for skin in skins if cmds.objExists(skin) and cmds.nodeType(skin) == "skinCluster"]
+    if existing:
+        cmds.delete(existing)
+
+
+def _backup_skins(skins, skin_io):
+    """
+    Export the existing skinClusters among skins to a temporary binary .skn, restoring the selection afterwards.
+
+    Returns:
+        str: Path of the backup, None if none of the skinClusters exist.
+    """
+    existing = [skin for skin in skins if cmds.objExists(skin) and cmds.nodeType(skin) == "skinCluster"]
+    if not existing:
+        return None
+
+    handle, backup_path = tempfile.mkstemp(suffix=".skn")
+    os.close(handle)
+    selection = cmds.ls(selection=True)
+    try:
+        cmds.select(existing, replace=True)
+        skin_io.export_skins(backup_path, binary=True)
+    finally:
+        if selection:
+            cmds.select(selection, replace=True)
+        else:
+            cmds.select(clear=True)
+    return backup_path
+
+
+def benchmark_influence_pruning(file_path, start=None, end=None, repeats=3):
+    """
+    Build the skinClusters of a .skn file twice, with import_skins(prune_influences=False) and then with
+    import_skins(prune_influences=True), timing the import and the playback of each build. The skinClusters of the
+    file are deleted before each import so both builds start unbound. The scene skinClusters are backed up to a
+    temporary .skn first and restored afterwards (weights at the .skn precision), the ones that did not exist are
+    deleted again.
+
+    Args:
+        file_path (str): Path to the .skn file.
+        start (float, optional): First frame of the timing, see time_playback.
+        end (float, optional): Last frame of the timing, see time_playback.
+        repeats (int): Number of passes over the range.
+
+    Returns:
+        dict: "full" and "pruned" builds, each with "build_time" (seconds), "fps" and "influences" (bound count).
+    """
+    skins = list(dict.fromkeys(skin_data["name"] for _, skins_list in skin_file.iter_records(file_path) for skin_data in skins_list))
+    skin_io = skincluster_manager.SkinIO()
+    original = [skin for skin in skins if cmds.objExists(skin) and cmds.nodeType(skin) == "skinCluster"]
+    backup_path = _backup_skins(original, skin_io)
+
+    results = {}
+    try:
+        for label, prune in (("full", False), ("pruned", True)):
+            _unbind_skins(skins)
+            begin = time.perf_counter()
+            skin_io.import_skins(file_path, prune_influences=prune)
+            build_time = time.perf_counter() - begin
+
+            bound = [skin for skin in skins if cmds.objExists(skin)]
+            results[label] = {
+                "build_time": build_time,
+                "fps": time_playback(start, end, repeats),
+                "influences": sum(len(_skin_fn(skin).influenceObjects()) for skin in bound),
+            }
+    finally:
+        _unbind_skins(skins)
+        if backup_path:
+            skin_io.import_skins(backup_path, skin_clusters=original)
+            os.remove(backup_path)
+
+    full, pruned = results["full"], results["pruned"]
+    om.MGlobal.displayInfo(f"Influence pruning: {full['influences']} -> {pruned['influences']} influences | "
+                           f"build {full['build_time']:.2f} s -> {pruned['build_time']:.2f} s | "
+                           f"playback {full['fps']:.1f} fps -> {pruned['fps']:.1f} fps")
+
+    return results
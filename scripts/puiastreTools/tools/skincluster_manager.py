@@ -1,8 +1,14 @@
-import json
 import os
+from concurrent.futures import ThreadPoolExecutor
 import maya.cmds as cmds
 import maya.api.OpenMaya as om
 import maya.api.OpenMayaAnim as oma
+import numpy as np
+
+from puiastreTools.utils import skin_weights
+from puiastreTools.utils import skin_file
+from puiastreTools.utils import spatial
+from puiastreTools.utils import symmetry
 
 class SkinIO:
     def __init__(self):
@@ -23,6 +29,25 @@ class SkinIO:
         except:
             return None
 
+    def _scatter_to_marray(self, size, indices, values):
+        """
+        Build an MDoubleArray of the given size from sparse values.
+        The values are assigned into a zero filled Python list, skin weights are mostly zeros and a list assignment per
+        value is cheaper than converting a dense NumPy buffer with tolist().
+
+        Args:
+            size (int): Length of the array.
+            indices (np.ndarray): Positions to write.
+            values (np.ndarray): Values to write.
+
+        Returns:
+            om.MDoubleArray: The filled array.
+        """
+        dense = [0.0] * size
+        for index, value in zip(indices.tolist(), values.tolist()):
+            dense[index] = value
+        return om.MDoubleArray(dense)
+
     def _get_skin_clusters(self, dag_path):
         """
         Original method: Finds skins from mesh history.
@@ -57,7 +82,36 @@ class SkinIO:
             om.MGlobal.displayWarning(f"Could not retrieve geometry from skin: {e}")
             return []
 
-    def export_skins(self, file_path):
+    def export_skins(self, file_path, binary=False, chunk_size=skin_weights.CHUNK_SIZE, workers=0, profile=None, store_positions=False):
+        """
+        Export the skinClusters of the selection (meshes, transforms or skinClusters) or of the whole scene.
+        The weights are queried from Maya and encoded on the main thread. With workers the sparse encoding runs in a
+        thread pool and every mesh is written by a writer thread while the next one is queried.
+
+        Args:
+            file_path (str): Destination .skn file.
+            binary (bool): If True writes the v2 binary container, otherwise the v1 JSON file.
+            chunk_size (int): Number of vertices whose weights are queried at a time.
+            workers (int, optional): Size of the encoding pool, None for the CPU count. Defaults to 0, everything
+                                     runs on the main thread.
+            profile (str or dict, optional): Lossy compression profile, a name of skin_weights.COMPRESSION_PROFILES or
+                                             a dictionary with "max_influences" / "quantize". Defaults to lossless.
+                                             Quantizing needs binary, the JSON file keeps the weights rounded to
+                                             skin_weights.DECIMALS instead.
+            store_positions (bool): Store the object space vertex positions of every skin, so the weights can be
+                                    remapped on import if the topology changes.
+        """
+        if isinstance(profile, str):
+            if profile not in skin_weights.COMPRESSION_PROFILES:
+                om.MGlobal.displayError(f"Unknown compression profile: {profile}")
+                return
+            profile = skin_weights.COMPRESSION_PROFILES[profile]
+        if profile and profile.get("quantize") and not binary:
+            # uint16 steps written as JSON floats are longer than the rounded weights
+            om.MGlobal.displayWarning("Quantized weights are only stored by the binary format, rounding the JSON weights instead.")
+            profile = dict(profile, quantize=False)
+        compression_reports = []
+
         om.MGlobal.displayInfo(f"--- Starting Export to: {file_path} ---")
         
         sel = om.MGlobal.getActiveSelectionList()
@@ -120,212 +174,436 @@ class SkinIO:
         meshes_to_process = list(meshes_map.values())
         
         full_data = {}
+        writer = None if binary else skin_file.JsonSkinWriter(file_path)
+        pool = self._pool(workers)
+        write_pool = ThreadPoolExecutor(max_workers=1) if writer and pool else None
+        pending_writes = []
 
-        # --- 3. EXPORT LOOP (Preserved Logic) ---
-        for mesh_path in meshes_to_process:
-            mesh_name = mesh_path.partialPathName()
-            mf_mesh = om.MFnMesh(mesh_path)
-            vtx_count = mf_mesh.numVertices
-            
-            # We still find ALL skins on this mesh to ensure stack order and completeness.
-            # Even if user selected just one skin, we usually want the full stack for that mesh 
-            # to maintain the file format structure (Mesh -> [Skins]).
-            skins = self._get_skin_clusters(mesh_path)
-            if not skins:
-                continue
-
-            om.MGlobal.displayInfo(f"Processing: {mesh_name} | Skins: {len(skins)}")
-            
-            mesh_data = []
-            
-            for skin_name in skins:
-                sel_skin = om.MSelectionList()
-                sel_skin.add(skin_name)
-                mf_skin = oma.MFnSkinCluster(sel_skin.getDependNode(0))
-
-                # --- Atributos ---
-                attrs = {}
-                for attr in self.k_skin_attrs:
-                    try:
-                        attrs[attr] = cmds.getAttr(f"{skin_name}.{attr}")
-                    except:
-                        pass
+        def write_mesh(mesh_name, mesh_data):
+            writer.begin_mesh(mesh_name)
+            for skin_entry in mesh_data:
+                writer.add_skin(skin_entry)
+            writer.end_mesh()
 
-                # --- Influencias ---
-                influences_paths = mf_skin.influenceObjects()
-                inf_names = [p.partialPathName() for p in influences_paths]
+        # --- 3. EXPORT LOOP (Preserved Logic) ---
+        try:
+            for mesh_path in meshes_to_process:
+                mesh_name = mesh_path.partialPathName()
+                mf_mesh = om.MFnMesh(mesh_path)
+                vtx_count = mf_mesh.numVertices
+
+                # We still find ALL skins on this mesh to ensure stack order and completeness.
+                # Even if user selected just one skin, we usually want the full stack for that mesh
+                # to maintain the file format structure (Mesh -> [Skins]).
+                skins = self._get_skin_clusters(mesh_path)
+                if not skins:
+                    continue
+
+                om.MGlobal.displayInfo(f"Processing: {mesh_name} | Skins: {len(skins)}")
+
+                mesh_data = [self._export_skin(skin_name, mesh_path, vtx_count, chunk_size, pool) for skin_name in skins]
+
+                if store_positions:
+                    positions = skin_weights.round_weights(self._mesh_points(mesh_path).ravel())
+                    for skin_entry in mesh_data:
+                        skin_entry["positions"] = positions
+
+                if profile:
+                    for skin_entry in mesh_data:
+                        skin_entry["sparse_weights"], report = skin_weights.compress_sparse(skin_entry["sparse_weights"], vtx_count, **profile)
+                        compression_reports.append(report)
+                        om.MGlobal.displayInfo(f"  {skin_entry['name']}: {report['entries_before']} -> {report['entries_after']} weights | "
+                                               f"max error {report['max_error']:.6f} | rms error {report['rms_error']:.6f}")
+
+                # JSON is streamed mesh by mesh, the binary container needs the whole index before the data
+                if write_pool:
+                    pending_writes.append(write_pool.submit(write_mesh, mesh_name, mesh_data))
+                elif writer:
+                    write_mesh(mesh_name, mesh_data)
+                else:
+                    full_data[mesh_name] = mesh_data
+
+            for future in pending_writes:
+                future.result()
+        finally:
+            if write_pool:
+                write_pool.shutdown(wait=True)
+            if pool:
+                pool.shutdown(wait=True)
+            if writer:
+                writer.close()
+
+        if binary:
+            skin_file.write_v2(file_path, full_data, quantize=bool(profile and profile.get("quantize")))
+
+        if compression_reports:
+            report = skin_weights.merge_compression_reports(compression_reports)
+            om.MGlobal.displayInfo(f"Compression: {report['entries_before']} -> {report['entries_after']} weights | "
+                                   f"max error {report['max_error']:.6f} | rms error {report['rms_error']:.6f}")
 
-                # --- Pesos (Logica Sparse) ---
-                single_comp = om.MFnSingleIndexedComponent()
-                vertex_comp = single_comp.create(om.MFn.kMeshVertComponent)
-                single_comp.setCompleteData(vtx_count)
-                
-                weights_marray, _ = mf_skin.getWeights(mesh_path, vertex_comp)
-                flat_weights = list(weights_marray)
-                
-                sparse_weights = {}
-                stride = len(inf_names)
-                
-                for inf_idx, inf_name in enumerate(inf_names):
-                    j_indices = []
-                    j_weights = []
-                    
-                    for v_idx in range(vtx_count):
-                        val = flat_weights[v_idx * stride + inf_idx]
-                        if val > self.tolerance:
-                            j_indices.append(v_idx)
-                            j_weights.append(round(val, 5))
-                    
-                    if j_indices:
-                        sparse_weights[inf_name] = {
-                            "ix": j_indices,
-                            "vw": j_weights
-                        }
-
-                # --- Blend Weights ---
-                blend_weights_marray = mf_skin.getBlendWeights(mesh_path, vertex_comp)
-                flat_blend = list(blend_weights_marray)
-                sparse_blend = {}
-                
-                b_indices = []
-                b_values = []
-                for v_idx, val in enumerate(flat_blend):
-                    if val > self.tolerance:
-                        b_indices.append(v_idx)
-                        b_values.append(round(val, 5))
-                
-                if b_indices:
-                    sparse_blend = {"ix": b_indices, "vw": b_values}
-                
-                skin_entry = {
-                    "name": skin_name,
-                    "vertex_count": vtx_count,
-                    "attributes": attrs,
-                    "influences": inf_names, 
-                    "sparse_weights": sparse_weights,
-                    "sparse_blend": sparse_blend
-                }
-                mesh_data.append(skin_entry)
-
-            full_data[mesh_name] = mesh_data
-
-        with open(file_path, 'w') as f:
-            json.dump(full_data, f, separators=(',', ':'))
-            
         om.MGlobal.displayInfo(f"Export completed. Optimized file saved.")
 
-    def import_skins(self, file_path):
-        # ... (Same as original import logic) ...
-        # I have omitted it here for brevity as no changes were requested for import logic
-        # You should keep the original import_skins code here.
+    def _pool(self, workers=None):
+        """
+        Thread pool for the encode / decode work, None when workers is 0.
+        Maya API calls always stay on the main thread, only NumPy and file work is sent to the pool (a process pool
+        would have to start mayapy interpreters and pickle every array, so threads are used). The pool is opt-in: most
+        of that work holds the GIL (np.asarray over the decoded lists, json.load of v1 files) so it barely overlaps
+        with the Maya calls.
+        """
+        workers = os.cpu_count() if workers is None else workers
+        if not workers:
+            return None
+        return ThreadPoolExecutor(max_workers=workers)
+
+    def _mesh_points(self, mesh_path):
+        """
+        Object space vertex positions of a mesh as a (N, 3) array.
+        """
+        return symmetry._mesh_points(om.MFnMesh(mesh_path))
+
+    def _vertex_component(self, start, stop):
+        """
+        Vertex component for the range [start, stop).
+        """
+        single_comp = om.MFnSingleIndexedComponent()
+        vertex_comp = single_comp.create(om.MFn.kMeshVertComponent)
+        single_comp.addElements(range(start, stop))
+        return vertex_comp
+
+    def _export_skin(self, skin_name, mesh_path, vtx_count, chunk_size=skin_weights.CHUNK_SIZE, pool=None):
+        """
+        Build the export entry of a skinCluster. The weights are queried in vertex chunks and reduced to their sparse
+        blocks chunk by chunk, so only chunk_size x influences dense weights are alive at a time (skin_weights.PIPELINE_DEPTH
+        chunks with a pool, one being queried while the previous one is encoded).
+
+        Args:
+            skin_name (str): Name of the skinCluster.
+            mesh_path (om.MDagPath): Path of the deformed mesh.
+            vtx_count (int): Number of vertices of the mesh.
+            chunk_size (int): Number of vertices queried at a time.
+            pool (ThreadPoolExecutor, optional): Pool encoding the chunks while the next ones are queried.
+
+        Returns:
+            dict: Skin entry of the .skn file, with the ix / vw blocks as NumPy arrays.
+        """
+        sel_skin = om.MSelectionList()
+        sel_skin.add(skin_name)
+        mf_skin = oma.MFnSkinCluster(sel_skin.getDependNode(0))
+
+        # --- Atributos ---
+        attrs = {}
+        for attr in self.k_skin_attrs:
+            try:
+                attrs[attr] = cmds.getAttr(f"{skin_name}.{attr}")
+            except:
+                pass
+
+        # --- Influencias ---
+        influences_paths = mf_skin.influenceObjects()
+        inf_names = [p.partialPathName() for p in influences_paths]
+
+        # --- Pesos (Logica Sparse) ---
+        def fetch_weights(start, stop):
+            weights_marray, _ = mf_skin.getWeights(mesh_path, self._vertex_component(start, stop))
+            return weights_marray
+
+        def fetch_blend(start, stop):
+            blend_marray = mf_skin.getBlendWeights(mesh_path, self._vertex_component(start, stop))
+            return np.fromiter(blend_marray, dtype=np.float64, count=len(blend_marray))
+
+        sparse_weights = skin_weights.sparse_encode_chunked(fetch_weights, vtx_count, inf_names, chunk_size, tolerance=self.tolerance, executor=pool)
+
+        # --- Blend Weights ---
+        sparse_blend = skin_weights.sparse_encode_blend_chunked(fetch_blend, vtx_count, chunk_size, tolerance=self.tolerance, executor=pool)
+
+        return {
+            "name": skin_name,
+            "vertex_count": vtx_count,
+            "attributes": attrs,
+            "influences": inf_names,
+            "sparse_weights": sparse_weights,
+            "sparse_blend": sparse_blend
+        }
+
+    def import_skins(self, file_path, meshes=None, skin_clusters=None, influences=None, workers=0, remap="closest", prune_influences=False):
+        """
+        Import a .skn file, v1 JSON or v2 binary, the format is detected from the file header.
+        With filters only the matching records are decoded (streamed for v1, read from the index for v2), so a single
+        mesh or skinCluster can be re-applied without paying for the whole character.
+
+        Args:
+            file_path (str): Path to the .skn file.
+            meshes (list, optional): Mesh names or glob patterns to import. Defaults to all.
+            skin_clusters (list, optional): SkinCluster names or glob patterns to import. Defaults to all.
+            influences (list, optional): Only set the weights of these influences, the other influences of the
+                                         skinCluster are rescaled so every vertex still sums to 1. Blend weights
+                                         are not imported. Defaults to all.
+            workers (int, optional): Size of the decoding pool, None for the CPU count. Defaults to 0, everything
+                                     runs on the main thread.
+            remap (str, optional): Fallback for skins whose vertex count does not match the scene mesh, if the file
+                                   stores the vertex positions: "closest" takes the weights of the closest exported
+                                   vertex, "interpolate" blends the 4 closest ones. None skips those skins.
+            prune_influences (bool): Only bind the influences that carry weights, influences at zero everywhere are
+                                     not added to the skinClusters (they still cost evaluation time). Existing
+                                     skinClusters also lose the influences left without weights after the import.
+        """
         if not os.path.exists(file_path):
-            om.MGlobal.displayError("JSON file does not exist.")
+            om.MGlobal.displayError("Skin file does not exist.")
             return
 
-        with open(file_path, 'r') as f:
-            data = json.load(f)
+        if meshes is not None or skin_clusters is not None or influences is not None:
+            self._import_data(skin_file.iter_records(file_path, meshes, skin_clusters, influences), influences=influences, workers=workers, remap=remap, prune_influences=prune_influences)
+            return
 
-        for mesh_name, skins_list in data.items():
-            mesh_path = self._get_dag_path(mesh_name)
-            if not mesh_path:
-                om.MGlobal.displayWarning(f"Mesh skipped: {mesh_name}")
-                continue
-            
-            mesh_path.extendToShape()
-            mf_mesh = om.MFnMesh(mesh_path)
-            processed_skins = []
+        data = skin_file.load(file_path)
+        try:
+            self._import_data(data.items(), workers=workers, remap=remap, prune_influences=prune_influences)
+        finally:
+            if isinstance(data, skin_file.SknFile):
+                data.close()
 
-            for skin_data in skins_list:
-                skin_name = skin_data["name"]
-                target_vtx_count = skin_data["vertex_count"]
-                
-                if mf_mesh.numVertices != target_vtx_count:
-                    om.MGlobal.displayError(f"{skin_name} does not match topology. Skip.")
-                    continue 
+    def _decode_skin(self, skin_data, influences=None):
+        """
+        Decode the blocks of a skin record to NumPy arrays and precompute the flat setWeights buffer for the influence
+        order of the file. Only NumPy work, safe to run in the pool.
 
-                json_influences = skin_data["influences"]
-                skin_exists = cmds.objExists(skin_name) and cmds.nodeType(skin_name) == "skinCluster"
-                mf_skin = None
-                
-                if skin_exists:
-                    sel_s = om.MSelectionList()
-                    sel_s.add(skin_name)
-                    mf_skin = oma.MFnSkinCluster(sel_s.getDependNode(0))
-                    scene_infs = [p.partialPathName() for p in mf_skin.influenceObjects()]
-                    missing_infs = [inf for inf in json_influences if inf not in scene_infs]
-                    if missing_infs:
-                        cmds.skinCluster(skin_name, e=True, addInfluence=missing_infs, weight=0.0)
-                else:
-                    valid_joints = [j for j in json_influences if cmds.objExists(j)]
-                    if not valid_joints: continue
-                    new_skin = cmds.skinCluster(valid_joints, mesh_path.fullPathName(), n=skin_name, toSelectedBones=True, multi=True)[0]
-                    sel_s = om.MSelectionList()
-                    sel_s.add(new_skin)
-                    mf_skin = oma.MFnSkinCluster(sel_s.getDependNode(0))
-
-                for attr, val in skin_data["attributes"].items():
-                    try:
-                        cmds.setAttr(f"{skin_name}.{attr}", val)
-                    except: pass
-                
-                scene_inf_paths = mf_skin.influenceObjects()
-                scene_inf_names = [p.partialPathName() for p in scene_inf_paths]
-                scene_inf_map = {name: i for i, name in enumerate(scene_inf_names)}
+        Args:
+            skin_data (dict): Skin dictionary of the file.
+            influences (list, optional): Influence subset to keep. Defaults to all.
 
-                num_verts = target_vtx_count
-                num_scene_infs = len(scene_inf_names)
+        Returns:
+            dict: "influences", "weighted" (influences with weights), "sparse_weights" (NumPy blocks), "flat"
+                  (indices, values) and "blend" (indices, values).
+        """
+        inf_names = skin_data["influences"]
+        if influences is not None:
+            inf_names = [inf for inf in inf_names if inf in influences]
+
+        sparse_weights = {
+            inf: {"ix": np.asarray(block["ix"], dtype=np.int64), "vw": np.asarray(block["vw"], dtype=np.float64)}
+            for inf, block in skin_data.get("sparse_weights", {}).items()
+        }
+        sparse_blend = skin_data.get("sparse_blend", {})
+        vtx_count = skin_data["vertex_count"]
+
+        return {
+            "influences": inf_names,
+            "weighted": set(skin_weights.weighted_influences(sparse_weights, self.tolerance)),
+            "sparse_weights": sparse_weights,
+            "flat": skin_weights.sparse_decode_flat(sparse_weights, vtx_count, inf_names),
+            "blend": skin_weights.sparse_decode_flat({"blend": sparse_blend}, vtx_count, ["blend"]) if sparse_blend else None
+        }
+
+    def _import_data(self, records, influences=None, workers=0, remap="closest", prune_influences=False):
+        """
+        Apply skin records to the meshes of the scene.
+        With workers the records are decoded in a thread pool a few meshes ahead while Maya applies the weights on the
+        main thread.
+
+        Args:
+            records (iterable): (mesh name, list of skin dictionaries) pairs.
+            influences (list, optional): Only set the weights of these influences. Defaults to all.
+            workers (int, optional): Size of the decoding pool, None for the CPU count. Defaults to 0 (main thread).
+            remap (str, optional): Topology mismatch fallback, see import_skins.
+            prune_influences (bool): Only bind the influences that carry weights.
+        """
+        def decode_record(record):
+            mesh_name, skins_list = record
+            return mesh_name, [(skin_data, self._decode_skin(skin_data, influences)) for skin_data in skins_list]
 
-                full_weight_list = [0.0] * (num_verts * num_scene_infs)
-                sparse_data = skin_data.get("sparse_weights", {})
-                
-                for j_name, data_block in sparse_data.items():
-                    if j_name not in scene_inf_map: continue
-                    scene_inf_idx = scene_inf_map[j_name]
-                    indices = data_block["ix"]
-                    values = data_block["vw"]
-                    for v_idx, weight_val in zip(indices, values):
-                        flat_index = (v_idx * num_scene_infs) + scene_inf_idx
-                        full_weight_list[flat_index] = weight_val
-                
-                m_influence_indices = om.MIntArray(list(range(num_scene_infs)))
-                final_weights = om.MDoubleArray(full_weight_list)
-                
-                single_comp = om.MFnSingleIndexedComponent()
-                vertex_comp = single_comp.create(om.MFn.kMeshVertComponent)
-                single_comp.setCompleteData(num_verts)
-                
-                prev_norm = cmds.getAttr(f"{skin_name}.normalizeWeights")
-                prev_max = cmds.getAttr(f"{skin_name}.maintainMaxInfluences")
+        pool = self._pool(workers)
+        try:
+            if pool:
+                decoded_records = skin_weights.pipelined(pool, decode_record, records)
+            else:
+                decoded_records = (decode_record(record) for record in records)
+
+            pruned = 0
+            for mesh_name, skins_list in decoded_records:
+                pruned += self._apply_mesh(mesh_name, skins_list, influences, remap, prune_influences)
+        finally:
+            if pool:
+                pool.shutdown(wait=True)
+
+        if prune_influences:
+            om.MGlobal.displayInfo(f"Influence pruning: {pruned} influences without weights not bound or removed.")
+
+    def _remap_skin(self, skin_data, mesh_points, remap="closest", vertex_map=None, influences=None):
+        """
+        Remap a skin record exported on another topology to the scene mesh using its stored vertex positions.
 
-                cmds.setAttr(f"{skin_name}.normalizeWeights", 0)
-                cmds.setAttr(f"{skin_name}.maintainMaxInfluences", 0)
+        Args:
+            skin_data (dict): Skin dictionary of the file, with "positions".
+            mesh_points (np.ndarray): (N, 3) object space positions of the scene mesh.
+            remap (str): "closest" or "interpolate".
+            vertex_map (tuple, optional): (indices, weights) already computed for these positions.
+            influences (list, optional): Influence subset to keep. Defaults to all.
 
+        Returns:
+            tuple: (skin dictionary, decoded skin, vertex map) for the scene topology.
+        """
+        if vertex_map is None:
+            source_points = np.asarray(skin_data["positions"], dtype=np.float64).reshape(-1, 3)
+            tree = spatial.KDTree(source_points)
+            if remap == "interpolate":
+                vertex_map = spatial.interpolation_map(source_points, mesh_points, tree=tree)
+            else:
+                vertex_map = spatial.closest_point_map(source_points, mesh_points, tree=tree)
+
+        indices, weights = vertex_map
+        remapped = dict(skin_data)
+        remapped["vertex_count"] = len(mesh_points)
+        remapped["sparse_weights"] = skin_weights.remap_sparse(
+            skin_data.get("sparse_weights", {}), skin_data["vertex_count"], skin_data["influences"], indices, weights,
+            tolerance=self.tolerance
+        )
+        remapped["sparse_blend"] = skin_weights.remap_blend(skin_data.get("sparse_blend", {}), skin_data["vertex_count"], indices, weights, tolerance=self.tolerance)
+        del remapped["positions"]
+
+        return remapped, self._decode_skin(remapped, influences), vertex_map
+
+    def _apply_mesh(self, mesh_name, skins_list, influences=None, remap="closest", prune_influences=False):
+        """
+        Apply the decoded skins of a mesh, creating the missing skinClusters and restoring the deformer order.
+
+        Args:
+            mesh_name (str): Name of the mesh.
+            skins_list (list): (skin dictionary, decoded skin) pairs, decoded with _decode_skin.
+            influences (list, optional): Only set the weights of these influences. Defaults to all.
+            remap (str, optional): Topology mismatch fallback, see import_skins.
+            prune_influences (bool): Only bind the influences that carry weights.
+
+        Returns:
+            int: Number of influences left unbound by the pruning.
+        """
+        pruned = 0
+        mesh_path = self._get_dag_path(mesh_name)
+        if not mesh_path:
+            om.MGlobal.displayWarning(f"Mesh skipped: {mesh_name}")
+            return pruned
+
+        mesh_path.extendToShape()
+        mf_mesh = om.MFnMesh(mesh_path)
+        processed_skins = []
+        mesh_points = None
+        vertex_maps = {}
+
+        for skin_data, decoded in skins_list:
+            skin_name = skin_data["name"]
+            target_vtx_count = skin_data["vertex_count"]
+            
+            if mf_mesh.numVertices != target_vtx_count:
+                if not remap or skin_data.get("positions") is None:
+                    om.MGlobal.displayError(f"{skin_name} does not match topology. Skip.")
+                    continue
+
+                # Skins of the same stack share the exported positions, the vertex map is only built once
+                if mesh_points is None:
+                    mesh_points = self._mesh_points(mesh_path)
+                skin_data, decoded, vertex_maps[target_vtx_count] = self._remap_skin(
+                    skin_data, mesh_points, remap, vertex_maps.get(target_vtx_count), influences
+                )
+                om.MGlobal.displayWarning(f"{skin_name} topology changed ({target_vtx_count} -> {mf_mesh.numVertices} vertices), "
+                                          f"weights remapped ({remap}).")
+                target_vtx_count = skin_data["vertex_count"]
+
+            json_influences = decoded["influences"]
+            skin_exists = cmds.objExists(skin_name) and cmds.nodeType(skin_name) == "skinCluster"
+            if prune_influences:
+                kept = [inf for inf in json_influences if inf in decoded["weighted"]]
+                # Existing skinClusters are pruned after the weights are set, their count comes from the removal
+                if not skin_exists:
+                    pruned += len(json_influences) - len(kept)
+                json_influences = kept
+            mf_skin = None
+            
+            if skin_exists:
+                sel_s = om.MSelectionList()
+                sel_s.add(skin_name)
+                mf_skin = oma.MFnSkinCluster(sel_s.getDependNode(0))
+                scene_infs = [p.partialPathName() for p in mf_skin.influenceObjects()]
+                missing_infs = [inf for inf in json_influences if inf not in scene_infs]
+                if missing_infs:
+                    cmds.skinCluster(skin_name, e=True, addInfluence=missing_infs, weight=0.0)
+            else:
+                valid_joints = [j for j in json_influences if cmds.objExists(j)]
+                if not valid_joints: continue
+                new_skin = cmds.skinCluster(valid_joints, mesh_path.fullPathName(), n=skin_name, toSelectedBones=True, multi=True)[0]
+                sel_s = om.MSelectionList()
+                sel_s.add(new_skin)
+                mf_skin = oma.MFnSkinCluster(sel_s.getDependNode(0))
+
+            for attr, val in skin_data["attributes"].items():
                 try:
+                    cmds.setAttr(f"{skin_name}.{attr}", val)
+                except: pass
+            
+            scene_inf_paths = mf_skin.influenceObjects()
+            scene_inf_names = [p.partialPathName() for p in scene_inf_paths]
+            influence_indices = list(range(len(scene_inf_names)))
+
+            if influences is not None:
+                influence_indices = [i for i, name in enumerate(scene_inf_names) if name in influences]
+                scene_inf_names = [scene_inf_names[i] for i in influence_indices]
+
+            num_verts = target_vtx_count
+            num_scene_infs = len(scene_inf_names)
+
+            # The flat buffer was decoded in the pool for the file influence order, only remap if the scene differs
+            if scene_inf_names == decoded["influences"]:
+                flat_indices, flat_values = decoded["flat"]
+            else:
+                flat_indices, flat_values = skin_weights.sparse_decode_flat(decoded["sparse_weights"], num_verts, scene_inf_names)
+
+            m_influence_indices = om.MIntArray(influence_indices)
+            final_weights = self._scatter_to_marray(num_verts * num_scene_infs, flat_indices, flat_values)
+            
+            single_comp = om.MFnSingleIndexedComponent()
+            vertex_comp = single_comp.create(om.MFn.kMeshVertComponent)
+            single_comp.setCompleteData(num_verts)
+            
+            prev_norm = cmds.getAttr(f"{skin_name}.normalizeWeights")
+            prev_max = cmds.getAttr(f"{skin_name}.maintainMaxInfluences")
+
+            # A full import writes every column as exported. An influence subset only writes its columns, so Maya
+            # rescales the influences left out of the subset to keep every vertex sum at 1
+            normalize = influences is not None
+            cmds.setAttr(f"{skin_name}.normalizeWeights", 1 if normalize else 0)
+            cmds.setAttr(f"{skin_name}.maintainMaxInfluences", 0)
+
+            try:
+
+                mf_skin.setWeights(mesh_path, vertex_comp, m_influence_indices, final_weights, normalize)
+                
+            finally:
+                cmds.setAttr(f"{skin_name}.normalizeWeights", prev_norm)
+                cmds.setAttr(f"{skin_name}.maintainMaxInfluences", prev_max)
 
-                    mf_skin.setWeights(mesh_path, vertex_comp, m_influence_indices, final_weights, False)
-                    
-                finally:
-                    cmds.setAttr(f"{skin_name}.normalizeWeights", prev_norm)
-                    cmds.setAttr(f"{skin_name}.maintainMaxInfluences", prev_max)
 
 
+            if decoded["blend"] is not None and influences is not None:
+                om.MGlobal.displayWarning(f"{skin_name}: blend weights are not imported with an influence subset.")
+            elif decoded["blend"] is not None:
+                blend_indices, blend_values = decoded["blend"]
+                full_blend = self._scatter_to_marray(num_verts, blend_indices, blend_values)
+                mf_skin.setBlendWeights(mesh_path, vertex_comp, full_blend)
 
-                sparse_blend = skin_data.get("sparse_blend", {})
-                if sparse_blend:
-                    full_blend = [0.0] * num_verts
-                    for v_idx, val in zip(sparse_blend["ix"], sparse_blend["vw"]):
-                        full_blend[v_idx] = val
-                    mf_skin.setBlendWeights(mesh_path, vertex_comp, om.MDoubleArray(full_blend))
+            if prune_influences and skin_exists:
+                # Influences bound before the import keep costing evaluation time at zero weight, remove them
+                from puiastreTools.tools import skin_health  # skin_health imports this module
+                pruned += len(skin_health.prune_unused_influences(skin_name))
 
-                processed_skins.append(skin_name)
+            processed_skins.append(skin_name)
 
-            if processed_skins:
-                current_hist = cmds.listHistory(mesh_path.fullPathName(), pruneDagObjects=True, interestLevel=1)
-                current_skins = [x for x in current_hist if cmds.nodeType(x) == "skinCluster"]
-                current_skins = list(reversed(current_skins))
-                unknown = [s for s in current_skins if s not in processed_skins]
-                order = unknown + processed_skins
-                for skin in reversed(order):
-                    try: cmds.reorderDeformers(skin, mesh_path.fullPathName(), back=True)
-                    except: pass
+        if processed_skins:
+            current_hist = cmds.listHistory(mesh_path.fullPathName(), pruneDagObjects=True, interestLevel=1)
+            current_skins = [x for x in current_hist if cmds.nodeType(x) == "skinCluster"]
+            current_skins = list(reversed(current_skins))
+            unknown = [s for s in current_skins if s not in processed_skins]
+            order = unknown + processed_skins
+            for skin in reversed(order):
+                try: cmds.reorderDeformers(skin, mesh_path.fullPathName(), back=True)
+                except: pass
 
+        return pruned
@@ -14,6 +14,9 @@ from puiastreTools.utils import core
 from puiastreTools.ui import project_manager
 from puiastreTools.tools import skincluster_manager
 from puiastreTools.tools import copy_skinweights
+from puiastreTools.tools import skin_health
+from puiastreTools.tools import rig_profiler
+from puiastreTools.tools import rig_audit
 
 reload(option_menu)
 reload(guide_creation)
@@ -23,16 +26,62 @@ reload(project_manager)
 reload(skincluster_manager)
 
 FILE_PATH = os.path.dirname(os.path.abspath(__file__)).split("\scripts")[0]
+SKIN_TRANSFER_TOOLTIP = ("Fast copy through shared spatial maps. Differs from Copy Skin Cluster: closest vertex instead of "
+                         "closestPoint, mirror across the target object space YZ instead of world YZ, influences matched "
+                         "by name / L_-R_ prefix instead of label, oneToOne and closestJoint.")
 
-def copy_skinweights_ui_call(*args):
+def copy_skinweights_ui_call(*args, legacy=True):
     """
     Function to launch the Copy Skin Weights UI.
 
     This function imports the copy_skinweights module, reloads it to ensure the latest version is used,
     and then calls the copy_skinweights_ui function to display the UI.
+
+    Args:
+        legacy (bool): Copy with copySkinWeights, False uses the SkinTransfer engine (see SKIN_TRANSFER_TOOLTIP).
+    """
+    reload(copy_skinweights)
+    copy_skinweights.transfer_multi_skin_clusters(legacy=legacy)
+
+def skin_health_call(*args):
+    """
+    Function to print the health report of the selected skinClusters, or of every skinCluster in the scene.
+
+    Args:
+        *args: Variable length argument list, not used in this function.
+    """
+    reload(skin_health)
+    skin_health.check_scene()
+
+def rig_profiler_call(*args):
+    """
+    Function to play the playback range with the profiler recording and print the evaluation cost of every rig module.
+
+    Args:
+        *args: Variable length argument list, not used in this function.
+    """
+    reload(rig_profiler)
+    rig_profiler.profile_modules()
+
+def rig_audit_call(*args):
+    """
+    Function to print what forces serial evaluation or invalidates cached playback in the built rig, per module.
+
+    Args:
+        *args: Variable length argument list, not used in this function.
+    """
+    reload(rig_audit)
+    rig_audit.audit_rig()
+
+def mirror_skinweights_call(*args):
+    """
+    Function to mirror the skinClusters of the selected meshes from +X to -X, using the cached symmetry map of each mesh.
+
+    Args:
+        *args: Variable length argument list, not used in this function.
     """
     reload(copy_skinweights)
-    copy_skinweights.transfer_multi_skin_clusters()
+    copy_skinweights.mirror_skin_clusters()
 
 def vectorify_ui_call(*args):
     """
@@ -122,6 +171,16 @@ def replace_shapes(*args):
 
     curve_tool.replace_shape_colored()
 
+def update_shapes(*args):
+
+    """
+    Function to re-apply the controllers library shapes, colors and line widths to the controllers in the scene.
+    Args:
+        *args: Variable length argument list, not used in this function.
+    """
+    core.load_data()
+    curve_tool.update_shapes_from_library()
+
 def import_guides(*args): 
     """
     Function to import guides into the scene. If value is True, imports all guides; if None, opens an option box.
@@ -146,16 +205,23 @@ def export_guides(*args, mirror = False):
     guide_creation.guides_export(mirror=mirror)
 
 
-def export_skincluster(*args): 
+def export_skincluster(*args, binary = False, profile = None): 
     """
     Function to export skin cluster data from the scene.
 
     Args:
         *args: Variable length argument list, not used in this function.
+        binary (bool, optional): If True exports the binary (v2) .skn format. Defaults to False.
+        profile (str, optional): Compression profile, the file is saved in a subfolder named after the profile next to the
+                                 skinning file, so the build never picks it as the latest skinning version. Defaults to None.
     """ 
     core.load_data()
     path = core.DataManager.get_skinning_data()
-    skincluster_manager.SkinIO().export_skins(file_path = path)
+    if profile:
+        folder, file_name = os.path.split(path)
+        os.makedirs(os.path.join(folder, profile), exist_ok=True)
+        path = os.path.join(folder, profile, file_name)
+    skincluster_manager.SkinIO().export_skins(file_path = path, binary = binary, profile = profile)
 
 def adonis_ui_call(*args):
     """
@@ -204,6 +270,7 @@ def puiastre_ui():
     cmds.menuItem(label="   Export all controllers", command=partial(export_curves))
     cmds.menuItem(label="   Mirror all L_ to R_", command=mirror_ctl)
     cmds.menuItem(label="   Replace Shapes", command=replace_shapes)
+    cmds.menuItem(label="   Update Shapes From Library", command=update_shapes)
     cmds.setParent("PuiastreMenu", menu=True)
     cmds.menuItem(dividerLabel="\n ", divider=True)
 
@@ -213,13 +280,22 @@ def puiastre_ui():
     
     cmds.menuItem(label="   Skinning Tools", subMenu=True, tearOff=True, boldFont=True)
     cmds.menuItem(label="   Export Skin Cluster", command=export_skincluster)
-    cmds.menuItem(label="   Copy Skin Cluster", command=copy_skinweights_ui_call)
+    cmds.menuItem(optionBox=True, command=partial(export_skincluster, binary=True), label="Export Skin Cluster (Binary)")
+    cmds.menuItem(label="   Export Skin Cluster (Game)", command=partial(export_skincluster, binary=True, profile="game"))
+    cmds.menuItem(label="   Copy Skin Cluster", command=copy_skinweights_ui_call,
+                  annotation="Copy the skinClusters with copySkinWeights (closestPoint, world YZ mirror).")
+    cmds.menuItem(optionBox=True, command=partial(copy_skinweights_ui_call, legacy=False), label="Copy Skin Cluster (Fast)",
+                  annotation=SKIN_TRANSFER_TOOLTIP)
+    cmds.menuItem(label="   Mirror Skin Cluster", command=mirror_skinweights_call)
+    cmds.menuItem(label="   Skin Health Report", command=skin_health_call)
     cmds.setParent("PuiastreMenu", menu=True)
     cmds.menuItem(dividerLabel="\n ", divider=True)
 
     cmds.menuItem(label="   Animation", subMenu=True, tearOff=True, boldFont=True)
     cmds.menuItem(label="   USD Exporter", command=usdAnimTool)
     cmds.menuItem(label="   Vectorify", command=vectorify_ui_call)
+    cmds.menuItem(label="   Profile Rig Modules", command=rig_profiler_call)
+    cmds.menuItem(label="   Audit Parallel Evaluation", command=rig_audit_call)
     cmds.setParent("PuiastreMenu", menu=True)
     cmds.menuItem(dividerLabel="\n ", divider=True)
 
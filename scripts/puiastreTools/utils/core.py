@@ -120,6 +120,76 @@ class DataManager:
         cls._mesh_data = None
         cls._asset_name = None
 
+class NodeCache:
+    """
+    Utility nodes of the current build keyed by (node type, source plugs, settings), so rig modules driven by the same
+    controls share one node instead of evaluating duplicates. Cleared at the start of every build and before a scene
+    is created or opened, so a module built standalone after File > New never gets a node of the previous scene.
+    """
+    _nodes = {}
+    _created = {}
+    _reused = {}
+    _callbacks = []
+
+    @classmethod
+    def _watch_scene(cls):
+        """
+        Register the scene callbacks clearing the cache, once per session (on the first use).
+        """
+        if cls._callbacks:
+            return
+        cls._callbacks = [
+            om.MSceneMessage.addCallback(message, lambda *args: cls.clear())
+            for message in (om.MSceneMessage.kBeforeNew, om.MSceneMessage.kBeforeOpen)
+        ]
+
+    @classmethod
+    def get(cls, node_type, sources, create, settings=None):
+        """
+        Get the cached node, or create it with create() and cache it.
+
+        Args:
+            node_type (str): Node type, part of the key.
+            sources (str or tuple): Source plug(s) driving the node.
+            create (callable): Creates and wires the node, returns its name.
+            settings (dict, optional): Attribute values that make the node different for the same sources.
+
+        Returns:
+            str: Node name.
+        """
+        cls._watch_scene()
+        key = (node_type, sources if isinstance(sources, tuple) else (sources,), tuple(sorted((settings or {}).items())))
+        node = cls._nodes.get(key)
+        if node and cmds.objExists(node):
+            cls._reused[node_type] = cls._reused.get(node_type, 0) + 1
+            return node
+
+        node = create()
+        cls._nodes[key] = node
+        cls._created[node_type] = cls._created.get(node_type, 0) + 1
+        return node
+
+    @classmethod
+    def clear(cls):
+        cls._nodes = {}
+        cls._created = {}
+        cls._reused = {}
+
+    @classmethod
+    def report(cls):
+        """
+        Display the created and reused nodes per type.
+
+        Returns:
+            dict: node type -> (created, reused).
+        """
+        report = {node_type: (cls._created.get(node_type, 0), cls._reused.get(node_type, 0))
+                  for node_type in sorted(set(cls._created) | set(cls._reused))}
+        saved = sum(reused for _, reused in report.values())
+        details = ", ".join(f"{node_type} {created} created / {reused} reused" for node_type, (created, reused) in report.items())
+        om.MGlobal.displayInfo(f"Node cache: {saved} nodes saved ({details or 'no cached nodes'})")
+        return report
+
 def store_data():
     """
     Store the current data from the DataManager into a JSON file.
@@ -493,14 +563,48 @@ def local_space_parent(ctl, parents=[], default_weights=0.5, parent_suff = "_OFF
 
 def local_mmx(ctl, grp):
     name = ctl.replace("_CTL", "")
+    matrix = cmds.getAttr(f"{ctl}.worldMatrix[0]")
 
-    multmatrix = cmds.createNode("multMatrix", name=check_name(f"{name}", "Local_MMX"), ss=True)
-    cmds.connectAttr(f"{ctl}.worldMatrix[0]", f"{multmatrix}.matrixIn[0]", force=True)
-    cmds.connectAttr(f"{grp}.worldInverseMatrix[0]", f"{multmatrix}.matrixIn[1]", force=True)
-    cmds.setAttr(f"{multmatrix}.matrixIn[2]", cmds.getAttr(f"{ctl}.worldMatrix[0]"), type="matrix")
+    def create():
+        multmatrix = cmds.createNode("multMatrix", name=check_name(f"{name}", "Local_MMX"), ss=True)
+        cmds.connectAttr(f"{ctl}.worldMatrix[0]", f"{multmatrix}.matrixIn[0]", force=True)
+        cmds.connectAttr(f"{grp}.worldInverseMatrix[0]", f"{multmatrix}.matrixIn[1]", force=True)
+        cmds.setAttr(f"{multmatrix}.matrixIn[2]", matrix, type="matrix")
+        return multmatrix
+
+    # matrixIn[2] bakes the current control matrix, a call after the control moved needs its own node
+    multmatrix = NodeCache.get("multMatrix", (f"{ctl}.worldMatrix[0]", f"{grp}.worldInverseMatrix[0]"), create,
+                               settings={"offset": tuple(round(v, 6) for v in matrix)})
 
     return f"{multmatrix}.matrixSum"
 
+def pick_matrix(input_plug, name, use_translate=True, use_rotate=True, use_scale=True, use_shear=True):
+    """
+    Shared pickMatrix of input_plug with the given channels, created only once per build (see NodeCache).
+
+    Args:
+        input_plug (str): Matrix plug to pick from.
+        name (str): Name of the pickMatrix if it has to be created.
+        use_translate (bool): Keep the translation.
+        use_rotate (bool): Keep the rotation.
+        use_scale (bool): Keep the scale.
+        use_shear (bool): Keep the shear.
+
+    Returns:
+        str: outputMatrix plug of the pickMatrix.
+    """
+    settings = {"useTranslate": use_translate, "useRotate": use_rotate, "useScale": use_scale, "useShear": use_shear}
+
+    def create():
+        node = cmds.createNode("pickMatrix", n=name, ss=True)
+        cmds.connectAttr(input_plug, f"{node}.inputMatrix")
+        for attr, value in settings.items():
+            if not value:
+                cmds.setAttr(f"{node}.{attr}", False)
+        return node
+
+    return f"{NodeCache.get('pickMatrix', input_plug, create, settings)}.outputMatrix"
+
 def getClosestParamToWorldMatrixCurve(curve, pos, point=False, both=False):
     """
     Returns the closest parameter (u) on the curve to the given worldMatrix.
@@ -2,6 +2,7 @@ import maya.api.OpenMaya as om
 import maya.cmds as cmds
 import json
 import os
+import fnmatch
 
 from puiastreTools.utils import core
 from importlib import reload
@@ -869,6 +870,200 @@ def replace_shape_colored():
                     except:
                         pass # Fail silently if attributes are locked or unavailable
 
+def _match_patterns(names, patterns):
+    """
+    Resolve a dictionary keyed by controller name or glob pattern against a list of short names.
+    Exact names win over patterns, and later patterns win over earlier ones.
+
+    Args:
+        names (list): Short names of the controllers in the scene.
+        patterns (dict): Controller name or glob pattern -> value.
+
+    Returns:
+        dict: Short name -> value for every controller matched by the patterns.
+    """
+    resolved = {}
+    if not patterns:
+        return resolved
+
+    for pattern, value in patterns.items():
+        if pattern in names:
+            continue
+        for name in fnmatch.filter(names, pattern):
+            resolved[name] = value
+
+    for pattern, value in patterns.items():
+        if pattern in names:
+            resolved[pattern] = value
+
+    return resolved
+
+def replace_shapes_batch(mapping, library_path=None, colors=None, line_widths=None):
+    """
+    Replaces the shapes of many controllers at once from a curves library file.
+    All the shape swaps are applied through one MDagModifier and the curves, colors and line widths through one
+    MDGModifier, the whole replacement is undone if any of them fails. The controller transforms are kept (no
+    duplicate / reparent), so it can be run on an already built rig. The shapes keep their library names.
+
+    Args:
+        mapping (dict): Controller name or glob pattern -> library shape id (the controller name in the library, e.g. "L_hand_CTL").
+                        A None shape id keeps the current shapes and only applies colors and line widths.
+        library_path (str, optional): Curves library file. Defaults to the controllers data of the DataManager.
+        colors (dict, optional): Controller name or glob pattern -> override color index. Defaults to the library colors.
+        line_widths (dict, optional): Controller name or glob pattern -> line width. Defaults to the library line widths.
+
+    Returns:
+        list: The names of the controllers that were updated.
+    """
+
+    library_path = library_path or core.DataManager.get_ctls_data()
+    if not library_path or not os.path.exists(library_path):
+        om.MGlobal.displayError("Template file does not exist.")
+        return []
+
+    with open(library_path, "r") as f:
+        library_data = json.load(f)
+
+    library = {data["transform"]["name"]: data for data in library_data.values() if "transform" in data}
+
+    curve_shapes = cmds.ls(type="nurbsCurve", long=True, noIntermediate=True) or []
+    ctl_paths = {}
+    for path in set(cmds.listRelatives(curve_shapes, parent=True, fullPath=True) or []):
+        ctl_paths.setdefault(path.split("|")[-1], path)
+
+    names = list(ctl_paths)
+    shape_ids = _match_patterns(names, mapping)
+    color_values = _match_patterns(names, colors)
+    width_values = _match_patterns(names, line_widths)
+
+    targets = sorted(set(shape_ids) | set(color_values) | set(width_values))
+    if not targets:
+        om.MGlobal.displayWarning("No controllers matched the given mapping.")
+        return []
+
+    missing = sorted({shape_id for shape_id in shape_ids.values() if shape_id is not None and shape_id not in library})
+    if missing:
+        om.MGlobal.displayError(f"Shape ids not found in {library_path}: {missing}")
+        return []
+
+    form_flags = {
+        "open": om.MFnNurbsCurve.kOpen,
+        "closed": om.MFnNurbsCurve.kClosed,
+        "periodic": om.MFnNurbsCurve.kPeriodic
+    }
+
+    # Shapes are created (and the old ones deleted) by dag_modifier, their curves, colors and line widths are set by
+    # shape_modifier once they exist. A failure in the second step undoes the first one.
+    dag_modifier = om.MDagModifier()
+    shape_modifier = om.MDGModifier()
+    sel_list = om.MSelectionList()
+    shape_entries = []
+
+    for ctl in targets:
+        sel_list.clear()
+        sel_list.add(ctl_paths[ctl])
+        ctl_path = sel_list.getDagPath(0)
+        ctl_obj = ctl_path.node()
+
+        shape_id = shape_ids.get(ctl)
+        shape_data_list = library[shape_id]["shapes"] if shape_id else []
+
+        old_shapes = []
+        for i in range(ctl_path.childCount()):
+            child = ctl_path.child(i)
+            if child.hasFn(om.MFn.kNurbsCurve):
+                old_shapes.append(child)
+
+        if shape_id:
+            transform_info = library[shape_id]["transform"]
+            if transform_info.get("overrideEnabled"):
+                fn_ctl = om.MFnDependencyNode(ctl_obj)
+                dag_modifier.newPlugValueBool(fn_ctl.findPlug("overrideEnabled", False), True)
+                dag_modifier.newPlugValueInt(fn_ctl.findPlug("overrideColor", False), transform_info["overrideColor"])
+
+            for shape_obj in old_shapes:
+                dag_modifier.deleteNode(shape_obj)
+
+            for i, shape_data in enumerate(shape_data_list):
+                # Library shape name, on the target controller if the shape comes from another one
+                fallback_name = f"{shape_id}Shape" if i == 0 else f"{shape_id}Shape{i:02d}"
+                shape_name = shape_data.get("name", fallback_name).replace(shape_id, ctl, 1)
+
+                shape_obj = dag_modifier.createNode("nurbsCurve", ctl_obj)
+                dag_modifier.renameNode(shape_obj, shape_name)
+                shape_entries.append((ctl, shape_obj, shape_data))
+        else:
+            shape_entries.extend((ctl, shape_obj, {}) for shape_obj in old_shapes)
+
+    dag_modifier.doIt()
+
+    try:
+        for ctl, shape_obj, shape_data in shape_entries:
+            fn_dep = om.MFnDependencyNode(shape_obj)
+
+            curve_info = shape_data.get("curve")
+            if curve_info:
+                curve_data = om.MFnNurbsCurveData().create()
+                om.MFnNurbsCurve().create(
+                    om.MPointArray([om.MPoint(pt[0], pt[1], pt[2]) for pt in curve_info["cvs"]]),
+                    curve_info["knots"],
+                    curve_info["degree"],
+                    form_flags.get(curve_info["form"], om.MFnNurbsCurve.kOpen),
+                    False,
+                    True,
+                    curve_data
+                )
+                shape_modifier.newPlugValue(fn_dep.findPlug("cached", False), curve_data)
+
+            color = color_values.get(ctl, shape_data.get("overrideColor") if shape_data.get("overrideEnabled") else None)
+            if color is not None:
+                shape_modifier.newPlugValueBool(fn_dep.findPlug("overrideEnabled", False), True)
+                shape_modifier.newPlugValueInt(fn_dep.findPlug("overrideColor", False), int(color))
+
+            if shape_data.get("alwaysDrawOnTop", False):
+                shape_modifier.newPlugValueBool(fn_dep.findPlug("alwaysDrawOnTop", False), True)
+
+            line_width = width_values.get(ctl, shape_data.get("lineWidth"))
+            if line_width is not None and fn_dep.hasAttribute("lineWidth"):
+                shape_modifier.newPlugValueFloat(fn_dep.findPlug("lineWidth", False), float(line_width))
+
+        shape_modifier.doIt()
+    except Exception as e:
+        dag_modifier.undoIt()
+        om.MGlobal.displayError(f"Could not replace the controller shapes, nothing was changed: {e}")
+        return []
+
+    om.MGlobal.displayInfo(f"Replaced shapes on {len(targets)} controllers from {library_path}")
+
+    return targets
+
+def update_shapes_from_library(library_path=None):
+    """
+    Re-applies every controller shape of the curves library to the matching controllers in the scene.
+
+    Args:
+        library_path (str, optional): Curves library file. Defaults to the controllers data of the DataManager.
+
+    Returns:
+        list: The names of the controllers that were updated.
+    """
+
+    library_path = library_path or core.DataManager.get_ctls_data()
+    if not library_path or not os.path.exists(library_path):
+        om.MGlobal.displayError("Template file does not exist.")
+        return []
+
+    with open(library_path, "r") as f:
+        library_data = json.load(f)
+
+    mapping = {}
+    for data in library_data.values():
+        name = data.get("transform", {}).get("name")
+        if name and cmds.objExists(name):
+            mapping[name] = name
+
+    return replace_shapes_batch(mapping, library_path=library_path)
+
 
 # core.DataManager.set_guide_data("P:/VFX_Project_20/PUIASTRE_PRODUCTIONS/00_Pipeline/puiastre_tools/guides/AYCHEDRAL_009.guides")
 
@@ -1,11 +1,22 @@
+import functools
+import os
+import time
+
 import maya.cmds as cmds
 from maya.api import OpenMaya as om
+import numpy as np
 from puiastreTools.utils import core
 
 OPEN = 'open'
 PERIODIC = 'periodic'
 AXIS_VECTOR = {'x': (1, 0, 0), '-x': (-1, 0, 0), 'y': (0, 1, 0), '-y': (0, -1, 0), 'z': (0, 0, 1), '-z': (0, 0, -1)}
 KNOT_TO_FORM_INDEX = {OPEN: om.MFnNurbsCurve.kOpen, PERIODIC: om.MFnNurbsCurve.kPeriodic}
+ARC_LENGTH_SAMPLES = 1024
+NETWORK = 'network'
+NODE = 'node'
+RIBBON_NODE_TYPE = 'puiastreDeBoorRibbon'
+RIBBON_PLUGIN_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', '..', 'plug-ins', f'{RIBBON_NODE_TYPE}.py')
+AXIS_NAMES = ['x', '-x', 'y', '-y', 'z', '-z']
 
 def get_open_uniform_kv(n, d):
     """
@@ -101,6 +112,339 @@ def de_boor(n, d, t, kv, tol=0.000001):
 
     return weights[:n]
 
+@functools.lru_cache(maxsize=256)
+def _de_boor_basis(n, d, kv, params, tol):
+    t = np.asarray(params, dtype=np.float64)[:, None]
+    kv = np.asarray(kv, dtype=np.float64)
+
+    weights = ((kv[:n + d] <= t) & (t < kv[1:n + d + 1])).astype(np.float64)
+
+    for degree in range(1, d + 1):
+        width = n + d - degree
+        a_denom = kv[degree:degree + width] - kv[:width]
+        b_denom = kv[degree + 1:degree + 1 + width] - kv[1:width + 1]
+
+        a = np.divide((t - kv[:width]) * weights[:, :width], a_denom,
+                      out=np.zeros((len(params), width)), where=a_denom != 0)
+        b = np.divide((kv[degree + 1:degree + 1 + width] - t) * weights[:, 1:width + 1], b_denom,
+                      out=np.zeros((len(params), width)), where=b_denom != 0)
+
+        weights[:, :width] = a + b
+
+    basis = weights[:, :n]
+    basis[t[:, 0] + tol > 1] = np.eye(1, n, n - 1)
+
+    basis.flags.writeable = False
+    return basis
+
+
+def de_boor_basis(n, d, params, kv, tol=0.000001):
+    """
+    Vectorized de_boor: basis weights of every parameter in one call, as a (len(params), n) array.
+    Results are memoized by (n, d, knot vector, params, tol), so ribbons with the same layout (both sides, spine and
+    neck with the same joint count...) reuse them. The returned array is read only.
+
+    Attributes:
+        n (integer): number of control vertices
+        d (integer): degree of the resulting curve
+        params (list): parametric values along the curve
+        kv (list or tuple): knot vector
+
+    Returns:
+        np.ndarray: one row of basis weights per parameter
+    """
+    return _de_boor_basis(n, d, tuple(float(k) for k in kv), tuple(float(t) for t in params), tol)
+
+
+def compare_basis_with_scalar(n=6, d=3, num_params=101, kv_type=OPEN):
+    """
+    Check de_boor_basis against the scalar de_boor over a range of parameters.
+
+    Returns:
+        float: Biggest absolute difference between both implementations.
+    """
+    kv, cvs = knot_vector(kv_type, list(range(n)), d)
+    params = [i / (num_params - 1) for i in range(num_params)]
+    scalar = np.array([de_boor(len(cvs), d, t, kv) for t in params])
+    return float(np.abs(de_boor_basis(len(cvs), d, params, kv) - scalar).max())
+
+
+def prune_basis(basis, threshold):
+    """
+    Drop the basis weights below threshold and renormalize every row to 1. The biggest weight of a row is always kept.
+
+    Attributes:
+        basis (np.ndarray): (joints, cvs) basis weights, see de_boor_basis
+        threshold (float): minimum weight kept
+
+    Returns:
+        np.ndarray: pruned basis weights
+    """
+    basis = np.asarray(basis, dtype=np.float64)
+    keep = (basis >= threshold) | (basis == basis.max(axis=1, keepdims=True))
+    pruned = np.where(keep, basis, 0.0)
+    return pruned / pruned.sum(axis=1, keepdims=True)
+
+
+def periodic_params(params, kv, d):
+    """
+    Map parameters in [0, 1] to one period of a periodic knot vector, starting half a span after its first knot.
+
+    Attributes:
+        params (list or np.ndarray): parametric values between 0 and 1
+        kv (list): periodic knot vector
+        d (int): degree of the curve
+
+    Returns:
+        list or np.ndarray: parametric values between kv[d + 1] * (d + 1) / 2 and 1 - kv[d + 1] * (d - 1) / 2, the
+                            period of the normalized knot vector that de_boor and de_boor_basis evaluate
+    """
+    start = kv[d + 1] * (d * 0.5 + 0.5)
+    end = 1 - kv[d + 1] * (d * 0.5 - 0.5)
+    if isinstance(params, np.ndarray):
+        return start * (1 - params) + params * end
+    return [start * (1 - t) + t * end for t in params]
+
+
+def arc_length_params(points, d, kv_type=OPEN, num_params=5, samples=ARC_LENGTH_SAMPLES):
+    """
+    Parameters at equally spaced lengths along the B-spline of the given control points, without a Maya curve.
+    The curve is sampled with de_boor_basis, the chord lengths are accumulated into a lookup table and the sample
+    lengths are inverted by linear interpolation. Several ribbons with the same layout are resolved in one call by
+    passing a (ribbons, cvs, 3) array, the basis matrix being shared (and cached) between them.
+
+    Attributes:
+        points (list or np.ndarray): (cvs, 3) control point positions, or (ribbons, cvs, 3)
+        d (int): degree of the curve
+        kv_type (str): OPEN or PERIODIC
+        num_params (int): number of parameters, the first and last ones at both ends of the curve
+        samples (int): number of segments of the lookup table
+
+    Returns:
+        np.ndarray: (num_params,) parameters between 0 and 1, or (ribbons, num_params), for open and periodic
+                    curves alike. Like the uniform ones, periodic parameters still have to go through periodic_params,
+                    de_boor_ribbon does it.
+    """
+    points = np.asarray(points, dtype=np.float64)
+    batch = points.reshape(-1, points.shape[-2], 3)
+
+    kv, indices = knot_vector(kv_type, list(range(batch.shape[1])), d)
+    lut_params = np.linspace(0.0, 1.0, samples + 1)
+    curve_params = periodic_params(lut_params, kv, d) if kv_type == PERIODIC else lut_params
+    basis = de_boor_basis(len(indices), d, curve_params, kv)
+
+    curve_points = np.einsum("sc,rcx->rsx", basis, batch[:, indices])
+    lengths = np.concatenate([np.zeros((len(batch), 1)), np.cumsum(np.linalg.norm(np.diff(curve_points, axis=1), axis=2), axis=1)], axis=1)
+
+    targets = np.linspace(0.0, 1.0, num_params)
+    params = np.empty((len(batch), num_params))
+    for i, ribbon_lengths in enumerate(lengths):
+        if ribbon_lengths[-1] > 0:
+            params[i] = np.interp(targets * ribbon_lengths[-1], ribbon_lengths, lut_params)
+        else:
+            params[i] = targets
+
+    return params.reshape(points.shape[:-2] + (num_params,))
+
+
+def ribbon_matrices(control_matrices, params, d, kv_type=OPEN, aim_axis='x', up_axis='y', tangent_offset=0.001,
+                    use_scale=True, negate_secondary=False, align=False, tol=0.000001):
+    """
+    Joint matrices of a ribbon in one go, following the wtAddMatrix / aimMatrix network of de_boor_ribbon (full
+    position, tangent and up setup): positions from the weighted control translations, aimed to the next joint (the
+    last one away from the previous), the secondary axis aimed at (or aligned with) the weighted control matrices and
+    the weighted control scale on top. The aimMatrix axis conventions are kept: the first joint aims its +X, the
+    secondary axis is +Y (the negated up_axis with negate_secondary) and up_axis only picks the up target offset.
+
+    Attributes:
+        control_matrices (np.ndarray): (cvs, 4, 4) world matrices of the controls
+        params (list): parametric values of the joints, in the knot vector domain
+        d (int): degree of the curve
+        kv_type (str): OPEN or PERIODIC
+        aim_axis (str): joint axis aimed along the ribbon
+        up_axis (str): axis of the up target offset (and the negated secondary axis with negate_secondary)
+        tangent_offset (float): parameter offset past which the aim axis is negated, tangent sample of a single joint
+        use_scale (bool): multiply the weighted control scale
+        negate_secondary (bool): use the negated up_axis as secondary axis and target vector
+        align (bool): align the up axis with the weighted control matrices instead of aiming at their up target
+
+    Returns:
+        np.ndarray: (joints, 4, 4) world matrices
+    """
+    matrices = np.asarray(control_matrices, dtype=np.float64).reshape(-1, 4, 4)
+    num_cvs = len(matrices)
+    kv, indices = knot_vector(kv_type, list(range(num_cvs)), d)
+
+    # Wrapped periodic cvs are consolidated back to their control
+    to_controls = np.zeros((len(indices), num_cvs))
+    to_controls[np.arange(len(indices)), indices] = 1.0
+    weights = de_boor_basis(len(indices), d, params, kv, tol=tol) @ to_controls
+
+    positions = weights @ matrices[:, 3, :3]
+    num_joints = len(positions)
+
+    # Primary axis as set on the aimMatrix nodes: the first joint keeps the default +X, the others use aim_axis
+    # (negated past the end of the curve) and the last one aims -aim_axis at the previous joint
+    aim_vector = np.array(AXIS_VECTOR[aim_axis], dtype=np.float64)
+    primaries = np.tile(aim_vector, (num_joints, 1))
+    primaries[np.asarray(params, dtype=np.float64) + tangent_offset > 1] *= -1
+    primaries[0] = (1.0, 0.0, 0.0)
+    if num_joints > 1:
+        directions = np.concatenate([np.diff(positions, axis=0), positions[-2:-1] - positions[-1:]])
+        primaries[-1] = -aim_vector
+    else:
+        # The network has no primary target for a single joint, use the curve tangent
+        tangent_params = [t + tangent_offset if t + tangent_offset <= 1 else t - tangent_offset for t in params]
+        tangent_positions = de_boor_basis(len(indices), d, tangent_params, kv, tol=tol) @ to_controls @ matrices[:, 3, :3]
+        directions = (tangent_positions - positions) * np.where(np.asarray(params) + tangent_offset <= 1, 1.0, -1.0)[:, None]
+
+    # secondaryInputAxis / secondaryTargetVector keep the aimMatrix default +Y unless negated
+    up_vector = np.array(AXIS_VECTOR[up_axis], dtype=np.float64)
+    secondary = -up_vector if negate_secondary else np.array((0.0, 1.0, 0.0))
+
+    up_matrices = np.einsum('jc,cab->jab', weights, matrices)
+    if align:
+        ups = np.einsum('b,jba->ja', secondary, up_matrices[:, :3, :3])
+    else:
+        up_offset = np.abs(up_vector) * 10.0
+        ups = np.einsum('b,jba->ja', up_offset, up_matrices[:, :3, :3]) + up_matrices[:, 3, :3] - positions
+
+    # Orthonormal frames, then the rotation taking the local (primary, secondary) axes of every joint to them
+    aims = directions / np.maximum(np.linalg.norm(directions, axis=1, keepdims=True), 1e-12)
+    ups = ups - np.einsum('ja,ja->j', ups, aims)[:, None] * aims
+    ups /= np.maximum(np.linalg.norm(ups, axis=1, keepdims=True), 1e-12)
+    world = np.stack([aims, ups, np.cross(aims, ups)], axis=1)
+
+    local_secondary = secondary - (primaries @ secondary)[:, None] * primaries
+    local_secondary /= np.maximum(np.linalg.norm(local_secondary, axis=1, keepdims=True), 1e-12)
+    local = np.stack([primaries, local_secondary, np.cross(primaries, local_secondary)], axis=1)
+    rotations = np.einsum('jba,jbc->jac', local, world)
+
+    if use_scale:
+        scales = weights @ np.linalg.norm(matrices[:, :3, :3], axis=2)
+        rotations = rotations * scales[:, :, None]
+
+    result = np.zeros((len(positions), 4, 4))
+    result[:, :3, :3] = rotations
+    result[:, 3, :3] = positions
+    result[:, 3, 3] = 1.0
+    return result
+
+
+def load_ribbon_plugin():
+    """
+    Load the puiastreDeBoorRibbon plugin if needed.
+
+    Returns:
+        bool: True if the node type is available.
+    """
+    if cmds.pluginInfo(RIBBON_NODE_TYPE, query=True, loaded=True):
+        return True
+    try:
+        cmds.loadPlugin(os.path.normpath(RIBBON_PLUGIN_PATH), quiet=True)
+    except RuntimeError as e:
+        om.MGlobal.displayError(f"Could not load the {RIBBON_NODE_TYPE} plugin: {e}")
+        return False
+    return True
+
+
+def create_ribbon_node(ctls, params, d, kv_type=OPEN, name='ribbon', parent=None, aim_axis='x', up_axis='y',
+                       tangent_offset=0.001, use_scale=True, negate_secondary=False, align=False):
+    """
+    Create a puiastreDeBoorRibbon node driven by the control matrix plugs and one joint per parameter.
+
+    Attributes:
+        ctls (list): control matrix plugs
+        params (list): parametric values of the joints, in the knot vector domain
+        d (int): degree of the curve
+        kv_type (str): OPEN or PERIODIC
+        name (str): name prefix
+        parent (str): parent of the joints
+        (see ribbon_matrices for the other attributes)
+
+    Returns:
+        list: created joints
+    """
+    if not load_ribbon_plugin():
+        return []
+
+    ribbon = cmds.createNode(RIBBON_NODE_TYPE, n=f'{name}_DBR', ss=True)
+    for i, ctl in enumerate(ctls):
+        cmds.connectAttr(ctl, f'{ribbon}.controlMatrix[{i}]')
+    for i, param in enumerate(params):
+        cmds.setAttr(f'{ribbon}.parameter[{i}]', param)
+
+    cmds.setAttr(f'{ribbon}.degree', d)
+    cmds.setAttr(f'{ribbon}.knotType', 1 if kv_type == PERIODIC else 0)
+    cmds.setAttr(f'{ribbon}.aimAxis', AXIS_NAMES.index(aim_axis))
+    cmds.setAttr(f'{ribbon}.upAxis', AXIS_NAMES.index(up_axis))
+    cmds.setAttr(f'{ribbon}.tangentOffset', tangent_offset)
+    cmds.setAttr(f'{ribbon}.useScale', use_scale)
+    cmds.setAttr(f'{ribbon}.negateSecondary', negate_secondary)
+    cmds.setAttr(f'{ribbon}.align', align)
+
+    jnts = []
+    for i in range(len(params)):
+        jnt = cmds.createNode('joint', n=f'{name}0{i}_JNT', ss=True, parent=parent)
+        cmds.setAttr(f'{jnt}.jo', 0, 0, 0)
+        cmds.xform(jnt, m=om.MMatrix.kIdentity)
+        cmds.connectAttr(f'{ribbon}.outputMatrix[{i}]', f'{jnt}.offsetParentMatrix')
+        jnts.append(jnt)
+
+    return jnts
+
+
+def benchmark_ribbon_modes(cvs, num_joints=20, evaluations=200, **kwargs):
+    """
+    Build the same ribbon as a node network and as a puiastreDeBoorRibbon node, then compare their node count, the
+    time to re-evaluate every joint after moving the first control and the joint world matrices of both modes (at rest
+    and with the first control moved). Both ribbons are deleted afterwards.
+
+    Attributes:
+        cvs (list): control transforms
+        num_joints (int): number of joints
+        evaluations (int): number of control moves timed
+        kwargs: other de_boor_ribbon arguments
+
+    Returns:
+        dict: mode -> {"nodes", "seconds"}, and "max_difference": biggest absolute difference between the joint
+              world matrices of both modes
+    """
+    results = {}
+    world_matrices = {}
+    start_value = cmds.getAttr(f'{cvs[0]}.translateY')
+
+    for mode in NETWORK, NODE:
+        core.NodeCache.clear()
+        before = set(cmds.ls())
+        jnts = de_boor_ribbon(cvs, num_joints=num_joints, name=f'benchmark{mode.capitalize()}', mode=mode, **kwargs)
+        created = [node for node in cmds.ls() if node not in before]
+
+        poses = []
+        for offset in 0.0, 1.0:
+            cmds.setAttr(f'{cvs[0]}.translateY', start_value + offset)
+            poses.append([cmds.getAttr(f'{jnt}.worldMatrix[0]') for jnt in jnts])
+        world_matrices[mode] = np.array(poses)
+
+        start = time.perf_counter()
+        for i in range(evaluations):
+            cmds.setAttr(f'{cvs[0]}.translateY', start_value + (i % 10) * 0.01)
+            for jnt in jnts:
+                cmds.getAttr(f'{jnt}.worldMatrix[0]')
+        results[mode] = {"nodes": len(created) - len(jnts), "seconds": time.perf_counter() - start}
+
+        cmds.setAttr(f'{cvs[0]}.translateY', start_value)
+        cmds.delete([node for node in created if cmds.objExists(node)])
+
+    core.NodeCache.clear()
+    results["max_difference"] = float(np.abs(world_matrices[NETWORK] - world_matrices[NODE]).max())
+    om.MGlobal.displayInfo(f"Ribbon benchmark ({num_joints} joints): network {results[NETWORK]['nodes']} nodes "
+                           f"{results[NETWORK]['seconds']:.3f}s | node {results[NODE]['nodes']} nodes {results[NODE]['seconds']:.3f}s | "
+                           f"max matrix difference {results['max_difference']:.6f}")
+
+    return results
+
+
 def get_offset_matrix(child, parent):
     """
     Calculate the offset matrix between a child and parent transform in Maya.
@@ -122,7 +466,8 @@ def get_offset_matrix(child, parent):
 
 def de_boor_ribbon(cvs, aim_axis='x', up_axis='y', num_joints=5, tangent_offset=0.001, d=None, kv_type=OPEN,
                    param_from_length=True, tol=0.000001, name='ribbon', use_position=True, use_tangent=True,
-                   use_up=True, use_scale=True, custom_parm = [], parent=None, axis_change=False, negate_secundary=False, align=False):
+                   use_up=True, use_scale=True, custom_parm = [], parent=None, axis_change=False, negate_secundary=False, align=False,
+                   prune_threshold=None, mode=NETWORK):
     """
     Use controls and de_boor function to get position, tangent and up values for joints.  The param_from_length can
     be used to get the parameter values using a fraction of the curve length, otherwise the parameter values will be
@@ -161,6 +506,13 @@ def de_boor_ribbon(cvs, aim_axis='x', up_axis='y', num_joints=5, tangent_offset=
 
         aimMatrix not created when use_tangent=False and use_up=False, otherwise it is
 
+    prune_threshold drops the basis weights below it and renormalizes the rest (see prune_basis), so every
+    wtAddMatrix gets less inputs, and a wtAddMatrix left with a single input is replaced by a direct connection.
+    The removed connections / nodes and the maximum joint position deviation at the current pose are reported.
+
+    mode=NODE replaces the whole network by a single puiastreDeBoorRibbon node (see ribbon_matrices), the use_position,
+    use_tangent, use_up, axis_change and prune_threshold options only apply to the NETWORK mode.
+
     """
 
     if not parent:
@@ -190,7 +542,6 @@ def de_boor_ribbon(cvs, aim_axis='x', up_axis='y', num_joints=5, tangent_offset=
 
         kv, _ = knot_vector(OPEN, cvs, d)
 
-        m_kv = kv[1:-1]
         # m_cvs = cvs[:]
         m_cvs = []
 
@@ -209,73 +560,70 @@ def de_boor_ribbon(cvs, aim_axis='x', up_axis='y', num_joints=5, tangent_offset=
         for i in range(d):
             m_cvs.append(m_cvs[i])
 
-        m_kv_len = len(m_cvs) + d - 1
-        m_kv_interval = 1 / (m_kv_len - 2 * (d - 1) - 1)
-        m_kv = [-m_kv_interval * (d - 1) * (1 - t / (m_kv_len - 1)) +
-                (1 + m_kv_interval * (d - 1)) * t / (m_kv_len - 1) for t in range(m_kv_len)]
-
         kv, cvs = knot_vector(PERIODIC, cvs, d)
 
-    m_cv_poss = om.MPointArray([cmds.xform(obj, q=True, ws=True, t=True) for obj in m_cvs])
-    form = KNOT_TO_FORM_INDEX[kv_type]
-    is_2d = False
-    rational = True
-    data_creator = om.MFnNurbsCurveData()
-    parent = data_creator.create()
-
-    crv_fn = om.MFnNurbsCurve()
-    crv_fn.create(m_cv_poss, m_kv, d, form, is_2d, rational, parent)
-
-    if param_from_length:
-
-        crv_len = crv_fn.length()
-        params = []
-
-        for i in range(num_joints):
-
-            sample_len = crv_len * i / (num_joints - 1)
-
-            if kv_type == PERIODIC:
-                t = crv_fn.findParamFromLength((sample_len + crv_len * m_kv[2] * 0.5) % crv_len)
-                params.append(t - m_kv[2] * 0.5)
-            else:
-                t = crv_fn.findParamFromLength(sample_len)
-                params.append(t)
-
+    if custom_parm:
+        params = custom_parm
+    elif param_from_length:
+        points = [cmds.getAttr(ctl)[12:15] for ctl in ctls]
+        params = arc_length_params(points, d, kv_type, num_joints).tolist()
     else:
         params = [i / (num_joints - 1) for i in range(num_joints)]
 
-    params = custom_parm if custom_parm else params
-
-
     if kv_type == PERIODIC:
 
-        params = [(kv[d + 1] * (d * 0.5 + 0.5)) * (1 - t) + t * (1 - kv[d + 1] * (d * 0.5 - 0.5))
-                  for i, t in enumerate(params)]
+        params = periodic_params(params, kv, d)
+
+    if mode == NODE:
+        jnts = create_ribbon_node(ctls, params, d, kv_type, name=name, parent=jnts_grp, aim_axis=aim_axis, up_axis=up_axis,
+                                  tangent_offset=tangent_offset, use_scale=use_scale, negate_secondary=negate_secundary,
+                                  align=align)
+        temps = [cv for cv in m_cvs if cv not in original_cvs]
+        if temps:
+            cmds.delete(temps)
+        return jnts
 
     par_off_plugs = []
     trans_off_plugs = []
     sca_off_plugs = []
 
+    # Without aimMatrix the position wtAddMatrix drives the joints directly, so it also carries the scale
+    translation_scale = use_position and use_scale and not use_tangent and not use_up
+
+    # pickMatrix nodes are shared with the other ribbons driven by the same controls (core.NodeCache)
     for i, ctl in enumerate(ctls):
 
         par_off_plugs.append(ctl)
 
-        trans_off = cmds.createNode('pickMatrix', n=f'{name}Translation0{i}_PM', ss=True)
-        cmds.connectAttr(ctl, f'{trans_off}.inputMatrix')
-        for attr in 'useRotate', 'useScale', 'useShear':
-            cmds.setAttr(f'{trans_off}.{attr}', False)
-
-        trans_off_plugs.append(f'{trans_off}.outputMatrix')
+        trans_off_plugs.append(core.pick_matrix(ctl, f'{name}Translation0{i}_PM', use_rotate=False, use_scale=translation_scale,
+                                                use_shear=False))
 
         if use_scale and use_tangent or use_up:
 
-            sca_off = cmds.createNode('pickMatrix', n=f'{name}ScaleOffset0{i}_PM', ss=True)
-            cmds.connectAttr(ctl, f'{sca_off}.inputMatrix')
-            for attr in 'useRotate', 'useShear', 'useTranslate':
-                cmds.setAttr(f'{sca_off}.{attr}', False)
+            sca_off_plugs.append(core.pick_matrix(ctl, f'{name}ScaleOffset0{i}_PM', use_translate=False, use_rotate=False,
+                                                  use_shear=False))
 
-            sca_off_plugs.append(f'{sca_off}.outputMatrix')
+    # Basis weights of every joint and of its tangent sample, evaluated at once
+    tangent_params = [param + tangent_offset if param + tangent_offset <= 1 else param - 2 * tangent_offset for param in params]
+    basis = de_boor_basis(len(cvs), d, params, kv, tol=tol)
+    tangent_basis = de_boor_basis(len(cvs), d, tangent_params, kv, tol=tol)
+
+    if kv_type == PERIODIC:
+        basis = np.array([get_consolidated_wts(row, original_cvs, cvs) for row in basis.tolist()])
+        tangent_basis = np.array([get_consolidated_wts(row, original_cvs, cvs) for row in tangent_basis.tolist()])
+
+    prune_stats = {"connections": 0, "nodes": 0}
+    if prune_threshold is not None:
+        full_basis, full_tangent_basis = basis, tangent_basis
+        basis = prune_basis(full_basis, prune_threshold)
+        tangent_basis = prune_basis(full_tangent_basis, prune_threshold)
+
+    def weighted_plug(matrix_plugs, weights, full_weights, wam_name):
+        plug = create_weighted_matrix(matrix_plugs, weights, wam_name, tol=tol, bypass=prune_threshold is not None)
+        if prune_threshold is not None:
+            prune_stats["connections"] += sum(wt >= tol for wt in full_weights) - sum(wt >= tol for wt in weights)
+            prune_stats["nodes"] += plug in matrix_plugs
+        return plug
 
     jnts = []
     up_offsets =[]
@@ -289,19 +637,15 @@ def de_boor_ribbon(cvs, aim_axis='x', up_axis='y', num_joints=5, tangent_offset=
 
         jnts.append(jnt)
 
-        wts = de_boor(len(cvs), d, param, kv, tol=tol)
-        if kv_type == PERIODIC:
-            wts = get_consolidated_wts(wts, original_cvs, cvs)
+        wts = basis[i].tolist()
+        full_wts = full_basis[i].tolist() if prune_threshold is not None else wts
 
-        tangent_param = param + tangent_offset
         aim_vector = om.MVector(AXIS_VECTOR[aim_axis])
-        if tangent_param > 1:
-            tangent_param = param - 2 * tangent_offset
+        if param + tangent_offset > 1:
             aim_vector *= -1
 
-        tangent_wts = de_boor(len(cvs), d, tangent_param, kv, tol=tol)
-        if kv_type == PERIODIC:
-            tangent_wts = get_consolidated_wts(tangent_wts, original_cvs, cvs)
+        tangent_wts = tangent_basis[i].tolist()
+        full_tangent_wts = full_tangent_basis[i].tolist() if prune_threshold is not None else tangent_wts
 
         position_plug = None
         tangent_plug = None
@@ -309,28 +653,19 @@ def de_boor_ribbon(cvs, aim_axis='x', up_axis='y', num_joints=5, tangent_offset=
         # ----- position setup
         if use_position:
 
-            position = create_wt_add_matrix(trans_off_plugs, wts, f'{name}Position0{i}_WAM', tol=tol)
-            position_plug = f'{position}.matrixSum'
+            position_plug = weighted_plug(trans_off_plugs, wts, full_wts, f'{name}Position0{i}_WAM')
         
 
             if not use_tangent and not use_up:  # no aimMatrix necessary, connect wtAddMatrix to joint
 
                 cmds.connectAttr(position_plug, f'{jnt}.offsetParentMatrix')
 
-                if use_scale:
-
-                    for trans_off_plug in trans_off_plugs:
-
-                        trans_off = trans_off_plug.split('.')[0]
-                        cmds.setAttr(f'{trans_off}.useScale', True)
-
                 continue
 
             # ----- tangent setup
             if use_tangent:
 
-                tangent = create_wt_add_matrix(trans_off_plugs, tangent_wts, f'{name}Tangent0{i}_WAM', tol=tol)
-                tangent_plug = f'{tangent}.matrixSum'
+                tangent_plug = weighted_plug(trans_off_plugs, tangent_wts, full_tangent_wts, f'{name}Tangent0{i}_WAM')
 
         # ----- up setup
         if use_up:
@@ -341,25 +676,25 @@ def de_boor_ribbon(cvs, aim_axis='x', up_axis='y', num_joints=5, tangent_offset=
             for j, wt in enumerate(wts):
                 cmds.setAttr(f'{ori_con}.{m_cvs[j]}W{j}', wt)
 
-            up = create_wt_add_matrix(par_off_plugs, wts, f'{name}Up0{i}_WAM', tol=tol)
+            up_sum = weighted_plug(par_off_plugs, wts, full_wts, f'{name}Up0{i}_WAM')
 
             up_off = cmds.createNode('multMatrix', n=f'{name}UpOffset0{i}_MM', ss=True)
 
 
             if axis_change:
                 blend_up = cmds.createNode('blendMatrix', n=f'{name}UpAxisChange0{i}_BM', ss=True)
-                cmds.connectAttr(f'{up}.matrixSum', f'{blend_up}.inputMatrix')
+                cmds.connectAttr(up_sum, f'{blend_up}.inputMatrix')
                 cmds.connectAttr(f'{cvs[0]}.outputMatrix', f'{blend_up}.target[0].targetMatrix')
                 cmds.setAttr(f'{blend_up}.target[0].translateWeight', 0)
 
                 parent_matrix = cmds.createNode("parentMatrix", n=f"{name}ParentMatrix0{i}_PM", ss=True)
                 cmds.connectAttr(f'{blend_up}.outputMatrix', f'{parent_matrix}.inputMatrix')
-                cmds.connectAttr(f'{up}.matrixSum', f'{parent_matrix}.target[0].targetMatrix')
+                cmds.connectAttr(up_sum, f'{parent_matrix}.target[0].targetMatrix')
 
                 parent_matrix_offset_axis = parent_matrix
-                up_offset_axis = up
+                up_sum_axis = up_sum
                 blend_up_axis = blend_up
-                cmds.setAttr(f"{parent_matrix_offset_axis}.target[0].offsetMatrix", core.get_offset_matrix(f'{up_offset_axis}.matrixSum', f'{blend_up_axis}.outputMatrix'), type='matrix')
+                cmds.setAttr(f"{parent_matrix_offset_axis}.target[0].offsetMatrix", core.get_offset_matrix(up_sum_axis, f'{blend_up_axis}.outputMatrix'), type='matrix')
             
                 # inverse_parent = cmds.createNode("inverseMatrix", n=f"{name}InverseParent0{i}_IM", ss=True)
                 # mult_offset = cmds.createNode('multMatrix', n=f'{name}UpOffset0{i}_MM', ss=True)
@@ -373,7 +708,7 @@ def de_boor_ribbon(cvs, aim_axis='x', up_axis='y', num_joints=5, tangent_offset=
                 cmds.connectAttr(f'{parent_matrix}.outputMatrix', f'{up_off}.matrixIn[1]')
 
             else:
-                cmds.connectAttr(f'{up}.matrixSum', f'{up_off}.matrixIn[1]')
+                cmds.connectAttr(up_sum, f'{up_off}.matrixIn[1]')
 
             fourbyfour = cmds.createNode('fourByFourMatrix', n=f'{name}UpFourByFour0{i}_FBF', ss=True)
 
@@ -467,10 +802,10 @@ def de_boor_ribbon(cvs, aim_axis='x', up_axis='y', num_joints=5, tangent_offset=
             cmds.setAttr(f'{aim}.secondaryMode', 2)
 
         if use_scale:
-            scale_wam = create_wt_add_matrix(sca_off_plugs, wts, f'{name}Scale0{i}_WAM', tol=tol)
+            scale_plug = weighted_plug(sca_off_plugs, wts, full_wts, f'{name}Scale0{i}_WAM')
 
             scale_mm = cmds.createNode('multMatrix', n=f'{name}Scale0{i}_MM', ss=True)
-            cmds.connectAttr(f'{scale_wam}.matrixSum', f'{scale_mm}.matrixIn[0]')
+            cmds.connectAttr(scale_plug, f'{scale_mm}.matrixIn[0]')
             cmds.connectAttr(output_plug, f'{scale_mm}.matrixIn[1]')
 
             output_plug = f'{scale_mm}.matrixSum'
@@ -479,13 +814,19 @@ def de_boor_ribbon(cvs, aim_axis='x', up_axis='y', num_joints=5, tangent_offset=
 
         if axis_change:
 
-            cmds.setAttr(f"{parent_matrix_offset_axis}.target[0].offsetMatrix", core.get_offset_matrix(f'{blend_up_axis}.outputMatrix', f'{up_offset_axis}.matrixSum'), type='matrix')
+            cmds.setAttr(f"{parent_matrix_offset_axis}.target[0].offsetMatrix", core.get_offset_matrix(f'{blend_up_axis}.outputMatrix', up_sum_axis), type='matrix')
 
 
     for i, cv_temp in enumerate(m_cvs):
         if cv_temp != original_cvs[i]:
             cmds.delete(cv_temp)
 
+    if prune_threshold is not None:
+        points = np.array([cmds.getAttr(ctl)[12:15] for ctl in ctls])
+        deviation = float(np.linalg.norm((full_basis - basis) @ points, axis=1).max())
+        om.MGlobal.displayInfo(f"{name}: pruned basis weights below {prune_threshold}, removed {prune_stats['connections']} "
+                               f"connections and {prune_stats['nodes']} wtAddMatrix nodes, max position deviation {deviation:.6f}")
+
     return jnts
 
 
@@ -511,6 +852,18 @@ def create_wt_add_matrix(matrix_attrs, wts, name, tol=0.000001):
 
     return wam
 
+def create_weighted_matrix(matrix_attrs, wts, name, tol=0.000001, bypass=False):
+    """
+    Plug of the weighted sum of matrix_attrs, a wtAddMatrix matrixSum. With bypass, a single input of weight 1 is
+    returned as is instead of creating the wtAddMatrix.
+    """
+    if bypass:
+        used = [j for j, wt in enumerate(wts) if wt >= tol]
+        if len(used) == 1 and abs(wts[used[0]] - 1.0) < tol:
+            return matrix_attrs[used[0]]
+
+    return f'{create_wt_add_matrix(matrix_attrs, wts, name, tol=tol)}.matrixSum'
+
 def get_weighted_translation_matrix(matrices, wts):
 
     translation_m = om.MMatrix(((1, 0, 0, 0), (0, 1, 0, 0), (0, 0, 1, 0), (0, 0, 0, 1)))
@@ -0,0 +1,358 @@
+"""
+Post-build DG optimization: removes the evaluation work the modules leave in the graph.
+
+Passes:
+    - multMatrix: constant inputs folded together, identity inputs dropped, single-input nodes bypassed and fully
+      constant nodes baked into their destinations.
+    - pickMatrix with every channel on and blendMatrix without targets (or with a zero envelope) are bypassed.
+    - decomposeMatrix / pickMatrix / inverseMatrix nodes with the same inputs and settings are merged.
+
+The world matrices of the joints and controls are sampled on a set of poses before and after, and the whole
+optimization is undone if any of them moved.
+"""
+
+import random
+
+import maya.cmds as cmds
+import maya.api.OpenMaya as om
+
+PICK_FLAGS = ("useTranslate", "useRotate", "useScale", "useShear")
+MERGE_SETTINGS = {
+    "decomposeMatrix": ("inputRotateOrder",),
+    "pickMatrix": PICK_FLAGS,
+    "inverseMatrix": (),
+}
+TR_CHANNELS = ("translateX", "translateY", "translateZ", "rotateX", "rotateY", "rotateZ")
+TOLERANCE = 1e-5
+POSE_COUNT = 4
+
+
+def _source(plug):
+    sources = cmds.listConnections(plug, source=True, destination=False, plugs=True) or []
+    return sources[0] if sources else None
+
+
+def _destinations(plug):
+    return cmds.listConnections(plug, source=False, destination=True, plugs=True) or []
+
+
+def _is_identity(matrix):
+    return om.MMatrix(matrix).isEquivalent(om.MMatrix.kIdentity, 1e-9)
+
+
+def _editable(node):
+    return not cmds.lockNode(node, query=True, lock=True)[0] and not cmds.referenceQuery(node, isNodeReferenced=True)
+
+
+def _redirect(old_plug, new_plug):
+    """
+    Connect new_plug to every destination of old_plug.
+    """
+    for destination in _destinations(old_plug):
+        cmds.connectAttr(new_plug, destination, force=True)
+
+
+def _is_matrix_attribute(plug):
+    """
+    True if the attribute of plug is declared as a matrix (matrix or typed matrix attribute). Generic attributes such as
+    choice.input also report "matrix" with getAttr(type=True) while a matrix is connected, but cannot hold one set.
+    """
+    sel = om.MSelectionList()
+    sel.add(plug)
+    attribute = sel.getPlug(0).attribute()
+    if attribute.hasFn(om.MFn.kMatrixAttribute):
+        return True
+    return attribute.hasFn(om.MFn.kTypedAttribute) and om.MFnTypedAttribute(attribute).attrType() == om.MFnData.kMatrix
+
+
+def _bake(old_plug, matrix):
+    """
+    Set a constant matrix on every destination of old_plug. False (nothing changed) if one of them is not a matrix
+    attribute.
+    """
+    destinations = _destinations(old_plug)
+    if not all(_is_matrix_attribute(destination) for destination in destinations):
+        return False
+    for destination in destinations:
+        cmds.disconnectAttr(old_plug, destination)
+        cmds.setAttr(destination, list(matrix), type="matrix")
+    return True
+
+
+def _replace(node, output_attr, plug=None, matrix=None):
+    """
+    Feed the destinations of node.output_attr from plug (or the constant matrix) and delete the node.
+    """
+    output = f"{node}.{output_attr}"
+    if plug is not None:
+        _redirect(output, plug)
+    elif not _bake(output, matrix):
+        return False
+    cmds.delete(node)
+    return True
+
+
+def fold_mult_matrices():
+    """
+    Simplify the multMatrix nodes, see the module docstring.
+
+    Returns:
+        int: Number of nodes changed or removed.
+    """
+    changed = 0
+    for node in cmds.ls(type="multMatrix") or []:
+        if not _editable(node):
+            continue
+
+        indices = cmds.getAttr(f"{node}.matrixIn", multiIndices=True) or []
+        entries = []
+        for i in indices:
+            plug = f"{node}.matrixIn[{i}]"
+            source = _source(plug)
+            if source:
+                entries.append(source)
+                continue
+            matrix = om.MMatrix(cmds.getAttr(plug))
+            if _is_identity(matrix):
+                continue
+            if entries and isinstance(entries[-1], om.MMatrix):
+                entries[-1] = entries[-1] * matrix
+            else:
+                entries.append(matrix)
+
+        if not entries:
+            changed += _replace(node, "matrixSum", matrix=om.MMatrix.kIdentity)
+        elif len(entries) == 1:
+            if isinstance(entries[0], om.MMatrix):
+                changed += _replace(node, "matrixSum", matrix=entries[0])
+            else:
+                changed += _replace(node, "matrixSum", plug=entries[0])
+        elif len(entries) < len(indices):
+            for i in indices:
+                cmds.removeMultiInstance(f"{node}.matrixIn[{i}]", b=True)
+            for i, entry in enumerate(entries):
+                if isinstance(entry, om.MMatrix):
+                    cmds.setAttr(f"{node}.matrixIn[{i}]", list(entry), type="matrix")
+                else:
+                    cmds.connectAttr(entry, f"{node}.matrixIn[{i}]")
+            changed += 1
+
+    return changed
+
+
+def bypass_identity_nodes():
+    """
+    Bypass the pickMatrix nodes keeping every channel and the blendMatrix nodes without effective targets.
+
+    Returns:
+        int: Number of removed nodes.
+    """
+    removed = 0
+    for node in cmds.ls(type="pickMatrix") or []:
+        if _editable(node) and all(cmds.getAttr(f"{node}.{flag}") for flag in PICK_FLAGS) and not any(
+                _source(f"{node}.{flag}") for flag in PICK_FLAGS):
+            source = _source(f"{node}.inputMatrix")
+            removed += _replace(node, "outputMatrix", plug=source, matrix=None if source else cmds.getAttr(f"{node}.inputMatrix"))
+
+    for node in cmds.ls(type="blendMatrix") or []:
+        if not _editable(node) or _source(f"{node}.envelope"):
+            continue
+        targets = cmds.getAttr(f"{node}.target", multiIndices=True) or []
+        if targets and cmds.getAttr(f"{node}.envelope") != 0:
+            continue
+        source = _source(f"{node}.inputMatrix")
+        removed += _replace(node, "outputMatrix", plug=source, matrix=None if source else cmds.getAttr(f"{node}.inputMatrix"))
+
+    return removed
+
+
+def merge_duplicates():
+    """
+    Merge the nodes of MERGE_SETTINGS types with the same input connections and settings into one.
+
+    Returns:
+        int: Number of removed nodes.
+    """
+    removed = 0
+    for node_type, settings in MERGE_SETTINGS.items():
+        keepers = {}
+        for node in cmds.ls(type=node_type) or []:
+            inputs = cmds.listConnections(node, source=True, destination=False, connections=True, plugs=True) or []
+            if not inputs or not _editable(node):
+                continue
+
+            key = (
+                tuple(sorted((inputs[i].split(".", 1)[1], inputs[i + 1]) for i in range(0, len(inputs), 2))),
+                tuple(cmds.getAttr(f"{node}.{attr}") for attr in settings),
+            )
+            keeper = keepers.setdefault(key, node)
+            if keeper == node:
+                continue
+
+            outputs = cmds.listConnections(node, source=False, destination=True, connections=True, plugs=True) or []
+            for i in range(0, len(outputs), 2):
+                cmds.connectAttr(f"{keeper}.{outputs[i].split('.', 1)[1]}", outputs[i + 1], force=True)
+            cmds.delete(node)
+            removed += 1
+
+    return removed
+
+
+def graph_stats():
+    """
+    Returns:
+        tuple: (dependency node count, connection count) of the scene.
+    """
+    nodes = cmds.ls(dependencyNodes=True) or []
+    if not nodes:
+        return 0, 0
+    connections = cmds.listConnections(nodes, source=False, destination=True, connections=True, plugs=True) or []
+    return len(nodes), len(connections) // 2
+
+
+def _sampled_nodes():
+    return (cmds.ls(type="joint") or []) + (cmds.ls("*_CTL", type="transform") or [])
+
+
+def _pose_channels():
+    """
+    Keyable translate / rotate channels and keyable user attributes (space follow, ik/fk switches...) of the controls.
+    """
+    channels = []
+    for ctl in cmds.ls("*_CTL", type="transform") or []:
+        attrs = list(TR_CHANNELS)
+        attrs.extend(cmds.listAttr(ctl, userDefined=True, keyable=True, scalar=True) or [])
+        for attr in attrs:
+            plug = f"{ctl}.{attr}"
+            if cmds.getAttr(plug, settable=True) and cmds.getAttr(plug, keyable=True):
+                channels.append(plug)
+    return channels
+
+
+def _channel_values(plug):
+    """
+    Values to sample a user attribute with: the enum indices, 0 / 1 for booleans, the (min, max) range of numeric
+    attributes. None for attributes without a range, they get a small offset.
+    """
+    node, attr = plug.split(".", 1)
+    attr_type = cmds.getAttr(plug, type=True)
+    if attr_type == "enum":
+        fields = ":".join(cmds.attributeQuery(attr, node=node, listEnum=True) or []).split(":")
+        values = []
+        for i, field in enumerate(fields):
+            values.append(int(field.split("=")[1]) if "=" in field else (values[-1] + 1 if values else i))
+        return values
+    if attr_type == "bool":
+        return [0, 1]
+    if cmds.attributeQuery(attr, node=node, minExists=True) and cmds.attributeQuery(attr, node=node, maxExists=True):
+        return (cmds.attributeQuery(attr, node=node, minimum=True)[0], cmds.attributeQuery(attr, node=node, maximum=True)[0])
+    return None
+
+
+def sample_poses(channels, count=POSE_COUNT, seed=0):
+    """
+    Random values on the control channels (rest pose first), reproducible with the seed. Translate / rotate and
+    unbounded channels get an offset, enums, booleans and bounded attributes a random value in their range.
+
+    Returns:
+        list: One {plug: value} dict per pose.
+    """
+    rng = random.Random(seed)
+    rest = {plug: cmds.getAttr(plug) for plug in channels}
+    ranges = {plug: None if plug.split(".", 1)[1] in TR_CHANNELS else _channel_values(plug) for plug in channels}
+    poses = [rest]
+    for _ in range(count - 1):
+        pose = {}
+        for plug, value in rest.items():
+            values = ranges[plug]
+            if isinstance(values, list):
+                pose[plug] = rng.choice(values)
+            elif isinstance(values, tuple):
+                pose[plug] = rng.uniform(*values)
+            else:
+                pose[plug] = value + (rng.uniform(-15, 15) if "rotate" in plug else rng.uniform(-0.5, 0.5))
+        poses.append(pose)
+    return poses
+
+
+def world_matrices(nodes, poses):
+    """
+    World matrices of nodes on every pose, the rest pose is set back afterwards.
+
+    Returns:
+        list: One {node: MMatrix} dict per pose.
+    """
+    result = []
+    for pose in poses:
+        for plug, value in pose.items():
+            cmds.setAttr(plug, value)
+        result.append({node: om.MMatrix(cmds.getAttr(f"{node}.worldMatrix[0]")) for node in nodes})
+    for plug, value in poses[0].items():
+        cmds.setAttr(plug, value)
+    return result
+
+
+def optimize_graph(verify=True, max_passes=3):
+    """
+    Run the optimization passes until nothing changes, checking the joint and control world matrices on sampled
+    poses. The optimization is undone if any of them moved.
+
+    Args:
+        verify (bool): Compare the world matrices before and after.
+        max_passes (int): Maximum rounds of passes, a pass can expose more work to the others.
+
+    Returns:
+        dict: "nodes" and "connections" before / after, the removed count of every pass and if it was "verified".
+    """
+    nodes_before, connections_before = graph_stats()
+    sampled = _sampled_nodes()
+    poses = sample_poses(_pose_channels()) if verify else []
+    expected = world_matrices(sampled, poses) if verify else []
+
+    report = {"mult_matrix": 0, "identity": 0, "duplicates": 0}
+    # Builds may run with the undo queue off, it is needed to revert a failed verification. The verification poses
+    # are set inside the chunk so a single undo reverts the whole optimization.
+    undo_state = cmds.undoInfo(query=True, state=True)
+    cmds.undoInfo(state=True)
+    cmds.undoInfo(openChunk=True, chunkName="optimize_graph")
+    moved = []
+    try:
+        try:
+            for _ in range(max_passes):
+                done = (fold_mult_matrices(), bypass_identity_nodes(), merge_duplicates())
+                for key, value in zip(report, done):
+                    report[key] += value
+                if not any(done):
+                    break
+
+            if verify:
+                moved = [
+                    node for before, after in zip(expected, world_matrices(sampled, poses)) for node in sampled
+                    if not before[node].isEquivalent(after[node], TOLERANCE)
+                ]
+        except Exception:
+            # Never leave a half optimized graph in the scene
+            cmds.undoInfo(closeChunk=True)
+            cmds.undo()
+            raise
+
+        cmds.undoInfo(closeChunk=True)
+        if moved:
+            cmds.undo()
+    finally:
+        cmds.undoInfo(state=undo_state)
+
+    if moved:
+        om.MGlobal.displayError(f"Graph optimization changed {len(set(moved))} world matrices (e.g. {moved[0]}), undone.")
+        report["verified"] = False
+        return report
+    report["verified"] = verify
+
+    nodes_after, connections_after = graph_stats()
+    report.update({"nodes": (nodes_before, nodes_after), "connections": (connections_before, connections_after)})
+    om.MGlobal.displayInfo(
+        f"Graph optimization: {nodes_before - nodes_after} nodes and {connections_before - connections_after} connections "
+        f"removed ({nodes_before} -> {nodes_after} nodes, {connections_before} -> {connections_after} connections) | "
+        f"multMatrix {report['mult_matrix']}, identity {report['identity']}, duplicates {report['duplicates']}"
+    )
+    return report
@@ -0,0 +1,162 @@
+"""
+Attribution of profiler timings to rig modules.
+Everything here works on a recorded profiler dump (plain JSON, no Maya imports), so a playback recorded on an animator
+scene can be analysed headless. The dump is written by tools/rig_profiler.record_playback:
+
+    {
+        "frames": 120,
+        "events": [[name, description, category, start_us, duration_us, thread_id], ...],
+        "nodes": {node_name: {"type": node_type, "module": module_GRP or None}, ...},
+        "modules": [module_GRP, ...]
+    }
+
+Events are matched to nodes by name (or description) and attributed with their self time (duration minus the events
+nested in them on the same thread), so a module is not charged for the nodes it pulls from another one.
+"""
+
+import collections
+import json
+import re
+
+MODULE_SUFFIX = "Module_GRP"
+UNASSIGNED = "unassigned"
+
+
+def load_dump(file_path):
+    with open(file_path, "r") as f:
+        return json.load(f)
+
+
+def save_dump(file_path, dump):
+    with open(file_path, "w") as f:
+        json.dump(dump, f)
+
+
+def module_prefixes(module_groups):
+    """
+    Name prefix of every module group, longest first ("L_armModule_GRP" -> "L_arm").
+    """
+    prefixes = {group[:-len(MODULE_SUFFIX)]: group for group in module_groups if group.endswith(MODULE_SUFFIX)}
+    return sorted(prefixes.items(), key=lambda item: len(item[0]), reverse=True)
+
+
+def node_module(node, node_info=None, prefixes=()):
+    """
+    Module of a node: the module _GRP owning it, else the longest module prefix of its name, else its side_module
+    name ("L_armUpperTwist_PM" -> "L_arm").
+
+    Args:
+        node (str): Node name.
+        node_info (dict, optional): Entry of the dump "nodes" table.
+        prefixes (list): Result of module_prefixes.
+
+    Returns:
+        str: Module name.
+    """
+    if node_info and node_info.get("module"):
+        return node_info["module"]
+
+    short_name = node.split("|")[-1].split(":")[-1]
+    for prefix, group in prefixes:
+        if short_name.startswith(prefix):
+            return group
+
+    match = re.match(r"^([LRC])_([a-z]+)", short_name)
+    if match:
+        return f"{match.group(1)}_{match.group(2)}"
+
+    return UNASSIGNED
+
+
+def self_times(events):
+    """
+    Self time of every event: its duration minus the events nested in it on the same thread.
+
+    Args:
+        events (list): [name, description, category, start_us, duration_us, thread_id] rows.
+
+    Returns:
+        list: Self time in microseconds, one per event.
+    """
+    result = [float(event[4]) for event in events]
+    by_thread = collections.defaultdict(list)
+    for i, event in enumerate(events):
+        by_thread[event[5]].append(i)
+
+    for indices in by_thread.values():
+        indices.sort(key=lambda i: (events[i][3], -events[i][4]))
+        stack = []
+        for i in indices:
+            start, end = events[i][3], events[i][3] + events[i][4]
+            while stack and events[stack[-1]][3] + events[stack[-1]][4] <= start:
+                stack.pop()
+            if stack and end <= events[stack[-1]][3] + events[stack[-1]][4]:
+                result[stack[-1]] -= events[i][4]
+            stack.append(i)
+
+    return [max(value, 0.0) for value in result]
+
+
+def module_report(dump):
+    """
+    Ranked cost of every module over the recorded playback.
+
+    Args:
+        dump (dict): Recorded profiler dump (see the module docstring).
+
+    Returns:
+        list: One dict per module, most expensive first: "module", "ms_per_frame", "nodes" (evaluated node count)
+              and "node_types" (type -> ms per frame, most expensive first). Events that are not a node are summed
+              in an "other" entry.
+    """
+    frames = max(dump.get("frames", 1), 1)
+    events = dump.get("events", [])
+    nodes = dump.get("nodes", {})
+    prefixes = module_prefixes(dump.get("modules", []))
+
+    costs = collections.defaultdict(float)
+    type_costs = collections.defaultdict(lambda: collections.defaultdict(float))
+    evaluated = collections.defaultdict(set)
+    other = 0.0
+
+    for event, self_time in zip(events, self_times(events)):
+        name, description = event[0], event[1]
+        node = name if name in nodes else description if description in nodes else None
+        if node is None:
+            other += self_time
+            continue
+
+        module = node_module(node, nodes[node], prefixes)
+        costs[module] += self_time
+        type_costs[module][nodes[node].get("type", "unknown")] += self_time
+        evaluated[module].add(node)
+
+    report = [
+        {
+            "module": module,
+            "ms_per_frame": cost / 1000.0 / frames,
+            "nodes": len(evaluated[module]),
+            "node_types": dict(sorted(((node_type, value / 1000.0 / frames) for node_type, value in type_costs[module].items()),
+                                      key=lambda item: item[1], reverse=True)),
+        }
+        for module, cost in costs.items()
+    ]
+    report.sort(key=lambda entry: entry["ms_per_frame"], reverse=True)
+
+    if other:
+        report.append({"module": "other", "ms_per_frame": other / 1000.0 / frames, "nodes": 0, "node_types": {}})
+
+    return report
+
+
+def format_report(report, top_types=3):
+    """
+    Text table of a module_report.
+    """
+    total = sum(entry["ms_per_frame"] for entry in report) or 1.0
+    lines = [f"{'Module':<32}{'ms/frame':>10}{'%':>7}{'nodes':>8}  top node types"]
+    for entry in report:
+        types = ", ".join(f"{node_type} {value:.3f}" for node_type, value in list(entry["node_types"].items())[:top_types])
+        lines.append(f"{entry['module']:<32}{entry['ms_per_frame']:>10.3f}{100.0 * entry['ms_per_frame'] / total:>6.1f}%"
+                     f"{entry['nodes']:>8}  {types}")
+    return "\n".join(lines)
@@ -0,0 +1,647 @@
+"""
+Reader and writer for the .skn skin weight files.
+
+v1 files are minified JSON: {mesh: [{name, vertex_count, attributes, influences, sparse_weights, sparse_blend}]}.
+v2 files are a binary container with the same content:
+
+    header      MAGIC (4 bytes), version (uint16), reserved (uint16), index size (uint64)
+    index       UTF-8 JSON, mesh -> skins -> array descriptors (offset, count, dtype)
+    data        8 byte aligned little endian arrays
+
+Every skinCluster stores its weights as CSR arrays: "ptr" (int32, one start per weighted influence plus the end),
+"ix" (int32 vertex indices) and "vw" (float32 weights), plus the "blend_ix" / "blend_vw" arrays. The weighted
+influence table is kept in the index. Weights are rounded to 5 decimals in v1, float32 keeps them exactly enough to
+round back to the same decimals, so v1 -> v2 -> v1 is lossless. Files written with a quantized compression profile
+store "vw" as uint16 steps of 1 / 65535 instead, "blend_vw" is never quantized (the compression reports only measure
+the influence weights; older files with uint16 blend weights are still read). Skins exported with their vertex positions (used to
+remap the weights when the topology changed) have a flat "positions" list (x, y, z per vertex, float64 in v2, so
+positions far from the origin also survive the round trip; files written with float32 positions are still read).
+
+Opening a v2 file only parses the index, the arrays of a mesh are read from the memory map when it is accessed. They
+are copied out of the map, so the records stay valid after close() and the file is not kept mapped (and locked on
+Windows) by the arrays the caller keeps.
+"""
+
+import fnmatch
+import json
+import mmap
+import re
+import struct
+
+import numpy as np
+
+from puiastreTools.utils import skin_weights
+
+MAGIC = b"PSKN"
+VERSION = 2
+HEADER = struct.Struct("<4sHHQ")
+ALIGNMENT = 8
+
+INDEX_DTYPE = "<i4"
+WEIGHT_DTYPE = "<f4"
+QUANTIZED_DTYPE = "<u2"
+POSITION_DTYPE = "<f8"
+
+CHUNK_SIZE = 1 << 20
+_STRUCTURE_RE = re.compile(r'[{}\[\]"]')
+_STRING_RE = re.compile(r'"(?:[^"\\]|\\.)*"')
+_SCALAR_RE = re.compile(r'[^,\]}\s]+')
+
+
+def is_binary(file_path):
+    """
+    Check if a .skn file is a v2 binary container.
+
+    Args:
+        file_path (str): Path to the .skn file.
+
+    Returns:
+        bool: True for v2 files, False for v1 JSON files.
+    """
+    with open(file_path, "rb") as f:
+        return f.read(len(MAGIC)) == MAGIC
+
+
+def _aligned(size):
+    return (size + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
+
+
+class _DataWriter:
+    """
+    Collects the arrays of a v2 file and hands out their descriptors.
+    """
+
+    def __init__(self):
+        self.chunks = []
+        self.size = 0
+
+    def add(self, values, dtype):
+        array = np.ascontiguousarray(values, dtype=dtype)
+        descriptor = {"offset": self.size, "count": int(array.size), "dtype": dtype}
+        data = array.tobytes()
+        padding = _aligned(len(data)) - len(data)
+        self.chunks.append(data + b"\0" * padding)
+        self.size += len(data) + padding
+        return descriptor
+
+
+def _encode_weights(values, writer, quantize=False):
+    if quantize:
+        steps = np.round(np.asarray(values, dtype=np.float64) * skin_weights.QUANTIZE_SCALE)
+        return writer.add(np.clip(steps, 0, skin_weights.QUANTIZE_SCALE), QUANTIZED_DTYPE)
+    return writer.add(values, WEIGHT_DTYPE)
+
+
+def _decode_weights(values):
+    if values.dtype == np.dtype(QUANTIZED_DTYPE):
+        return values / float(skin_weights.QUANTIZE_SCALE)
+    return values
+
+
+def _encode_skin(skin_data, writer, quantize=False):
+    sparse_weights = skin_data.get("sparse_weights", {})
+    weighted_infs = list(sparse_weights)
+
+    ix_blocks = [np.asarray(sparse_weights[inf]["ix"], dtype=np.int64) for inf in weighted_infs]
+    vw_blocks = [np.asarray(sparse_weights[inf]["vw"], dtype=np.float64) for inf in weighted_infs]
+    ptr = np.zeros(len(weighted_infs) + 1, dtype=np.int64)
+    if ix_blocks:
+        ptr[1:] = np.cumsum([block.size for block in ix_blocks])
+
+    sparse_blend = skin_data.get("sparse_blend", {}) or {}
+
+    entry = {
+        "name": skin_data["name"],
+        "vertex_count": skin_data["vertex_count"],
+        "attributes": skin_data.get("attributes", {}),
+        "influences": list(skin_data["influences"]),
+        "weighted_influences": weighted_infs,
+        "ptr": writer.add(ptr, INDEX_DTYPE),
+        "ix": writer.add(np.concatenate(ix_blocks) if ix_blocks else [], INDEX_DTYPE),
+        "vw": _encode_weights(np.concatenate(vw_blocks) if vw_blocks else [], writer, quantize),
+        "blend_ix": writer.add(sparse_blend.get("ix", []), INDEX_DTYPE),
+        "blend_vw": _encode_weights(sparse_blend.get("vw", []), writer),
+    }
+    if "positions" in skin_data:
+        entry["positions"] = writer.add(skin_data["positions"], POSITION_DTYPE)
+
+    return entry
+
+
+def write_v2(file_path, data, quantize=False):
+    """
+    Write skin data to a v2 binary .skn file.
+
+    Args:
+        file_path (str): Destination path.
+        data (dict): Skin data in the v1 layout, mesh -> list of skin dictionaries. The ix / vw blocks can be lists
+                     or NumPy arrays.
+        quantize (bool): Store the influence weights as uint16 steps of 1 / QUANTIZE_SCALE (see
+                         skin_weights.compress_sparse). The blend weights keep float32.
+    """
+    writer = _DataWriter()
+    index = {"version": VERSION, "meshes": {}}
+
+    for mesh_name, skins_list in data.items():
+        index["meshes"][mesh_name] = [_encode_skin(skin_data, writer, quantize) for skin_data in skins_list]
+
+    index_bytes = json.dumps(index, separators=(",", ":")).encode("utf-8")
+    index_bytes += b" " * (_aligned(HEADER.size + len(index_bytes)) - HEADER.size - len(index_bytes))
+
+    with open(file_path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, VERSION, 0, len(index_bytes)))
+        f.write(index_bytes)
+        for chunk in writer.chunks:
+            f.write(chunk)
+
+
+class SknFile:
+    """
+    Lazy, memory mapped reader of v2 .skn files.
+    Behaves like the v1 dictionary (mesh -> list of skin dictionaries) but only builds the records of the meshes that
+    are accessed, with the ix / vw blocks as NumPy arrays read from the memory map.
+    """
+
+    def __init__(self, file_path):
+        self.file_path = file_path
+        self._file = open(file_path, "rb")
+        try:
+            magic, version, _, index_size = HEADER.unpack(self._file.read(HEADER.size))
+            if magic != MAGIC:
+                raise ValueError(f"{file_path} is not a binary .skn file.")
+            if version != VERSION:
+                raise ValueError(f"Unsupported .skn version {version} in {file_path}.")
+
+            self.index = json.loads(self._file.read(index_size).decode("utf-8"))
+            self._data_offset = HEADER.size + index_size
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except Exception:
+            self._file.close()
+            raise
+
+    def close(self):
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def _array(self, descriptor):
+        # Copied, a view would export the map buffer and keep the file mapped after close
+        return np.frombuffer(self._mmap, dtype=descriptor["dtype"], count=descriptor["count"],
+                             offset=self._data_offset + descriptor["offset"]).copy()
+
+    def meshes(self):
+        return list(self.index["meshes"])
+
+    def skin_index(self, mesh_name):
+        """
+        Get the index entries (names, vertex counts, influences, no weights) of the skins of a mesh.
+        """
+        return self.index["meshes"][mesh_name]
+
+    def skin_record(self, entry, influences=None):
+        """
+        Build the v1 style dictionary of one skin index entry.
+
+        Args:
+            entry (dict): Skin index entry.
+            influences (iterable, optional): Only decode the blocks of these influences.
+
+        Returns:
+            dict: Skin dictionary with NumPy ix / vw blocks.
+        """
+        ptr = self._array(entry["ptr"])
+        ix = self._array(entry["ix"])
+        vw = _decode_weights(self._array(entry["vw"]))
+        wanted = set(influences) if influences is not None else None
+
+        sparse_weights = {}
+        for i, inf_name in enumerate(entry["weighted_influences"]):
+            if wanted is not None and inf_name not in wanted:
+                continue
+            sparse_weights[inf_name] = {"ix": ix[ptr[i]:ptr[i + 1]], "vw": vw[ptr[i]:ptr[i + 1]]}
+
+        blend_ix = self._array(entry["blend_ix"])
+        sparse_blend = {"ix": blend_ix, "vw": _decode_weights(self._array(entry["blend_vw"]))} if blend_ix.size else {}
+
+        record = {
+            "name": entry["name"],
+            "vertex_count": entry["vertex_count"],
+            "attributes": entry["attributes"],
+            "influences": entry["influences"],
+            "sparse_weights": sparse_weights,
+            "sparse_blend": sparse_blend,
+        }
+        if "positions" in entry:
+            record["positions"] = self._array(entry["positions"])
+
+        return record
+
+    def skins(self, mesh_name):
+        return [self.skin_record(entry) for entry in self.skin_index(mesh_name)]
+
+    def items(self):
+        for mesh_name in self.meshes():
+            yield mesh_name, self.skins(mesh_name)
+
+    def __getitem__(self, mesh_name):
+        return self.skins(mesh_name)
+
+    def __contains__(self, mesh_name):
+        return mesh_name in self.index["meshes"]
+
+    def __iter__(self):
+        return iter(self.meshes())
+
+    def __len__(self):
+        return len(self.index["meshes"])
+
+
+def to_v1_skin(skin_data):
+    """
+    Convert a skin dictionary with NumPy blocks (as read from a v2 file) to plain v1 JSON values.
+
+    Args:
+        skin_data (dict): Skin dictionary.
+
+    Returns:
+        dict: Skin dictionary with lists, weights rounded to the v1 decimals.
+    """
+    def block(ix, vw):
+        return {
+            "ix": np.asarray(ix).astype(np.int64).tolist(),
+            "vw": skin_weights.round_weights(np.asarray(vw, dtype=np.float64)).tolist()
+        }
+
+    sparse_blend = skin_data.get("sparse_blend", {})
+
+    v1_skin = {
+        "name": skin_data["name"],
+        "vertex_count": skin_data["vertex_count"],
+        "attributes": skin_data["attributes"],
+        "influences": list(skin_data["influences"]),
+        "sparse_weights": {inf: block(b["ix"], b["vw"]) for inf, b in skin_data["sparse_weights"].items()},
+        "sparse_blend": block(sparse_blend["ix"], sparse_blend["vw"]) if sparse_blend else {}
+    }
+    if "positions" in skin_data:
+        v1_skin["positions"] = skin_weights.round_weights(np.asarray(skin_data["positions"], dtype=np.float64)).tolist()
+
+    return v1_skin
+
+
+def load(file_path):
+    """
+    Open a .skn file of any version.
+
+    Args:
+        file_path (str): Path to the .skn file.
+
+    Returns:
+        dict or SknFile: The v1 dictionary, or a lazy SknFile for v2 files (close it when done).
+    """
+    if is_binary(file_path):
+        return SknFile(file_path)
+
+    with open(file_path, "r") as f:
+        return json.load(f)
+
+
+def convert_v1_to_v2(source_path, destination_path):
+    """
+    Convert a v1 JSON .skn file to the v2 binary container.
+    """
+    with open(source_path, "r") as f:
+        data = json.load(f)
+
+    write_v2(destination_path, data)
+
+
+def convert_v2_to_v1(source_path, destination_path):
+    """
+    Convert a v2 binary .skn file back to v1 JSON.
+    """
+    with SknFile(source_path) as skn, JsonSkinWriter(destination_path) as writer:
+        for mesh_name, skins_list in skn.items():
+            writer.begin_mesh(mesh_name)
+            for skin_data in skins_list:
+                writer.add_skin(to_v1_skin(skin_data))
+            writer.end_mesh()
+
+
+class JsonSkinWriter:
+    """
+    Streaming writer of v1 JSON files, the output is the same as json.dump(data, f, separators=(",", ":")).
+    Skins are written one at a time and the ix / vw blocks are serialized in slices, so the whole file is never
+    built in memory. The blocks can be lists or NumPy arrays.
+
+    Usage:
+        with JsonSkinWriter(file_path) as writer:
+            writer.begin_mesh(mesh_name)
+            writer.add_skin(skin_data)
+            writer.end_mesh()
+    """
+
+    SLICE_SIZE = 65536
+
+    def __init__(self, file_path):
+        self.file_path = file_path
+        self._file = open(file_path, "w")
+        self._file.write("{")
+        self._mesh_count = 0
+        self._skin_count = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def close(self):
+        if self._file is not None:
+            self._file.write("}")
+            self._file.close()
+            self._file = None
+
+    def begin_mesh(self, mesh_name):
+        if self._mesh_count:
+            self._file.write(",")
+        self._file.write(json.dumps(mesh_name) + ":[")
+        self._mesh_count += 1
+        self._skin_count = 0
+
+    def end_mesh(self):
+        self._file.write("]")
+
+    def _write_values(self, values, to_text):
+        values = np.asarray(values)
+        for start in range(0, values.size, self.SLICE_SIZE):
+            if start:
+                self._file.write(",")
+            self._file.write(",".join(map(to_text, values[start:start + self.SLICE_SIZE].tolist())))
+
+    def _write_block(self, block):
+        if not block:
+            self._file.write("{}")
+            return
+        self._file.write('{"ix":[')
+        self._write_values(block["ix"], str)
+        self._file.write('],"vw":[')
+        self._write_values(block["vw"], float.__repr__)
+        self._file.write("]}")
+
+    def add_skin(self, skin_data):
+        if self._skin_count:
+            self._file.write(",")
+        self._skin_count += 1
+
+        self._file.write("{")
+        for i, (key, value) in enumerate(skin_data.items()):
+            if i:
+                self._file.write(",")
+            self._file.write(json.dumps(key) + ":")
+
+            if key == "sparse_weights":
+                self._file.write("{")
+                for j, (inf_name, block) in enumerate(value.items()):
+                    if j:
+                        self._file.write(",")
+                    self._file.write(json.dumps(inf_name) + ":")
+                    self._write_block(block)
+                self._file.write("}")
+            elif key == "sparse_blend":
+                self._write_block(value)
+            elif key == "positions":
+                self._file.write("[")
+                self._write_values(value, float.__repr__)
+                self._file.write("]")
+            else:
+                self._file.write(json.dumps(value, separators=(",", ":")))
+        self._file.write("}")
+
+
+class _JsonStream:
+    """
+    Minimal pull reader for the v1 JSON files.
+    The file is read in chunks, values the caller does not want are skipped by scanning the brackets with regular
+    expressions, so they are never decoded into Python objects.
+    """
+
+    def __init__(self, f, chunk_size=CHUNK_SIZE):
+        self.f = f
+        self.chunk_size = chunk_size
+        self.buffer = ""
+        self.pos = 0
+        self.eof = False
+
+    def _fill(self):
+        chunk = self.f.read(self.chunk_size)
+        if not chunk:
+            self.eof = True
+            return False
+        self.buffer = self.buffer[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self):
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in " \t\r\n":
+                self.pos += 1
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self._fill():
+                raise ValueError("Unexpected end of skin file.")
+
+    def consume(self, char):
+        if self.peek() != char:
+            raise ValueError(f"Expected '{char}' in skin file, found '{self.buffer[self.pos]}'.")
+        self.pos += 1
+
+    def _value_end(self, keep=True):
+        """
+        Get the end position in the buffer of the value starting at self.pos, reading more chunks if needed.
+        Without keep the value is being skipped: the part of an array / object already scanned is dropped from the
+        buffer before every read (self.pos moves along), so skipping a big value keeps one chunk in memory.
+        """
+        self.peek()
+        start = self.pos
+        first = self.buffer[start]
+
+        if first == '"':
+            while True:
+                match = _STRING_RE.match(self.buffer, start)
+                if match and match.end() < len(self.buffer) or match and self.eof:
+                    return match.end()
+                offset = start - self.pos
+                if not self._fill():
+                    raise ValueError("Unexpected end of skin file.")
+                start = self.pos + offset
+
+        if first not in "{[":
+            while True:
+                match = _SCALAR_RE.match(self.buffer, start)
+                if match.end() < len(self.buffer) or self.eof:
+                    return match.end()
+                offset = start - self.pos
+                if not self._fill():
+                    return len(self.buffer)
+                start = self.pos + offset
+
+        depth = 0
+        scan = start
+        while True:
+            match = _STRUCTURE_RE.search(self.buffer, scan)
+            if match is None:
+                if not keep:
+                    self.pos = len(self.buffer)
+                scan_offset = len(self.buffer) - self.pos
+                if not self._fill():
+                    raise ValueError("Unexpected end of skin file.")
+                scan = self.pos + scan_offset
+                continue
+
+            char = match.group()
+            if char == '"':
+                string = _STRING_RE.match(self.buffer, match.start())
+                if string is None or string.end() >= len(self.buffer) and not self.eof:
+                    if not keep:
+                        self.pos = match.start()
+                    scan_offset = match.start() - self.pos
+                    if not self._fill():
+                        raise ValueError("Unexpected end of skin file.")
+                    scan = self.pos + scan_offset
+                    continue
+                scan = string.end()
+                continue
+
+            depth += 1 if char in "{[" else -1
+            scan = match.end()
+            if depth == 0:
+                return scan
+
+    def skip(self):
+        self.pos = self._value_end(keep=False)
+
+    def decode(self):
+        end = self._value_end()
+        value = json.loads(self.buffer[self.pos:end])
+        self.pos = end
+        return value
+
+    def iter_object(self):
+        """
+        Iterate the keys of the object at the current position. The caller must decode or skip every value.
+        """
+        self.consume("{")
+        if self.peek() == "}":
+            self.pos += 1
+            return
+        while True:
+            key = self.decode()
+            self.consume(":")
+            yield key
+            if self.peek() == ",":
+                self.pos += 1
+                continue
+            self.consume("}")
+            return
+
+    def iter_array(self):
+        """
+        Iterate the items of the array at the current position. The caller must decode or skip every item.
+        """
+        self.consume("[")
+        if self.peek() == "]":
+            self.pos += 1
+            return
+        while True:
+            yield
+            if self.peek() == ",":
+                self.pos += 1
+                continue
+            self.consume("]")
+            return
+
+
+def _matches(name, patterns):
+    if patterns is None:
+        return True
+    return any(fnmatch.fnmatchcase(name, pattern) for pattern in patterns)
+
+
+def _read_v1_skin(stream, skin_clusters, influences):
+    """
+    Read one skin object of a v1 file, only decoding the weight blocks of the wanted influences.
+    Returns None (after skipping the rest of the object) when the skinCluster is filtered out.
+    """
+    skin_data = {}
+    for key in stream.iter_object():
+        if key == "sparse_weights" and "name" in skin_data:
+            if not _matches(skin_data["name"], skin_clusters):
+                stream.skip()
+                continue
+            sparse_weights = {}
+            for inf_name in stream.iter_object():
+                if influences is None or inf_name in influences:
+                    sparse_weights[inf_name] = stream.decode()
+                else:
+                    stream.skip()
+            skin_data[key] = sparse_weights
+        else:
+            skin_data[key] = stream.decode()
+
+    if not _matches(skin_data.get("name", ""), skin_clusters):
+        return None
+
+    if influences is not None:
+        skin_data["sparse_weights"] = {inf: block for inf, block in skin_data.get("sparse_weights", {}).items() if inf in influences}
+
+    return skin_data
+
+
+def iter_records(file_path, meshes=None, skin_clusters=None, influences=None):
+    """
+    Iterate the skin records of a .skn file (v1 or v2), only decoding the ones that match the filters.
+    v1 files are streamed with a pull reader that skips the unwanted meshes, skinClusters and influence blocks without
+    decoding them, v2 files only read the index and the arrays of the wanted records.
+
+    Args:
+        file_path (str): Path to the .skn file.
+        meshes (list, optional): Mesh names or glob patterns to read. Defaults to all.
+        skin_clusters (list, optional): SkinCluster names or glob patterns to read. Defaults to all.
+        influences (list, optional): Only read the weight blocks of these influences. Defaults to all.
+
+    Yields:
+        tuple: (mesh name, list of skin dictionaries) for every mesh with at least one matching skinCluster.
+    """
+    influences = set(influences) if influences is not None else None
+
+    if is_binary(file_path):
+        with SknFile(file_path) as skn:
+            for mesh_name in skn.meshes():
+                if not _matches(mesh_name, meshes):
+                    continue
+                skins = [skn.skin_record(entry, influences) for entry in skn.skin_index(mesh_name) if _matches(entry["name"], skin_clusters)]
+                if skins:
+                    yield mesh_name, skins
+        return
+
+    with open(file_path, "r") as f:
+        stream = _JsonStream(f)
+        for mesh_name in stream.iter_object():
+            if not _matches(mesh_name, meshes):
+                stream.skip()
+                continue
+
+            skins = []
+            for _ in stream.iter_array():
+                skin_data = _read_v1_skin(stream, skin_clusters, influences)
+                if skin_data is not None:
+                    skins.append(skin_data)
+            if skins:
+                yield mesh_name, skins
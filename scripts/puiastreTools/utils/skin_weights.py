@@ -0,0 +1,939 @@
+"""
+Array helpers for skinCluster weights.
+Everything here works on plain NumPy arrays (no Maya imports), so the weight math used by the skin tools can be run
+and benchmarked headless.
+"""
+
+import collections
+import json
+import time
+import tracemalloc
+
+import numpy as np
+
+from puiastreTools.utils import spatial
+
+DECIMALS = 5
+TOLERANCE = 1e-5
+CHUNK_SIZE = 20000
+PIPELINE_DEPTH = 2
+QUANTIZE_SCALE = 65535
+
+COMPRESSION_PROFILES = {
+    "game": {"max_influences": 4, "quantize": True},
+    "crowd": {"max_influences": 2, "quantize": True},
+}
+
+
+def round_weights(values, decimals=DECIMALS):
+    """
+    Vectorized version of the builtin round(value, decimals).
+    np.round can pick the other neighbour when the scaled value lands on (or next to) a .5 tie, those few values are
+    rounded with the builtin so the result is exactly the same as the scalar version.
+
+    Args:
+        values (np.ndarray): Float values to round.
+        decimals (int): Number of decimals to keep. Default is 5.
+
+    Returns:
+        np.ndarray: The rounded values as float64.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    scaled = values * (10.0 ** decimals)
+    rounded = np.round(values, decimals)
+
+    near_tie = np.abs(np.abs(scaled - np.floor(scaled)) - 0.5) < 1e-6
+    if near_tie.any():
+        idx = np.flatnonzero(near_tie)
+        rounded[idx] = [round(float(v), decimals) for v in values[idx]]
+
+    return rounded
+
+
+def weights_matrix(flat_weights, vtx_count, num_influences):
+    """
+    Get a (vertices, influences) view of a flat skinCluster weight buffer.
+
+    Args:
+        flat_weights (sequence): Flat weights in getWeights order (vertex major).
+        vtx_count (int): Number of vertices.
+        num_influences (int): Number of influences.
+
+    Returns:
+        np.ndarray: Array of shape (vtx_count, num_influences).
+    """
+    if isinstance(flat_weights, np.ndarray):
+        flat = flat_weights.astype(np.float64, copy=False)
+    else:
+        flat = np.fromiter(flat_weights, dtype=np.float64, count=vtx_count * num_influences)
+
+    return flat.reshape(vtx_count, num_influences)
+
+
+def sparse_encode(weights, inf_names, tolerance=TOLERANCE, decimals=DECIMALS):
+    """
+    Build the sparse per influence blocks stored in the .skn files.
+
+    Args:
+        weights (np.ndarray): Array of shape (vertices, influences).
+        inf_names (list): Influence names, one per column.
+        tolerance (float): Weights below or equal to this value are dropped.
+        decimals (int): Number of decimals kept for the weights.
+
+    Returns:
+        dict: Influence name -> {"ix": vertex indices, "vw": weights}, only for influences with weights.
+    """
+    sparse_weights = {}
+
+    # Influence major nonzero, so every influence block comes out as one contiguous, vertex sorted slice
+    columns = weights.T
+    inf_indices, vtx_indices = np.nonzero(columns > tolerance)
+    values = round_weights(columns[inf_indices, vtx_indices], decimals)
+    bounds = np.searchsorted(inf_indices, np.arange(len(inf_names) + 1))
+
+    for inf_idx, inf_name in enumerate(inf_names):
+        start, end = bounds[inf_idx], bounds[inf_idx + 1]
+        if start == end:
+            continue
+
+        sparse_weights[inf_name] = {
+            "ix": vtx_indices[start:end].tolist(),
+            "vw": values[start:end].tolist()
+        }
+
+    return sparse_weights
+
+
+def _encode_chunk(chunk, start, tolerance=TOLERANCE, decimals=DECIMALS):
+    """
+    Sparse encode one (vertices, influences) chunk starting at vertex start.
+
+    Returns:
+        tuple: (vtx_indices, values, bounds), entries sorted by influence, bounds[i]:bounds[i + 1] being the
+               entries of influence i.
+    """
+    columns = chunk.T
+    inf_indices, vtx_indices = np.nonzero(columns > tolerance)
+    values = round_weights(columns[inf_indices, vtx_indices], decimals)
+    bounds = np.searchsorted(inf_indices, np.arange(chunk.shape[1] + 1))
+
+    return (vtx_indices + start).astype(np.int32), values, bounds
+
+
+def sparse_encode_chunked(fetch_chunk, vtx_count, inf_names, chunk_size=CHUNK_SIZE, tolerance=TOLERANCE, decimals=DECIMALS, executor=None):
+    """
+    Sparse encoding that only holds one vertex range of dense weights at a time.
+    The weights are queried chunk by chunk, every chunk is reduced to its non zero weights right away and the blocks
+    are kept as compact arrays, so the peak memory is the dense chunk plus the sparse result.
+
+    With an executor the chunks are fetched on the calling thread (where the Maya queries must happen) and encoded in
+    the pool through pipelined, so at most PIPELINE_DEPTH dense chunks are alive at a time whatever the pool size:
+    the peak memory is PIPELINE_DEPTH x chunk_size x influences x 8 bytes plus the sparse result.
+
+    Args:
+        fetch_chunk (callable): fetch_chunk(start, stop) -> flat weights of the vertex range (vertex major).
+        vtx_count (int): Number of vertices.
+        inf_names (list): Influence names, one per column.
+        chunk_size (int): Number of vertices queried at a time.
+        tolerance (float): Weights below or equal to this value are dropped.
+        decimals (int): Number of decimals kept for the weights.
+        executor (concurrent.futures.Executor, optional): Pool for the chunk encoding.
+
+    Returns:
+        dict: Influence name -> {"ix": vertex indices, "vw": weights} as NumPy arrays, only for influences with weights.
+    """
+    num_infs = len(inf_names)
+    ix_parts = [[] for _ in range(num_infs)]
+    vw_parts = [[] for _ in range(num_infs)]
+
+    def collect(encoded):
+        vtx_indices, values, bounds = encoded
+        for inf_idx in np.flatnonzero(np.diff(bounds)):
+            chunk_start, chunk_end = bounds[inf_idx], bounds[inf_idx + 1]
+            ix_parts[inf_idx].append(vtx_indices[chunk_start:chunk_end])
+            vw_parts[inf_idx].append(values[chunk_start:chunk_end])
+
+    def fetch(start):
+        stop = min(start + chunk_size, vtx_count)
+        return weights_matrix(fetch_chunk(start, stop), stop - start, num_infs), start
+
+    chunks = (fetch(start) for start in range(0, vtx_count, chunk_size))
+    if executor is None:
+        for chunk, start in chunks:
+            collect(_encode_chunk(chunk, start, tolerance, decimals))
+    else:
+        for encoded in pipelined(executor, lambda item: _encode_chunk(item[0], item[1], tolerance, decimals), chunks):
+            collect(encoded)
+
+    return {
+        inf_name: {"ix": np.concatenate(ix_parts[i]), "vw": np.concatenate(vw_parts[i])}
+        for i, inf_name in enumerate(inf_names) if ix_parts[i]
+    }
+
+
+def pipelined(executor, function, items, depth=None):
+    """
+    Ordered, bounded map over a pool. Items are pulled from the iterable on the calling thread and at most depth of
+    them are processed at a time, results are yielded in the order of the items.
+    Lets the caller produce the next item (e.g. Maya queries, which must stay on the main thread) while the previous
+    ones are processed.
+
+    Args:
+        executor (concurrent.futures.Executor): Pool running function.
+        function (callable): Function applied to every item.
+        items (iterable): Items, consumed lazily.
+        depth (int, optional): Maximum number of items in flight, the item being pulled included. Defaults to
+                               PIPELINE_DEPTH, independent of the pool size so the memory held by the items stays
+                               bounded on machines with many cores.
+
+    Yields:
+        The results of function, in order.
+    """
+    depth = max(depth or PIPELINE_DEPTH, 1)
+    pending = collections.deque()
+
+    for item in items:
+        pending.append(executor.submit(function, item))
+        if len(pending) >= depth:
+            yield pending.popleft().result()
+
+    while pending:
+        yield pending.popleft().result()
+
+
+def sparse_encode_blend_chunked(fetch_chunk, vtx_count, chunk_size=CHUNK_SIZE, tolerance=TOLERANCE, decimals=DECIMALS, executor=None):
+    """
+    Chunked version of sparse_encode_blend, fetch_chunk(start, stop) returns the blend weights of the vertex range.
+    """
+    sparse_blend = sparse_encode_chunked(fetch_chunk, vtx_count, ["blend"], chunk_size, tolerance, decimals, executor)
+    return sparse_blend.get("blend", {})
+
+
+def sparse_encode_blend(blend_weights, tolerance=TOLERANCE, decimals=DECIMALS):
+    """
+    Build the sparse block for the dual quaternion blend weights.
+
+    Args:
+        blend_weights (np.ndarray): One blend weight per vertex.
+        tolerance (float): Weights below or equal to this value are dropped.
+        decimals (int): Number of decimals kept for the weights.
+
+    Returns:
+        dict: {"ix": vertex indices, "vw": weights} or an empty dict if there are no blend weights.
+    """
+    blend_weights = np.asarray(blend_weights, dtype=np.float64)
+    indices = np.flatnonzero(blend_weights > tolerance)
+    if not indices.size:
+        return {}
+
+    return {"ix": indices.tolist(), "vw": round_weights(blend_weights[indices], decimals).tolist()}
+
+
+def remap_sparse(sparse_weights, source_vtx_count, inf_names, indices, weights, chunk_size=CHUNK_SIZE, tolerance=TOLERANCE, decimals=DECIMALS):
+    """
+    Transfer sparse weights to another topology with a vertex map (see spatial.closest_point_map /
+    spatial.interpolation_map): every target vertex blends the weights of its source vertices and is renormalized to
+    the weight sum of the blend.
+
+    Args:
+        sparse_weights (dict): Influence name -> {"ix": vertex indices, "vw": weights} of the source.
+        source_vtx_count (int): Number of source vertices.
+        inf_names (list): Influence names of the skin.
+        indices (np.ndarray): (M, k) source vertex indices of every target vertex.
+        weights (np.ndarray): (M, k) blend weights of the source vertices, summing to 1 per target vertex.
+        chunk_size (int): Number of target vertices remapped at a time.
+        tolerance (float): Weights below or equal to this value are dropped.
+        decimals (int): Number of decimals kept for the weights.
+
+    Returns:
+        dict: Influence name -> {"ix": vertex indices, "vw": weights} of the target, as NumPy arrays.
+    """
+    num_infs = len(inf_names)
+    if not num_infs:
+        return {}
+    indices = np.asarray(indices, dtype=np.int64)
+    weights = np.asarray(weights, dtype=np.float64)
+
+    # Vertex major entries of the source (sorted by flat index), row_starts[v]:row_starts[v + 1] being the entries of
+    # vertex v, so a chunk only gathers the non zero weights of its source vertices
+    flat_indices, values = sparse_decode_flat(sparse_weights, source_vtx_count, inf_names)
+    source_vertices, columns = np.divmod(flat_indices, num_infs)
+    row_starts = np.searchsorted(source_vertices, np.arange(source_vtx_count + 1))
+    source_sums = np.bincount(source_vertices, weights=values, minlength=source_vtx_count)
+
+    def fetch_chunk(start, stop):
+        chunk_indices = indices[start:stop]
+        chunk_weights = weights[start:stop]
+        rows = len(chunk_indices)
+
+        starts = row_starts[chunk_indices].ravel()
+        counts = row_starts[chunk_indices + 1].ravel() - starts
+        offsets = np.cumsum(counts) - counts
+        entries = np.repeat(starts - offsets, counts) + np.arange(counts.sum())
+        targets = np.repeat(np.arange(chunk_indices.size) // chunk_indices.shape[1], counts)
+
+        chunk = np.bincount(targets * num_infs + columns[entries],
+                            weights=np.repeat(chunk_weights.ravel(), counts) * values[entries],
+                            minlength=rows * num_infs).astype(np.float64, copy=False).reshape(rows, num_infs)
+        target_sums = np.einsum("vk,vk->v", chunk_weights, source_sums[chunk_indices])
+        chunk_sums = chunk.sum(axis=1)
+        scale = np.divide(target_sums, chunk_sums, out=np.zeros_like(chunk_sums), where=chunk_sums > 0)
+        return chunk * scale[:, None]
+
+    return sparse_encode_chunked(fetch_chunk, len(indices), inf_names, chunk_size, tolerance, decimals)
+
+
+def remap_blend(sparse_blend, source_vtx_count, indices, weights, tolerance=TOLERANCE, decimals=DECIMALS):
+    """
+    Transfer sparse blend weights to another topology with a vertex map, like remap_sparse.
+    """
+    if not sparse_blend:
+        return {}
+    source = sparse_decode_blend(sparse_blend, source_vtx_count)
+    blend_weights = np.einsum("vk,vk->v", np.asarray(weights, dtype=np.float64), source[np.asarray(indices, dtype=np.int64)])
+    return sparse_encode_blend(blend_weights, tolerance, decimals)
+
+
+def transfer_dense(source_weights, indices, weights, chunk_size=CHUNK_SIZE):
+    """
+    Gather dense weights through a vertex map (see spatial.closest_point_map / spatial.interpolation_map) and
+    normalize every target vertex, like copySkinWeights with normalize on.
+
+    Args:
+        source_weights (np.ndarray): (N, influences) source weights.
+        indices (np.ndarray): (M, k) source vertex indices of every target vertex.
+        weights (np.ndarray): (M, k) blend weights of the source vertices.
+        chunk_size (int): Number of target vertices computed at a time.
+
+    Returns:
+        np.ndarray: (M, influences) target weights.
+    """
+    indices = np.asarray(indices, dtype=np.int64)
+    weights = np.asarray(weights, dtype=np.float64)
+    result = np.empty((len(indices), source_weights.shape[1]), dtype=np.float64)
+
+    for start in range(0, len(indices), chunk_size):
+        stop = min(start + chunk_size, len(indices))
+        chunk = np.einsum("vk,vki->vi", weights[start:stop], source_weights[indices[start:stop]])
+        sums = chunk.sum(axis=1, keepdims=True)
+        result[start:stop] = np.divide(chunk, sums, out=np.zeros_like(chunk), where=sums > 0)
+
+    return result
+
+
+def mirror_name(name, sides=(("L_", "R_"), ("R_", "L_"))):
+    """
+    Name of the opposite side influence (L_ <-> R_ prefix), the same name for center influences.
+    """
+    parts = name.split("|")
+    for side, other in sides:
+        if parts[-1].startswith(side):
+            parts[-1] = other + parts[-1][len(side):]
+            return "|".join(parts)
+    return name
+
+
+def mirror_influence_indices(inf_names):
+    """
+    Column of the opposite side influence of every influence, its own column when the mirrored influence is not in
+    the skin.
+
+    Args:
+        inf_names (list): Influence names.
+
+    Returns:
+        np.ndarray: Column permutation.
+    """
+    inf_map = {name: i for i, name in enumerate(inf_names)}
+    return np.array([inf_map.get(mirror_name(name), i) for i, name in enumerate(inf_names)], dtype=np.int64)
+
+
+def mirror_dense(weights, points, mirror_indices, inf_mirror, axis=0, direction=1, tolerance=1e-4, found=None):
+    """
+    Mirror dense weights from one side of the mesh to the other, like copySkinWeights mirrorMode. The vertices of the
+    destination side take the weights of their mirror vertex with the influence columns swapped.
+
+    Args:
+        weights (np.ndarray): (N, influences) weights.
+        points (np.ndarray): (N, 3) vertex positions.
+        mirror_indices (np.ndarray): Mirror vertex of every vertex (see spatial.mirror_map).
+        inf_mirror (np.ndarray): Column permutation (see mirror_influence_indices).
+        axis (int): Axis normal to the mirror plane, 0 for YZ.
+        direction (int): 1 copies the positive side to the negative one, -1 the opposite.
+        tolerance (float): Vertices closer than this to the plane are left untouched.
+        found (np.ndarray, optional): Vertices with a valid mirror. Defaults to all.
+
+    Returns:
+        np.ndarray: Mirrored copy of the weights.
+    """
+    points = np.asarray(points, dtype=np.float64).reshape(-1, 3)
+    destination = points[:, axis] * direction < -tolerance
+    if found is not None:
+        destination &= found
+
+    mirrored = weights.copy()
+    mirrored[destination] = weights[mirror_indices[destination]][:, inf_mirror]
+
+    return mirrored
+
+
+def weighted_influences(sparse_weights, tolerance=TOLERANCE):
+    """
+    Influences of the sparse blocks that carry at least one weight above tolerance, in block order.
+
+    Args:
+        sparse_weights (dict): Influence name -> {"ix": vertex indices, "vw": weights}.
+        tolerance (float): Weights below or equal to this value count as zero.
+
+    Returns:
+        list: Influence names.
+    """
+    names = list(sparse_weights)
+    blocks = [np.asarray(sparse_weights[inf]["vw"], dtype=np.float64) for inf in names]
+    sizes = np.array([block.size for block in blocks], dtype=np.int64)
+    if not sizes.sum():
+        return []
+
+    values = np.concatenate(blocks + [np.zeros(1)])
+    starts = np.r_[0, np.cumsum(sizes)[:-1]]
+    block_max = np.maximum.reduceat(values, starts)
+
+    return [name for name, size, peak in zip(names, sizes, block_max) if size and peak > tolerance]
+
+
+def health_report(sparse_weights, vtx_count, inf_names, max_influences=4, tolerance=TOLERANCE, normalize_tolerance=1e-3,
+                  duplicate_threshold=0.999, exists=None, chunk_size=CHUNK_SIZE):
+    """
+    Validate the weights of a skin with array math.
+
+    Args:
+        sparse_weights (dict): Influence name -> {"ix": vertex indices, "vw": weights}.
+        vtx_count (int): Number of vertices.
+        inf_names (list): Influences of the skinCluster.
+        max_influences (int, optional): Influence budget per vertex. None skips the check.
+        tolerance (float): Weights below or equal to this value count as zero.
+        normalize_tolerance (float): Allowed deviation of the vertex weight sums from 1.
+        duplicate_threshold (float): Cosine similarity of two influence weight columns above which they are reported
+                                     as near duplicates.
+        exists (callable, optional): exists(name) -> bool, to report weights on missing joints (e.g. cmds.objExists).
+        chunk_size (int): Number of vertices accumulated at a time for the duplicate check.
+
+    Returns:
+        dict: "unweighted", "unnormalized" and "over_budget" vertex index arrays, "unused" influences (no weight
+              above tolerance), "missing" weighted influences that do not exist, "duplicates" as
+              (influence, influence, similarity) tuples and "max_count", the most influences on a vertex.
+    """
+    names = list(inf_names) + [inf for inf in sparse_weights if inf not in inf_names]
+    inf_map = {name: i for i, name in enumerate(names)}
+
+    blocks = [(inf_map[inf], np.asarray(block["ix"], dtype=np.int64), np.asarray(block["vw"], dtype=np.float64))
+              for inf, block in sparse_weights.items()]
+    if blocks:
+        influences = np.concatenate([np.full(ix.size, col, dtype=np.int64) for col, ix, _ in blocks])
+        vertices = np.concatenate([ix for _, ix, _ in blocks])
+        weights = np.concatenate([vw for _, _, vw in blocks])
+    else:
+        influences = vertices = np.zeros(0, dtype=np.int64)
+        weights = np.zeros(0, dtype=np.float64)
+
+    valid = (vertices >= 0) & (vertices < vtx_count) & (weights > tolerance)
+    influences, vertices, weights = influences[valid], vertices[valid], weights[valid]
+
+    sums = np.bincount(vertices, weights=weights, minlength=vtx_count)
+    counts = np.bincount(vertices, minlength=vtx_count)
+
+    inf_max = np.zeros(len(names))
+    np.maximum.at(inf_max, influences, weights)
+    weighted = np.flatnonzero(inf_max > tolerance)
+
+    report = {
+        "vertices": vtx_count,
+        "unweighted": np.flatnonzero(sums <= tolerance),
+        "unnormalized": np.flatnonzero((np.abs(sums - 1.0) > normalize_tolerance) & (sums > tolerance)),
+        "over_budget": np.flatnonzero(counts > max_influences) if max_influences else np.zeros(0, dtype=np.int64),
+        "max_count": int(counts.max()) if vtx_count else 0,
+        "unused": [name for i, name in enumerate(inf_names) if inf_max[i] <= tolerance],
+        "missing": [names[i] for i in weighted if exists is not None and not exists(names[i])],
+        "duplicates": [],
+    }
+
+    # Gram matrix of the weighted columns, accumulated over vertex chunks
+    if weighted.size > 1:
+        column = np.full(len(names), -1, dtype=np.int64)
+        column[weighted] = np.arange(weighted.size)
+        order = np.argsort(vertices, kind="stable")
+        vertices, influences, weights = vertices[order], column[influences[order]], weights[order]
+
+        gram = np.zeros((weighted.size, weighted.size))
+        bounds = np.searchsorted(vertices, np.arange(0, vtx_count + chunk_size, chunk_size))
+        for start, (lo, hi) in enumerate(zip(bounds[:-1], bounds[1:])):
+            if lo == hi:
+                continue
+            chunk = np.zeros((chunk_size, weighted.size))
+            chunk[vertices[lo:hi] - start * chunk_size, influences[lo:hi]] = weights[lo:hi]
+            gram += chunk.T @ chunk
+
+        norms = np.sqrt(np.diag(gram))
+        similarity = gram / np.outer(norms, norms)
+        first, second = np.nonzero(np.triu(similarity, k=1) >= duplicate_threshold)
+        report["duplicates"] = [(names[weighted[i]], names[weighted[j]], float(similarity[i, j])) for i, j in zip(first, second)]
+
+    return report
+
+
+def compress_sparse(sparse_weights, vtx_count, max_influences=None, quantize=False, decimals=DECIMALS):
+    """
+    Lossy compression of the sparse blocks of a skin: keep the max_influences biggest weights per vertex, renormalize
+    each vertex to its original weight sum and optionally quantize the weights to uint16 steps (1 / QUANTIZE_SCALE),
+    pushing the rounding residual to the biggest weight so the sums stay exact.
+
+    Args:
+        sparse_weights (dict): Influence name -> {"ix": vertex indices, "vw": weights}.
+        vtx_count (int): Number of vertices.
+        max_influences (int, optional): Maximum number of influences per vertex. Defaults to no limit.
+        quantize (bool): If True the weights are multiples of 1 / QUANTIZE_SCALE, otherwise rounded to decimals.
+        decimals (int): Number of decimals kept when not quantizing.
+
+    Returns:
+        tuple: (sparse_weights, report). The new blocks as NumPy arrays (influence order preserved, empty influences
+               removed) and a dictionary with the "max_error" / "rms_error" per vertex (biggest absolute weight change
+               of each vertex), "vertices", "entries_before" and "entries_after".
+    """
+    inf_names = list(sparse_weights)
+    ix_blocks = [np.asarray(sparse_weights[inf]["ix"], dtype=np.int64) for inf in inf_names]
+    vw_blocks = [np.asarray(sparse_weights[inf]["vw"], dtype=np.float64) for inf in inf_names]
+    counts = [block.size for block in ix_blocks]
+
+    report = {"vertices": 0, "entries_before": int(sum(counts)), "entries_after": 0, "max_error": 0.0, "rms_error": 0.0}
+    if not report["entries_before"]:
+        return {}, report
+
+    vertices = np.concatenate(ix_blocks)
+    influences = np.repeat(np.arange(len(inf_names)), counts)
+    weights = np.concatenate(vw_blocks)
+
+    valid = (vertices >= 0) & (vertices < vtx_count)
+    vertices, influences, weights = vertices[valid], influences[valid], weights[valid]
+
+    # Vertex major, biggest weight first
+    order = np.lexsort((-weights, vertices))
+    vertices, influences, weights = vertices[order], influences[order], weights[order]
+
+    starts = np.flatnonzero(np.r_[True, vertices[1:] != vertices[:-1]])
+    group_sizes = np.diff(np.r_[starts, vertices.size])
+    rank = np.arange(vertices.size) - np.repeat(starts, group_sizes)
+
+    keep = rank < max_influences if max_influences else np.ones(vertices.size, dtype=bool)
+    kept = np.where(keep, weights, 0.0)
+
+    original_sums = np.add.reduceat(weights, starts)
+    kept_sums = np.add.reduceat(kept, starts)
+    scale = np.divide(original_sums, kept_sums, out=np.ones_like(kept_sums), where=kept_sums > 0)
+    new_weights = kept * np.repeat(scale, group_sizes)
+
+    if quantize:
+        steps = np.round(new_weights * QUANTIZE_SCALE)
+        residual = np.round(original_sums * QUANTIZE_SCALE) - np.add.reduceat(steps, starts)
+        steps[starts] += residual
+        steps = np.clip(steps, 0, QUANTIZE_SCALE)
+        new_weights = steps / QUANTIZE_SCALE
+    else:
+        new_weights = round_weights(new_weights, decimals)
+
+    keep &= new_weights > 0
+
+    vertex_errors = np.maximum.reduceat(np.abs(weights - np.where(keep, new_weights, 0.0)), starts)
+
+    report.update({
+        "vertices": int(starts.size),
+        "entries_after": int(np.count_nonzero(keep)),
+        "max_error": float(vertex_errors.max()),
+        "rms_error": float(np.sqrt(np.mean(vertex_errors ** 2))),
+    })
+
+    vertices, influences, new_weights = vertices[keep], influences[keep], new_weights[keep]
+    order = np.lexsort((vertices, influences))
+    vertices, influences, new_weights = vertices[order], influences[order], new_weights[order]
+    bounds = np.searchsorted(influences, np.arange(len(inf_names) + 1))
+
+    compressed = {}
+    for inf_idx in np.flatnonzero(np.diff(bounds)):
+        start, end = bounds[inf_idx], bounds[inf_idx + 1]
+        compressed[inf_names[inf_idx]] = {"ix": vertices[start:end].astype(np.int32), "vw": new_weights[start:end]}
+
+    return compressed, report
+
+
+def merge_compression_reports(reports):
+    """
+    Combine the reports of compress_sparse (e.g. every skin of a character) into one.
+    """
+    merged = {"vertices": 0, "entries_before": 0, "entries_after": 0, "max_error": 0.0, "rms_error": 0.0}
+    squares = 0.0
+    for report in reports:
+        for key in ("vertices", "entries_before", "entries_after"):
+            merged[key] += report[key]
+        merged["max_error"] = max(merged["max_error"], report["max_error"])
+        squares += report["rms_error"] ** 2 * report["vertices"]
+
+    if merged["vertices"]:
+        merged["rms_error"] = float(np.sqrt(squares / merged["vertices"]))
+
+    return merged
+
+
+def sparse_decode_flat(sparse_weights, vtx_count, inf_names):
+    """
+    Get the flat buffer positions (getWeights / setWeights order) and values of the sparse blocks of a .skn file,
+    remapping the influences of the file to the inf_names order. Influences not in inf_names and vertex indices outside
+    [0, vtx_count) are ignored.
+
+    Args:
+        sparse_weights (dict): Influence name -> {"ix": vertex indices, "vw": weights}.
+        vtx_count (int): Number of vertices.
+        inf_names (list): Influence names, in the order of the destination buffer (scene influence order).
+
+    Returns:
+        tuple: (flat indices, values) as NumPy arrays, sorted by flat index.
+    """
+    num_infs = len(inf_names)
+    inf_map = {name: i for i, name in enumerate(inf_names)}
+
+    flat_indices = []
+    values = []
+    for inf_name, data_block in sparse_weights.items():
+        inf_idx = inf_map.get(inf_name)
+        if inf_idx is None:
+            continue
+        flat_indices.append(np.asarray(data_block["ix"], dtype=np.int64) * num_infs + inf_idx)
+        values.append(np.asarray(data_block["vw"], dtype=np.float64))
+
+    if not flat_indices:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.float64)
+
+    flat_indices = np.concatenate(flat_indices)
+    values = np.concatenate(values)
+    # A negative vertex index always gives a negative flat index, as inf_idx < num_infs
+    valid = (flat_indices >= 0) & (flat_indices < vtx_count * num_infs)
+    order = np.argsort(flat_indices[valid], kind="stable")
+
+    return flat_indices[valid][order], values[valid][order]
+
+
+def sparse_decode(sparse_weights, vtx_count, inf_names):
+    """
+    Scatter the sparse per influence blocks of a .skn file into a dense weight matrix.
+    Influences of the file that are not in inf_names are ignored.
+
+    Args:
+        sparse_weights (dict): Influence name -> {"ix": vertex indices, "vw": weights}.
+        vtx_count (int): Number of vertices.
+        inf_names (list): Influence names, one per column of the result (scene influence order).
+
+    Returns:
+        np.ndarray: Array of shape (vtx_count, len(inf_names)).
+    """
+    weights = np.zeros(vtx_count * len(inf_names), dtype=np.float64)
+    flat_indices, values = sparse_decode_flat(sparse_weights, vtx_count, inf_names)
+    weights[flat_indices] = values
+
+    return weights.reshape(vtx_count, len(inf_names))
+
+
+def sparse_decode_blend(sparse_blend, vtx_count):
+    """
+    Scatter the sparse blend weights block into one value per vertex.
+
+    Args:
+        sparse_blend (dict): {"ix": vertex indices, "vw": weights}.
+        vtx_count (int): Number of vertices.
+
+    Returns:
+        np.ndarray: Blend weight per vertex.
+    """
+    blend_weights = np.zeros(vtx_count, dtype=np.float64)
+    if sparse_blend:
+        blend_weights[np.asarray(sparse_blend["ix"], dtype=np.int64)] = np.asarray(sparse_blend["vw"], dtype=np.float64)
+
+    return blend_weights
+
+
+def _sparse_encode_loop(flat_weights, vtx_count, inf_names, tolerance=TOLERANCE):
+    """
+    Pure Python sparse encoding, kept as the reference for the benchmarks.
+    """
+    flat_weights = list(flat_weights)
+    sparse_weights = {}
+    stride = len(inf_names)
+
+    for inf_idx, inf_name in enumerate(inf_names):
+        j_indices = []
+        j_weights = []
+
+        for v_idx in range(vtx_count):
+            val = flat_weights[v_idx * stride + inf_idx]
+            if val > tolerance:
+                j_indices.append(v_idx)
+                j_weights.append(round(val, 5))
+
+        if j_indices:
+            sparse_weights[inf_name] = {
+                "ix": j_indices,
+                "vw": j_weights
+            }
+
+    return sparse_weights
+
+
+def synthetic_weights(vtx_count=50000, num_influences=300, influences_per_vertex=4, seed=0, start=0, stop=None):
+    """
+    Create a normalized weight matrix that looks like a production skin (few influences per vertex, neighbour vertices
+    sharing influences). Values only depend on the vertex index, so any vertex range can be generated on its own.
+
+    Args:
+        vtx_count (int): Number of vertices of the whole mesh.
+        num_influences (int): Number of influences.
+        influences_per_vertex (int): Number of non zero weights per vertex.
+        seed (int): Seed mixed in the generated values.
+        start (int): First vertex of the range to generate.
+        stop (int, optional): End of the range to generate. Defaults to vtx_count.
+
+    Returns:
+        np.ndarray: Array of shape (stop - start, num_influences).
+    """
+    stop = vtx_count if stop is None else stop
+    vertices = np.arange(start, stop, dtype=np.int64)
+    weights = np.zeros((vertices.size, num_influences), dtype=np.float64)
+
+    base = (vertices * num_influences // max(vtx_count, 1))[:, None]
+    columns = (base + np.arange(influences_per_vertex)[None, :]) % num_influences
+    values = ((vertices[:, None] * 2654435761 + np.arange(1, influences_per_vertex + 1)[None, :] * 40503 + seed) % 997 + 1).astype(np.float64)
+    values /= values.sum(axis=1, keepdims=True)
+
+    np.put_along_axis(weights, columns, values, axis=1)
+
+    return weights
+
+
+class SyntheticSkinCluster:
+    """
+    Stand-in for the OpenMaya weight queries of a skinCluster, returning synthetic weights for vertex ranges.
+    Used to benchmark the export paths without Maya.
+    """
+
+    def __init__(self, vtx_count=200000, num_influences=300, influences_per_vertex=4):
+        self.vtx_count = vtx_count
+        self.num_influences = num_influences
+        self.influences_per_vertex = influences_per_vertex
+
+    def influenceObjects(self):
+        return [f"joint{i:03d}_JNT" for i in range(self.num_influences)]
+
+    def getWeights(self, start=0, stop=None):
+        """
+        Flat weights of a vertex range, like MFnSkinCluster.getWeights on a vertex component.
+        """
+        return synthetic_weights(self.vtx_count, self.num_influences, self.influences_per_vertex, start=start, stop=stop).ravel()
+
+    def getBlendWeights(self, start=0, stop=None):
+        stop = self.vtx_count if stop is None else stop
+        return np.zeros(stop - start, dtype=np.float64)
+
+
+def benchmark_sparse_encode(vtx_count=50000, num_influences=300, influences_per_vertex=4, repeats=1):
+    """
+    Compare the Python loop export against the vectorized one on a synthetic mesh.
+
+    Args:
+        vtx_count (int): Number of vertices of the synthetic mesh.
+        num_influences (int): Number of influences of the synthetic skin.
+        influences_per_vertex (int): Number of non zero weights per vertex.
+        repeats (int): Number of timed runs, the best one is kept.
+
+    Returns:
+        dict: Timings in seconds, speedup and if both outputs are identical.
+    """
+    weights = synthetic_weights(vtx_count, num_influences, influences_per_vertex)
+    flat = weights.ravel().tolist()
+    inf_names = [f"joint{i:03d}_JNT" for i in range(num_influences)]
+
+    loop_time = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        reference = _sparse_encode_loop(flat, vtx_count, inf_names)
+        loop_time = min(loop_time, time.perf_counter() - start)
+
+    vectorized_time = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = sparse_encode(weights_matrix(flat, vtx_count, num_influences), inf_names)
+        vectorized_time = min(vectorized_time, time.perf_counter() - start)
+
+    report = {
+        "vertices": vtx_count,
+        "influences": num_influences,
+        "loop_seconds": loop_time,
+        "vectorized_seconds": vectorized_time,
+        "speedup": loop_time / vectorized_time if vectorized_time else float("inf"),
+        "identical": json.dumps(reference, separators=(",", ":")) == json.dumps(result, separators=(",", ":")),
+    }
+    print(f"Sparse encode {vtx_count} vertices x {num_influences} influences: "
+          f"loop {loop_time:.3f}s, vectorized {vectorized_time:.3f}s ({report['speedup']:.1f}x), identical: {report['identical']}")
+
+    return report
+
+
+def _sparse_decode_loop(sparse_weights, vtx_count, inf_names):
+    """
+    Pure Python dense assembly, kept as the reference for the benchmarks.
+    """
+    inf_map = {name: i for i, name in enumerate(inf_names)}
+    num_infs = len(inf_names)
+    full_weight_list = [0.0] * (vtx_count * num_infs)
+
+    for j_name, data_block in sparse_weights.items():
+        if j_name not in inf_map: continue
+        inf_idx = inf_map[j_name]
+        for v_idx, weight_val in zip(data_block["ix"], data_block["vw"]):
+            full_weight_list[(v_idx * num_infs) + inf_idx] = weight_val
+
+    return full_weight_list
+
+
+def benchmark_sparse_decode(file_path):
+    """
+    Compare the Python loop dense assembly against the vectorized flat scatter on every skinCluster of a .skn file.
+
+    Args:
+        file_path (str): Path to a .skn file.
+
+    Returns:
+        dict: Timings in seconds, speedup and if both dense buffers are identical.
+    """
+    with open(file_path, "r") as f:
+        data = json.load(f)
+
+    skins = [skin_data for skins_list in data.values() for skin_data in skins_list]
+
+    start = time.perf_counter()
+    reference = [_sparse_decode_loop(skin["sparse_weights"], skin["vertex_count"], skin["influences"]) for skin in skins]
+    loop_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    result = [sparse_decode_flat(skin["sparse_weights"], skin["vertex_count"], skin["influences"]) for skin in skins]
+    vectorized_time = time.perf_counter() - start
+
+    identical = True
+    for skin, dense_list, (flat_indices, values) in zip(skins, reference, result):
+        dense = np.zeros(len(dense_list), dtype=np.float64)
+        dense[flat_indices] = values
+        identical = identical and np.array_equal(dense, np.asarray(dense_list))
+
+    report = {
+        "skin_clusters": len(skins),
+        "loop_seconds": loop_time,
+        "vectorized_seconds": vectorized_time,
+        "speedup": loop_time / vectorized_time if vectorized_time else float("inf"),
+        "identical": identical,
+    }
+    print(f"Sparse decode {len(skins)} skinClusters: loop {loop_time:.3f}s, vectorized {vectorized_time:.3f}s "
+          f"({report['speedup']:.1f}x), identical: {report['identical']}")
+
+    return report
+
+
+def benchmark_chunked_export(vtx_count=200000, num_influences=300, influences_per_vertex=4, chunk_size=CHUNK_SIZE):
+    """
+    Compare peak memory and time of the full export (one dense getWeights) against the chunked export, using the
+    SyntheticSkinCluster stand-in for the OpenMaya weight queries.
+
+    Args:
+        vtx_count (int): Number of vertices of the synthetic mesh.
+        num_influences (int): Number of influences of the synthetic skin.
+        influences_per_vertex (int): Number of non zero weights per vertex.
+        chunk_size (int): Number of vertices queried at a time by the chunked export.
+
+    Returns:
+        dict: Peak memory in MB, timings in seconds and if both outputs are identical.
+    """
+    skin = SyntheticSkinCluster(vtx_count, num_influences, influences_per_vertex)
+    inf_names = skin.influenceObjects()
+
+    def run(function):
+        tracemalloc.start()
+        start = time.perf_counter()
+        result = function()
+        elapsed = time.perf_counter() - start
+        peak = tracemalloc.get_traced_memory()[1] / (1024.0 * 1024.0)
+        tracemalloc.stop()
+        return result, elapsed, peak
+
+    full, full_time, full_peak = run(lambda: sparse_encode(weights_matrix(skin.getWeights(), vtx_count, num_influences), inf_names))
+    chunked, chunked_time, chunked_peak = run(lambda: sparse_encode_chunked(skin.getWeights, vtx_count, inf_names, chunk_size))
+
+    identical = list(full) == list(chunked) and all(
+        full[inf]["ix"] == chunked[inf]["ix"].tolist() and full[inf]["vw"] == chunked[inf]["vw"].tolist() for inf in full
+    )
+
+    report = {
+        "vertices": vtx_count,
+        "influences": num_influences,
+        "chunk_size": chunk_size,
+        "full_peak_mb": full_peak,
+        "chunked_peak_mb": chunked_peak,
+        "full_seconds": full_time,
+        "chunked_seconds": chunked_time,
+        "identical": identical,
+    }
+    print(f"Export {vtx_count} vertices x {num_influences} influences: full {full_peak:.1f}MB / {full_time:.2f}s, "
+          f"chunked ({chunk_size}) {chunked_peak:.1f}MB / {chunked_time:.2f}s, identical: {identical}")
+
+    return report
+
+
+def benchmark_transfer(vtx_count=50000, num_influences=100, num_skins=4, influences_per_vertex=4, seed=0):
+    """
+    Compare transferring a stack of skins re-running the spatial searches per skin (what a copySkinWeights loop does)
+    against computing the closest point and mirror maps once and gathering every skin through them.
+
+    Args:
+        vtx_count (int): Number of vertices of the source and target meshes.
+        num_influences (int): Number of influences per skin.
+        num_skins (int): Number of skinClusters in the stack.
+        influences_per_vertex (int): Number of non zero weights per vertex.
+        seed (int): Random seed of the mesh positions.
+
+    Returns:
+        dict: Timings in seconds and if both paths give the same weights.
+    """
+    rng = np.random.default_rng(seed)
+    half = rng.random((vtx_count // 2, 3)) + [0.01, 0.0, 0.0]
+    source_points = np.concatenate([half, half * [-1.0, 1.0, 1.0]])
+    target_points = source_points + rng.normal(0.0, 0.001, source_points.shape)
+
+    inf_names = [f"{'LR'[i % 2]}_joint{i // 2:03d}_JNT" for i in range(num_influences)]
+    inf_mirror = mirror_influence_indices(inf_names)
+    skins = [synthetic_weights(len(source_points), num_influences, influences_per_vertex, seed=i) for i in range(num_skins)]
+
+    def transfer(source_weights, maps):
+        (indices, weights), (mirror_indices, found) = maps
+        result = transfer_dense(source_weights, indices, weights)
+        return mirror_dense(result, target_points, mirror_indices, inf_mirror, found=found)
+
+    def compute_maps():
+        return spatial.closest_point_map(source_points, target_points), spatial.mirror_map(target_points)
+
+    start = time.perf_counter()
+    per_skin = [transfer(weights, compute_maps()) for weights in skins]
+    per_skin_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    maps = compute_maps()
+    shared = [transfer(weights, maps) for weights in skins]
+    shared_time = time.perf_counter() - start
+
+    identical = all(np.array_equal(a, b) for a, b in zip(per_skin, shared))
+    print(f"Transfer {num_skins} skins x {len(source_points)} vertices: per skin search {per_skin_time:.2f}s, "
+          f"shared maps {shared_time:.2f}s ({per_skin_time / max(shared_time, 1e-9):.1f}x), identical: {identical}")
+
+    return {"per_skin_seconds": per_skin_time, "shared_seconds": shared_time, "identical": identical}
@@ -2,7 +2,11 @@ import maya.cmds as cmds
 import maya.api.OpenMaya as om
 from puiastreTools.utils import data_export
 from puiastreTools.utils.core import get_offset_matrix
+from puiastreTools.utils.core import NodeCache
 import sys
+import time
+
+COMPACT = True
 
 
 def leg_pv_spaceswitch(localHip, legPv, footCtl, root):
@@ -48,10 +52,168 @@ def leg_pv_spaceswitch(localHip, legPv, footCtl, root):
     cmds.connectAttr(f"{legPv}.spaceSwitchValue", f"{foot_trn}.blendAim1")
     cmds.connectAttr(f"{legPv}.automaticPoleVector", f"{pv_SPC}.blendParent1")
 
-def fk_switch(target, sources = [], default_rotate = 1, default_translate = 1, sources_names = [], pv=False):
+def fk_switch(target, sources = [], default_rotate = 1, default_translate = 1, sources_names = [], pv=False, compact=None):
     """
     Switch the matrix space of a target control to multiple source controls in Maya.
 
+    The compact network uses a single parentMatrix target fed by two choice nodes selected by the SpaceFollow enum:
+    the source matrix and its offset (stored as matrix attributes on the target group), so only the active source is
+    evaluated and no condition node is created per source. The masterWalk parentMatrix is shared through
+    core.NodeCache.
+
+    Args:
+        target (str): The name of the target control to switch space for.
+        sources (list, optional): A list of source controls to switch to. Defaults to [None].
+        default_value (float, optional): The default value for the follow attribute. Defaults to 1.
+        compact (bool, optional): Build the compact network, defaults to COMPACT. False builds the legacy one.
+    """
+    compact = COMPACT if compact is None else compact
+    if not compact:
+        return _fk_switch_legacy(target, sources, default_rotate, default_translate, sources_names, pv)
+
+    target_grp = target.replace("CTL", "GRP")
+    if not cmds.objExists(target):
+        target_grp = target
+    if not cmds.objExists(target_grp):
+        om.MGlobal.displayError(f"Target group '{target_grp}' does not exist.")
+        return
+
+    cmds.setAttr(f"{target_grp}.inheritsTransform", 0)
+
+    connections = cmds.listConnections(f"{target_grp}.offsetParentMatrix", plugs=True, source=True, destination=False)[0]
+
+    data_exporter = data_export.DataExport()
+    masterWalk_ctl = data_exporter.get_data("basic_structure", "masterWalk_CTL")
+
+    offset_masterwalk = get_offset_matrix(target_grp, masterWalk_ctl)
+
+    def create_masterwalk_space():
+        node = cmds.createNode("parentMatrix", name=target.replace("_CTL", "MasterwalkSpace_PM"), ss=True)
+        cmds.connectAttr(connections, f"{node}.inputMatrix")
+        cmds.connectAttr(f"{masterWalk_ctl}.worldMatrix[0]", f"{node}.target[0].targetMatrix")
+        cmds.setAttr(f"{node}.target[0].offsetMatrix", offset_masterwalk, type="matrix")
+        return node
+
+    parent_matrix_masterwalk = NodeCache.get("parentMatrix", (connections, f"{masterWalk_ctl}.worldMatrix[0]"), create_masterwalk_space,
+                                             settings={"offset": tuple(round(v, 6) for v in offset_masterwalk)})
+    parent_matrix_parents = cmds.createNode("parentMatrix", name=target.replace("_CTL", "Space_PM"), ss=True)
+    blend_matrix = cmds.createNode("blendMatrix", name=target.replace("_CTL", "Space_BMX"), ss=True)
+    cmds.addAttr(target, longName="SpaceSwitchSep", niceName = "Space Switches  ———", attributeType="enum", enumName="———", keyable=True)
+    cmds.setAttr(f"{target}.SpaceSwitchSep", channelBox=True, lock=True)
+    spaces = [src.split("_")[1] for src in sources]
+
+    # Source matrix and offset plugs of every space
+    source_plugs = []
+    offset_plugs = []
+    for z, driver in enumerate(sources):
+        source_plugs.append(driver if "." in driver else f"{driver}.worldMatrix[0]")
+
+        if pv:
+            matrix = cmds.getAttr(f"{driver}.worldInverseMatrix[0]")
+
+            def create_live_offset():
+                node = cmds.createNode("multMatrix", name=target.replace("_CTL", f"{spaces[z]}LiveOffset_MMX"), ss=True)
+                cmds.connectAttr(f"{connections}", f"{node}.matrixIn[0]")
+                cmds.setAttr(f"{node}.matrixIn[1]", matrix, type="matrix")
+                return node
+
+            multmatrix = NodeCache.get("multMatrix", (connections,), create_live_offset,
+                                       settings={"offset": tuple(round(v, 6) for v in matrix)})
+            offset_plugs.append(f"{multmatrix}.matrixSum")
+        else:
+            cmds.addAttr(target_grp, longName=f"spaceOffset{z}", dataType="matrix")
+            cmds.setAttr(f"{target_grp}.spaceOffset{z}", get_offset_matrix(target_grp, driver), type="matrix")
+            offset_plugs.append(f"{target_grp}.spaceOffset{z}")
+
+    if len(sources) > 1:
+        cmds.addAttr(target, longName="SpaceFollow", attributeType="enum", enumName=":".join(sources_names), keyable=True)
+
+        source_choice = cmds.createNode("choice", name=target.replace("_CTL", "SpaceSource_CHO"), ss=True)
+        offset_choice = cmds.createNode("choice", name=target.replace("_CTL", "SpaceOffset_CHO"), ss=True)
+        for choice, plugs in ((source_choice, source_plugs), (offset_choice, offset_plugs)):
+            cmds.connectAttr(f"{target}.SpaceFollow", f"{choice}.selector")
+            for i, plug in enumerate(plugs):
+                cmds.connectAttr(plug, f"{choice}.input[{i}]")
+
+        source_plugs = [f"{source_choice}.output"]
+        offset_plugs = [f"{offset_choice}.output"]
+
+    for z, (source_plug, offset_plug) in enumerate(zip(source_plugs, offset_plugs)):
+        cmds.connectAttr(source_plug, f"{parent_matrix_parents}.target[{z}].targetMatrix")
+        cmds.connectAttr(offset_plug, f"{parent_matrix_parents}.target[{z}].offsetMatrix")
+
+    cmds.addAttr(target, longName="TranslateValue", attributeType="float", min=0, max=1, defaultValue=default_translate, keyable=True)
+    cmds.addAttr(target, longName="RotateValue", attributeType="float", min=0, max=1, defaultValue=default_rotate, keyable=True)
+
+    cmds.connectAttr(connections, f"{parent_matrix_parents}.inputMatrix")
+    cmds.connectAttr(f"{parent_matrix_parents}.outputMatrix", f"{blend_matrix}.target[0].targetMatrix")
+    cmds.connectAttr(f"{parent_matrix_masterwalk}.outputMatrix", f"{blend_matrix}.inputMatrix")
+
+    cmds.connectAttr(f"{target}.RotateValue", f"{blend_matrix}.target[0].rotateWeight")
+    cmds.connectAttr(f"{target}.TranslateValue", f"{blend_matrix}.target[0].translateWeight")
+    cmds.setAttr(f"{blend_matrix}.target[0].scaleWeight", 0)
+    cmds.setAttr(f"{blend_matrix}.target[0].shearWeight", 0)
+    cmds.connectAttr(f"{blend_matrix}.outputMatrix", f"{target_grp}.offsetParentMatrix", force=True)
+
+def benchmark_fk_switch(sources, sources_names=None, targets=10, evaluations=200):
+    """
+    Build the legacy and the compact fk_switch on the same number of temporary targets driven by sources, then
+    compare the created node count and the time to re-evaluate the targets while switching spaces and moving the
+    first source. The temporary targets and their networks are deleted afterwards.
+
+    Args:
+        sources (list): Existing source controls.
+        sources_names (list, optional): Enum names, defaults to the sources.
+        targets (int): Number of targets per network.
+        evaluations (int): Number of timed evaluations.
+
+    Returns:
+        dict: "legacy" / "compact" -> {"nodes", "seconds"}.
+    """
+    sources_names = sources_names or list(sources)
+    start_value = cmds.getAttr(f"{sources[0]}.translateX")
+    results = {}
+
+    for label, compact in (("legacy", False), ("compact", True)):
+        NodeCache.clear()
+        scaffold = []
+        ctls = []
+        for i in range(targets):
+            compose = cmds.createNode("composeMatrix", name=f"benchmark{label.capitalize()}0{i}_CMT", ss=True)
+            grp = cmds.createNode("transform", name=f"benchmark{label.capitalize()}0{i}_GRP", ss=True)
+            ctl = cmds.createNode("transform", name=f"benchmark{label.capitalize()}0{i}_CTL", parent=grp, ss=True)
+            cmds.connectAttr(f"{compose}.outputMatrix", f"{grp}.offsetParentMatrix")
+            scaffold.extend([compose, grp])
+            ctls.append(ctl)
+
+        before = set(cmds.ls())
+        for ctl in ctls:
+            fk_switch(ctl, sources=sources, sources_names=sources_names, compact=compact)
+        created = [node for node in cmds.ls() if node not in before]
+
+        start = time.perf_counter()
+        for i in range(evaluations):
+            cmds.setAttr(f"{sources[0]}.translateX", start_value + (i % 10) * 0.01)
+            for ctl in ctls:
+                if len(sources) > 1:
+                    cmds.setAttr(f"{ctl}.SpaceFollow", i % len(sources))
+                cmds.getAttr(f"{ctl}.worldMatrix[0]")
+        results[label] = {"nodes": len(created), "seconds": time.perf_counter() - start}
+
+        cmds.setAttr(f"{sources[0]}.translateX", start_value)
+        cmds.delete([node for node in created + scaffold if cmds.objExists(node)])
+
+    NodeCache.clear()
+    om.MGlobal.displayInfo(f"fk_switch benchmark ({targets} targets, {len(sources)} sources): "
+                           f"legacy {results['legacy']['nodes']} nodes {results['legacy']['seconds']:.3f}s | "
+                           f"compact {results['compact']['nodes']} nodes {results['compact']['seconds']:.3f}s")
+
+    return results
+
+def _fk_switch_legacy(target, sources = [], default_rotate = 1, default_translate = 1, sources_names = [], pv=False):
+    """
+    Original fk_switch network: one condition node per source driving the parentMatrix target weights.
+
     Args:
         target (str): The name of the target control to switch space for.
         sources (list, optional): A list of source controls to switch to. Defaults to [None].
@@ -75,7 +237,18 @@ def fk_switch(target, sources = [], default_rotate = 1, default_translate = 1, s
     masterWalk_ctl = data_exporter.get_data("basic_structure", "masterWalk_CTL")
 
 
-    parent_matrix_masterwalk = cmds.createNode("parentMatrix", name=target.replace("_CTL", "MasterwalkSpace_PM"), ss=True)
+    offset_masterwalk = get_offset_matrix(target_grp, masterWalk_ctl)
+
+    def create_masterwalk_space():
+        node = cmds.createNode("parentMatrix", name=target.replace("_CTL", "MasterwalkSpace_PM"), ss=True)
+        cmds.connectAttr(connections, f"{node}.inputMatrix")
+        cmds.connectAttr(f"{masterWalk_ctl}.worldMatrix[0]", f"{node}.target[0].targetMatrix")
+        cmds.setAttr(f"{node}.target[0].offsetMatrix", offset_masterwalk, type="matrix")
+        return node
+
+    # Same input and same offset in masterWalk space give the same matrix, share it (core.NodeCache)
+    parent_matrix_masterwalk = NodeCache.get("parentMatrix", (connections, f"{masterWalk_ctl}.worldMatrix[0]"), create_masterwalk_space,
+                                             settings={"offset": tuple(round(v, 6) for v in offset_masterwalk)})
     parent_matrix_parents = cmds.createNode("parentMatrix", name=target.replace("_CTL", "Space_PM"), ss=True)
     blend_matrix = cmds.createNode("blendMatrix", name=target.replace("_CTL", "Space_BMX"), ss=True)
     cmds.addAttr(target, longName="SpaceSwitchSep", niceName = "Space Switches  ———", attributeType="enum", enumName="———", keyable=True)
@@ -102,13 +275,9 @@ def fk_switch(target, sources = [], default_rotate = 1, default_translate = 1, s
     cmds.addAttr(target, longName="RotateValue", attributeType="float", min=0, max=1, defaultValue=default_rotate, keyable=True)
 
     cmds.connectAttr(connections, f"{parent_matrix_parents}.inputMatrix")
-    cmds.connectAttr(connections, f"{parent_matrix_masterwalk}.inputMatrix")
     cmds.connectAttr(f"{parent_matrix_parents}.outputMatrix", f"{blend_matrix}.target[0].targetMatrix")
     cmds.connectAttr(f"{parent_matrix_masterwalk}.outputMatrix", f"{blend_matrix}.inputMatrix")
 
-    offset_masterwalk = get_offset_matrix(target_grp, masterWalk_ctl)
-    cmds.connectAttr(f"{masterWalk_ctl}.worldMatrix[0]", f"{parent_matrix_masterwalk}.target[0].targetMatrix")
-    cmds.setAttr(f"{parent_matrix_masterwalk}.target[0].offsetMatrix", offset_masterwalk, type="matrix")
     for z, driver in enumerate(sources):
         off_matrix = get_offset_matrix(target_grp, driver)
         if "." in driver:
@@ -117,10 +286,16 @@ def fk_switch(target, sources = [], default_rotate = 1, default_translate = 1, s
             cmds.connectAttr(f"{driver}.worldMatrix[0]", f"{parent_matrix_parents}.target[{z}].targetMatrix") 
 
         if pv:
-            multmatrix = cmds.createNode("multMatrix", name=target.replace("_CTL", f"{spaces[z]}LiveOffset_MMX"), ss=True)
-            cmds.connectAttr(f"{connections}", f"{multmatrix}.matrixIn[0]")
             matrix = cmds.getAttr(f"{driver}.worldInverseMatrix[0]")
-            cmds.setAttr(f"{multmatrix}.matrixIn[1]", matrix, type="matrix")
+
+            def create_live_offset():
+                node = cmds.createNode("multMatrix", name=target.replace("_CTL", f"{spaces[z]}LiveOffset_MMX"), ss=True)
+                cmds.connectAttr(f"{connections}", f"{node}.matrixIn[0]")
+                cmds.setAttr(f"{node}.matrixIn[1]", matrix, type="matrix")
+                return node
+
+            multmatrix = NodeCache.get("multMatrix", (connections,), create_live_offset,
+                                       settings={"offset": tuple(round(v, 6) for v in matrix)})
             cmds.connectAttr(f"{multmatrix}.matrixSum", f"{parent_matrix_parents}.target[{z}].offsetMatrix")
         else:
             cmds.setAttr(f"{parent_matrix_parents}.target[{z}].offsetMatrix", off_matrix, type="matrix")
@@ -0,0 +1,262 @@
+"""
+Spatial lookups on vertex positions, in plain NumPy (no Maya imports) so they can be run and benchmarked headless.
+
+KDTree is a static, balanced tree built with median splits. Queries are batched: all the query points walk the tree
+level by level as (query, node) pairs, pruning the nodes whose bounding box is further than the best distance found
+so far, so a whole mesh is resolved with a handful of array operations per level instead of a Python loop per vertex.
+"""
+
+import time
+
+import numpy as np
+
+LEAF_SIZE = 16
+QUERY_CHUNK = 32768
+
+
+class KDTree:
+    """
+    Balanced KD-tree over a (N, 3) point array, stored in heap layout (children of node i are 2i + 1 and 2i + 2).
+    """
+
+    def __init__(self, points, leaf_size=LEAF_SIZE):
+        self.points = np.ascontiguousarray(points, dtype=np.float64).reshape(-1, 3)
+        count = len(self.points)
+        if not count:
+            raise ValueError("KDTree needs at least one point.")
+
+        self.depth = max(int(np.ceil(np.log2(max(count / float(leaf_size), 1.0)))), 0)
+        self.num_leaves = 1 << self.depth
+        num_nodes = 2 * self.num_leaves - 1
+
+        self.lo = np.zeros((num_nodes, 3))
+        self.hi = np.zeros((num_nodes, 3))
+        self.axis = np.zeros(num_nodes, dtype=np.int64)
+        self.split = np.zeros(num_nodes)
+
+        leaves = [None] * self.num_leaves
+        stack = [(0, 0, np.arange(count))]
+        while stack:
+            node, level, indices = stack.pop()
+            node_points = self.points[indices]
+            if indices.size:
+                self.lo[node] = node_points.min(axis=0)
+                self.hi[node] = node_points.max(axis=0)
+            else:
+                self.lo[node] = np.inf
+                self.hi[node] = -np.inf
+
+            if level == self.depth:
+                leaves[node - (self.num_leaves - 1)] = indices
+                continue
+
+            axis = int(np.argmax(self.hi[node] - self.lo[node])) if indices.size else 0
+            half = indices.size // 2
+            if indices.size:
+                order = np.argpartition(node_points[:, axis], half) if half else np.arange(indices.size)
+                indices = indices[order]
+                self.split[node] = self.points[indices[half], axis] if half < indices.size else np.inf
+            self.axis[node] = axis
+
+            stack.append((2 * node + 1, level + 1, indices[:half]))
+            stack.append((2 * node + 2, level + 1, indices[half:]))
+
+        # Leaves padded to the same size, missing slots point to -1 and sit at infinity
+        self.leaf_size = max(max(leaf.size for leaf in leaves), 1)
+        self.leaf_indices = np.full((self.num_leaves, self.leaf_size), -1, dtype=np.int64)
+        for i, leaf in enumerate(leaves):
+            self.leaf_indices[i, :leaf.size] = leaf
+        self.leaf_points = np.where(
+            (self.leaf_indices >= 0)[..., None], self.points[np.maximum(self.leaf_indices, 0)], np.inf
+        )
+
+    def _box_distance(self, queries, nodes):
+        delta = np.maximum(self.lo[nodes] - queries, 0.0) + np.maximum(queries - self.hi[nodes], 0.0)
+        return np.einsum("ij,ij->i", delta, delta)
+
+    def _query_chunk(self, queries, k):
+        count = len(queries)
+
+        # Upper bound of the k-th distance: the leaf the query falls in, plus the next ones if it has less than k points
+        nodes = np.zeros(count, dtype=np.int64)
+        for _ in range(self.depth):
+            go_right = queries[np.arange(count), self.axis[nodes]] > self.split[nodes]
+            nodes = 2 * nodes + 1 + go_right
+        leaves = nodes - (self.num_leaves - 1)
+        candidates = np.concatenate([self.leaf_points[(leaves + i) % self.num_leaves] for i in range(-(-k // self.leaf_size))], axis=1)
+        distances = np.sum((candidates - queries[:, None, :]) ** 2, axis=2)
+        bound = np.partition(distances, k - 1, axis=1)[:, k - 1] if distances.shape[1] >= k else np.full(count, np.inf)
+        # Box and point distances are summed in a different order, keep the ties
+        bound = bound * (1.0 + 1e-9) + 1e-12
+
+        # Walk the tree with (query, node) pairs, dropping the boxes further than the bound
+        pair_queries = np.arange(count)
+        pair_nodes = np.zeros(count, dtype=np.int64)
+        for _ in range(self.depth):
+            keep = self._box_distance(queries[pair_queries], pair_nodes) <= bound[pair_queries]
+            pair_queries, pair_nodes = pair_queries[keep], pair_nodes[keep]
+            pair_queries = np.repeat(pair_queries, 2)
+            pair_nodes = (2 * np.repeat(pair_nodes, 2) + 1) + np.tile([0, 1], pair_nodes.size)
+
+        keep = self._box_distance(queries[pair_queries], pair_nodes) <= bound[pair_queries]
+        pair_queries, pair_leaves = pair_queries[keep], pair_nodes[keep] - (self.num_leaves - 1)
+
+        # Distances to every point of the surviving leaves, reduced to the k smallest of each leaf before merging
+        candidate_indices = self.leaf_indices[pair_leaves]
+        candidate_distances = np.sum((self.leaf_points[pair_leaves] - queries[pair_queries][:, None, :]) ** 2, axis=2)
+        if self.leaf_size > k:
+            smallest = np.argpartition(candidate_distances, k - 1, axis=1)[:, :k]
+            candidate_indices = np.take_along_axis(candidate_indices, smallest, axis=1)
+            candidate_distances = np.take_along_axis(candidate_distances, smallest, axis=1)
+        candidate_queries = np.repeat(pair_queries, candidate_indices.shape[1])
+        candidate_indices, candidate_distances = candidate_indices.ravel(), candidate_distances.ravel()
+
+        valid = candidate_indices >= 0
+        candidate_indices, candidate_distances, candidate_queries = candidate_indices[valid], candidate_distances[valid], candidate_queries[valid]
+
+        order = np.lexsort((candidate_indices, candidate_distances, candidate_queries))
+        candidate_indices, candidate_distances, candidate_queries = candidate_indices[order], candidate_distances[order], candidate_queries[order]
+        starts = np.searchsorted(candidate_queries, np.arange(count))
+        rank = np.arange(candidate_queries.size) - starts[candidate_queries]
+        first = rank < k
+
+        result_indices = np.full((count, k), -1, dtype=np.int64)
+        result_distances = np.full((count, k), np.inf)
+        result_indices[candidate_queries[first], rank[first]] = candidate_indices[first]
+        result_distances[candidate_queries[first], rank[first]] = candidate_distances[first]
+
+        return np.sqrt(result_distances), result_indices
+
+    def query(self, queries, k=1, chunk_size=QUERY_CHUNK):
+        """
+        Exact k nearest neighbours of a batch of points.
+
+        Args:
+            queries (np.ndarray): (M, 3) query points.
+            k (int): Number of neighbours.
+            chunk_size (int): Number of queries resolved at a time, bounds the memory of the pair arrays.
+
+        Returns:
+            tuple: (distances, indices), (M, k) arrays sorted by distance. Missing neighbours (k bigger than the
+                   point count) are -1 / inf.
+        """
+        queries = np.ascontiguousarray(queries, dtype=np.float64).reshape(-1, 3)
+        distances = np.empty((len(queries), k))
+        indices = np.empty((len(queries), k), dtype=np.int64)
+
+        for start in range(0, len(queries), chunk_size):
+            stop = min(start + chunk_size, len(queries))
+            distances[start:stop], indices[start:stop] = self._query_chunk(queries[start:stop], k)
+
+        return distances, indices
+
+
+def closest_point_map(source_points, target_points, tree=None):
+    """
+    Closest source vertex of every target vertex.
+
+    Args:
+        source_points (np.ndarray): (N, 3) source positions.
+        target_points (np.ndarray): (M, 3) target positions.
+        tree (KDTree, optional): Tree of the source points, built if not given.
+
+    Returns:
+        tuple: (indices, weights) as (M, 1) arrays, the weights being all 1.
+    """
+    tree = tree or KDTree(source_points)
+    _, indices = tree.query(target_points, k=1)
+    return indices, np.ones(indices.shape)
+
+
+def interpolation_map(source_points, target_points, k=4, tree=None, epsilon=1e-8):
+    """
+    Inverse distance weighting of the k closest source vertices of every target vertex, normalized per target vertex.
+    A target vertex sitting on a source vertex takes it with weight 1.
+
+    Args:
+        source_points (np.ndarray): (N, 3) source positions.
+        target_points (np.ndarray): (M, 3) target positions.
+        k (int): Number of source vertices blended.
+        tree (KDTree, optional): Tree of the source points, built if not given.
+        epsilon (float): Distance under which a target vertex is considered on top of a source vertex.
+
+    Returns:
+        tuple: (indices, weights) as (M, k) arrays.
+    """
+    tree = tree or KDTree(source_points)
+    k = min(k, len(tree.points))
+    distances, indices = tree.query(target_points, k=k)
+
+    weights = 1.0 / np.maximum(distances, epsilon) ** 2
+    on_vertex = distances[:, 0] <= epsilon
+    weights[on_vertex] = 0.0
+    weights[on_vertex, 0] = 1.0
+    weights /= weights.sum(axis=1, keepdims=True)
+
+    return indices, weights
+
+
+def mirror_map(points, axis=0, tolerance=None, tree=None):
+    """
+    Vertex symmetry across a plane through the origin: the closest vertex to the mirrored position of every vertex.
+
+    Args:
+        points (np.ndarray): (N, 3) positions.
+        axis (int): Axis normal to the mirror plane, 0 for the YZ plane.
+        tolerance (float, optional): Maximum distance for a vertex to have a mirror. Defaults to always taking the
+                                     closest vertex (like copySkinWeights).
+        tree (KDTree, optional): Tree of the points, built if not given.
+
+    Returns:
+        tuple: (mirror indices, found) arrays, found being False for the vertices further than the tolerance.
+    """
+    points = np.asarray(points, dtype=np.float64).reshape(-1, 3)
+    tree = tree or KDTree(points)
+    mirrored = points.copy()
+    mirrored[:, axis] *= -1.0
+
+    distances, indices = tree.query(mirrored, k=1)
+    found = distances[:, 0] <= tolerance if tolerance is not None else np.ones(len(points), dtype=bool)
+
+    return indices[:, 0], found
+
+
+def _brute_force_query(points, queries, k=1):
+    distances = np.sum((queries[:, None, :] - points[None, :, :]) ** 2, axis=2)
+    indices = np.argsort(distances, axis=1, kind="stable")[:, :k]
+    return np.sqrt(np.take_along_axis(distances, indices, axis=1)), indices
+
+
+def benchmark_kdtree(source_count=100000, target_count=100000, k=4, seed=0):
+    """
+    Time the KD-tree build and batched query on random points, and check a sample against brute force.
+
+    Args:
+        source_count (int): Number of source points.
+        target_count (int): Number of query points.
+        k (int): Number of neighbours.
+        seed (int): Random seed.
+
+    Returns:
+        dict: Build / query seconds and if the sample matches the brute force distances.
+    """
+    rng = np.random.default_rng(seed)
+    source = rng.random((source_count, 3))
+    target = rng.random((target_count, 3))
+
+    start = time.perf_counter()
+    tree = KDTree(source)
+    build_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    distances, _ = tree.query(target, k=k)
+    query_time = time.perf_counter() - start
+
+    sample = target[:500]
+    expected, _ = _brute_force_query(source, sample, k)
+    matches = bool(np.allclose(distances[:500], expected))
+
+    print(f"KDTree {source_count} points: build {build_time:.2f}s | {target_count} queries (k={k}) {query_time:.2f}s | "
+          f"matches brute force: {matches}")
+
+    return {"build_seconds": build_time, "query_seconds": query_time, "matches": matches}
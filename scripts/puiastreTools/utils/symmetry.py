@@ -0,0 +1,158 @@
+"""
+Vertex symmetry maps (L <-> R vertex correspondence) cached per mesh topology.
+
+A map is keyed by a hash of the topology (polygon vertex counts and connects), the rest positions, the mirror axis and
+the tolerance, so it is only recomputed when the model changes. Maps are kept in memory for the session and persisted
+as .npz files in a "symmetry" folder next to the asset skinning file.
+"""
+
+import hashlib
+import os
+
+import maya.api.OpenMaya as om
+import numpy as np
+
+from puiastreTools.utils import core
+from puiastreTools.utils import spatial
+
+FOLDER_NAME = "symmetry"
+POSITION_DECIMALS = 4
+
+_cache = {}
+
+
+def topology_hash(vertex_counts, vertex_indices):
+    """
+    Hash of a mesh topology, from MFnMesh.getVertices (polygon vertex counts and polygon connects).
+    """
+    digest = hashlib.sha1()
+    digest.update(np.asarray(vertex_counts, dtype=np.int32).tobytes())
+    digest.update(np.asarray(vertex_indices, dtype=np.int32).tobytes())
+    return digest.hexdigest()
+
+
+def positions_hash(points, decimals=POSITION_DECIMALS):
+    """
+    Hash of rest positions rounded to decimals, so float noise does not invalidate the map.
+    """
+    rounded = np.round(np.asarray(points, dtype=np.float64), decimals) + 0.0
+    return hashlib.sha1(rounded.tobytes()).hexdigest()
+
+
+def map_key(topology, positions, axis=0, tolerance=None):
+    return hashlib.sha1(f"{topology}:{positions}:{axis}:{tolerance}".encode("utf-8")).hexdigest()[:16]
+
+
+def compute_map(points, axis=0, tolerance=None):
+    """
+    Symmetry map of a point array (see spatial.mirror_map).
+
+    Returns:
+        tuple: (mirror indices, found) arrays.
+    """
+    return spatial.mirror_map(points, axis=axis, tolerance=tolerance)
+
+
+def save_map(file_path, mirror_indices, found, **info):
+    folder = os.path.dirname(file_path)
+    if folder and not os.path.isdir(folder):
+        os.makedirs(folder)
+    np.savez_compressed(file_path, mirror_indices=mirror_indices.astype(np.int32), found=found, **info)
+
+
+def load_map(file_path):
+    with np.load(file_path) as data:
+        return data["mirror_indices"].astype(np.int64), data["found"].astype(bool)
+
+
+def cache_folder():
+    """
+    Folder where the maps are persisted, next to the skinning file of the current asset. None if no asset is loaded.
+    """
+    skinning_path = core.DataManager.get_skinning_data()
+    if not skinning_path:
+        return None
+    return os.path.join(os.path.dirname(skinning_path), FOLDER_NAME)
+
+
+def _rest_path(shape):
+    """
+    Dag path of the rest shape: the intermediate (Orig) shape of a deformed mesh, the shape itself otherwise.
+    """
+    sel = om.MSelectionList()
+    sel.add(shape)
+    dag_path = sel.getDagPath(0)
+    if dag_path.node().hasFn(om.MFn.kTransform):
+        dag_path.extendToShape()
+
+    transform = om.MFnDagNode(om.MFnDagNode(dag_path).parent(0))
+    for i in range(transform.childCount()):
+        child = transform.child(i)
+        if child.hasFn(om.MFn.kMesh) and om.MFnDagNode(child).isIntermediateObject:
+            rest = om.MDagPath.getAPathTo(child)
+            if om.MFnMesh(rest).numVertices == om.MFnMesh(dag_path).numVertices:
+                return rest
+
+    return dag_path
+
+
+def rest_points(shape):
+    """
+    Object space rest positions of a mesh as a (N, 3) array.
+    """
+    return _mesh_points(om.MFnMesh(_rest_path(shape)))
+
+
+def _mesh_points(fn_mesh, space=om.MSpace.kObject):
+    # MPointArray converts straight to a (N, 4) homogeneous array, no Python loop over the MPoints
+    return np.array(fn_mesh.getPoints(space), dtype=np.float64).reshape(-1, 4)[:, :3]
+
+
+def mesh_symmetry(shape, axis=0, tolerance=None, persist=True):
+    """
+    Get the symmetry map of a mesh, computed on its object space rest positions only when the topology or the rest
+    positions changed.
+
+    Args:
+        shape (str): Mesh shape or transform.
+        axis (int): Axis normal to the mirror plane, 0 for YZ.
+        tolerance (float, optional): Maximum distance for a vertex to have a mirror. Defaults to the closest vertex.
+        persist (bool): Read / write the map in the asset symmetry folder.
+
+    Returns:
+        tuple: (mirror indices, found) arrays, one entry per vertex.
+    """
+    rest_path = _rest_path(shape)
+    fn_mesh = om.MFnMesh(rest_path)
+
+    vertex_counts, vertex_indices = fn_mesh.getVertices()
+    points = _mesh_points(fn_mesh)
+
+    key = map_key(topology_hash(vertex_counts, vertex_indices), positions_hash(points), axis, tolerance)
+    if key in _cache:
+        return _cache[key]
+
+    folder = cache_folder() if persist else None
+    mesh_name = rest_path.partialPathName().split("|")[-1].replace(":", "_")
+    file_path = os.path.join(folder, f"{mesh_name}_{key}.npz") if folder else None
+
+    if file_path and os.path.exists(file_path):
+        _cache[key] = load_map(file_path)
+        return _cache[key]
+
+    _cache[key] = compute_map(points, axis, tolerance)
+
+    if file_path:
+        try:
+            save_map(file_path, *_cache[key], axis=axis)
+        except OSError as e:
+            om.MGlobal.displayWarning(f"Could not save the symmetry map of {mesh_name}: {e}")
+
+    return _cache[key]
+
+
+def clear_cache():
+    """
+    Forget the maps kept in memory (the persisted files are kept).
+    """
+    _cache.clear()
@@ -0,0 +1,77 @@
+"""
+Headless check of the vectorized de Boor basis against the scalar implementation.
+maya.cmds, maya.api.OpenMaya and puiastreTools.utils.core are stubbed (the basis is pure Python / NumPy), so it runs
+with a plain pytest outside of Maya. The stubs only live for the tests of this module.
+"""
+
+import importlib
+import os
+import sys
+import types
+
+import numpy as np
+import pytest
+
+SCRIPTS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "scripts")
+MODULE_NAME = "puiastreTools.utils.de_boor_core_002"
+
+
+def _stub_module(monkeypatch, name, **attributes):
+    module = types.ModuleType(name)
+    module.__dict__.update(attributes)
+    monkeypatch.setitem(sys.modules, name, module)
+    return module
+
+
+@pytest.fixture(scope="module")
+def de_boor_core():
+    """
+    Import de_boor_core_002 against stub modules, the stubs and the stubbed import are removed after the module.
+    """
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        monkeypatch.syspath_prepend(SCRIPTS_PATH)
+
+        maya = _stub_module(monkeypatch, "maya")
+        maya.cmds = _stub_module(monkeypatch, "maya.cmds")
+        maya.api = _stub_module(monkeypatch, "maya.api")
+        maya.api.OpenMaya = _stub_module(monkeypatch, "maya.api.OpenMaya",
+                                         MFnNurbsCurve=types.SimpleNamespace(kOpen=1, kPeriodic=3))
+        _stub_module(monkeypatch, "puiastreTools.utils.core", NodeCache=types.SimpleNamespace(clear=lambda: None))
+        monkeypatch.delitem(sys.modules, MODULE_NAME, raising=False)
+
+        yield importlib.import_module(MODULE_NAME)
+
+        # Drop the module built on the stubs, and its attribute on the package, the undo restores any earlier import
+        sys.modules.pop(MODULE_NAME, None)
+        if hasattr(sys.modules.get("puiastreTools.utils"), "de_boor_core_002"):
+            delattr(sys.modules["puiastreTools.utils"], "de_boor_core_002")
+
+
+PARAMS = [i / 100 for i in range(101)] + [0.25 + 1e-9, 0.999999, 1.0]
+
+
+@pytest.mark.parametrize("kv_type", ["open", "periodic"])
+@pytest.mark.parametrize("n, d", [(4, 1), (4, 2), (6, 3), (9, 3), (7, 5)])
+def test_basis_matches_scalar(de_boor_core, kv_type, n, d):
+    kv, cvs = de_boor_core.knot_vector(kv_type, list(range(n)), d)
+
+    basis = de_boor_core.de_boor_basis(len(cvs), d, PARAMS, kv)
+    scalar = np.array([de_boor_core.de_boor(len(cvs), d, t, kv) for t in PARAMS])
+
+    assert basis.shape == scalar.shape
+    np.testing.assert_allclose(basis, scalar, rtol=0, atol=1e-12)
+
+
+@pytest.mark.parametrize("kv_type", ["open", "periodic"])
+def test_basis_end_parameter(de_boor_core, kv_type):
+    kv, cvs = de_boor_core.knot_vector(kv_type, list(range(6)), 3)
+
+    end = de_boor_core.de_boor_basis(len(cvs), 3, [1.0], kv)[0]
+
+    np.testing.assert_array_equal(end, de_boor_core.de_boor(len(cvs), 3, 1.0, kv))
+    assert end[-1] == 1.0 and end.sum() == 1.0
+
+
+def test_compare_basis_with_scalar(de_boor_core):
+    for kv_type in (de_boor_core.OPEN, de_boor_core.PERIODIC):
+        assert de_boor_core.compare_basis_with_scalar(kv_type=kv_type) < 1e-12
@@ -0,0 +1,104 @@
+"""
+Headless checks of the profiler attribution on a small recorded-style dump (tests/data/profile_dump.json).
+profile_report has no Maya imports, nothing is stubbed.
+
+The dump covers 2 frames. Thread 1 nests L_armUpper_DCM in L_armIk_IKH, both inside an EvaluationGraph event that is
+not a node. Thread 2 overlaps it in time with events that are not nested in anything.
+"""
+
+import os
+import sys
+
+import pytest
+
+SCRIPTS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "scripts")
+if SCRIPTS_PATH not in sys.path:
+    sys.path.insert(0, SCRIPTS_PATH)
+
+from puiastreTools.utils import profile_report
+
+DUMP_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "profile_dump.json")
+
+
+@pytest.fixture
+def dump():
+    return profile_report.load_dump(DUMP_PATH)
+
+
+def test_self_times(dump):
+    # EvaluationGraph loses its direct children only, L_armIk_IKH loses the nested L_armUpper_DCM, thread 2 is untouched
+    assert profile_report.self_times(dump["events"]) == [500.0, 200.0, 100.0, 200.0, 400.0, 100.0, 50.0]
+
+
+def test_self_times_siblings_and_ties():
+    events = [
+        ["parent", "", "", 0, 100, 1],
+        ["first", "", "", 0, 40, 1],
+        ["second", "", "", 40, 60, 1],
+        ["after", "", "", 100, 10, 1],
+    ]
+    # Children sharing the parent start and end are nested, an event starting at the parent end is not
+    assert profile_report.self_times(events) == [0.0, 40.0, 60.0, 10.0]
+
+
+def test_module_prefixes(dump):
+    assert profile_report.module_prefixes(dump["modules"] + ["looseGroup"]) == [
+        ("L_armTwist", "L_armTwistModule_GRP"), ("C_spine", "C_spineModule_GRP"), ("L_arm", "L_armModule_GRP")
+    ]
+
+
+def test_node_module(dump):
+    prefixes = profile_report.module_prefixes(dump["modules"])
+    nodes = dump["nodes"]
+
+    # Owning group first, even if a longer prefix matches the name
+    assert profile_report.node_module("L_armTwistFake_PM", {"module": "L_armModule_GRP"}, prefixes) == "L_armModule_GRP"
+    # Longest prefix
+    assert profile_report.node_module("L_armTwist01_PM", nodes["L_armTwist01_PM"], prefixes) == "L_armTwistModule_GRP"
+    assert profile_report.node_module("L_armUpper_DCM", nodes["L_armUpper_DCM"], prefixes) == "L_armModule_GRP"
+    assert profile_report.node_module("|rig:grp|rig:L_armTwist02_PM", None, prefixes) == "L_armTwistModule_GRP"
+    # side_module fallback, then unassigned
+    assert profile_report.node_module("R_legFoot_BM", nodes["R_legFoot_BM"], prefixes) == "R_leg"
+    assert profile_report.node_module("perspShape", nodes["perspShape"], prefixes) == profile_report.UNASSIGNED
+
+
+def test_module_report(dump):
+    report = profile_report.module_report(dump)
+
+    assert [entry["module"] for entry in report] == [
+        "L_armTwistModule_GRP", "L_armModule_GRP", "C_spineModule_GRP", "R_leg", profile_report.UNASSIGNED, "other"
+    ]
+    costs = {entry["module"]: entry["ms_per_frame"] for entry in report}
+    assert costs == pytest.approx({
+        "L_armTwistModule_GRP": 0.2, "L_armModule_GRP": 0.15, "C_spineModule_GRP": 0.1, "R_leg": 0.05,
+        profile_report.UNASSIGNED: 0.025, "other": 0.25,
+    })
+
+    arm = report[1]
+    assert arm["nodes"] == 2
+    assert list(arm["node_types"]) == ["ikHandle", "decomposeMatrix"]
+    assert arm["node_types"] == pytest.approx({"ikHandle": 0.1, "decomposeMatrix": 0.05})
+
+    assert report[-1] == {"module": "other", "ms_per_frame": pytest.approx(0.25), "nodes": 0, "node_types": {}}
+    # Self times are attributed once, the totals add up to the recorded root time
+    assert sum(costs.values()) == pytest.approx((1000 + 400 + 100 + 50) / 1000.0 / dump["frames"])
+
+
+def test_module_report_without_other(dump):
+    dump["events"] = [event for event in dump["events"] if event[0] != "EvaluationGraph"]
+    assert "other" not in [entry["module"] for entry in profile_report.module_report(dump)]
+
+
+def test_format_report(dump):
+    lines = profile_report.format_report(profile_report.module_report(dump), top_types=1).splitlines()
+
+    assert len(lines) == 7
+    assert lines[1].startswith("L_armTwistModule_GRP") and "pickMatrix 0.200" in lines[1]
+    assert "ikHandle 0.100" in lines[2] and "decomposeMatrix" not in lines[2]
+    assert lines[-1].startswith("other")
+
+
+def test_dump_round_trip(dump, tmp_path):
+    path = str(tmp_path / "dump.json")
+    profile_report.save_dump(path, dump)
+    assert profile_report.load_dump(path) == dump
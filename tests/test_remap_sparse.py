@@ -0,0 +1,113 @@
+"""
+Headless checks of skin_weights.remap_sparse against a dense reference of the same blend.
+skin_weights has no Maya imports, nothing is stubbed.
+"""
+
+import os
+import sys
+
+import numpy as np
+import pytest
+
+SCRIPTS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "scripts")
+if SCRIPTS_PATH not in sys.path:
+    sys.path.insert(0, SCRIPTS_PATH)
+
+from puiastreTools.utils import skin_weights
+from puiastreTools.utils import spatial
+
+
+def _skin(vtx_count, num_infs, seed, per_vertex=3):
+    rng = np.random.default_rng(seed)
+    weights = np.zeros((vtx_count, num_infs))
+    for vertex in range(vtx_count):
+        columns = rng.choice(num_infs, size=min(per_vertex, num_infs), replace=False)
+        weights[vertex, columns] = rng.random(columns.size) + 0.05
+    weights /= weights.sum(axis=1, keepdims=True)
+    weights[::11] *= 0.5
+    weights[::17] = 0.0
+
+    names = [f"joint{i}_JNT" for i in range(num_infs)]
+    return weights, names, skin_weights.sparse_encode(weights, names)
+
+
+def _dense_reference(source, indices, weights):
+    blended = np.einsum("vk,vki->vi", weights, source[indices])
+    target_sums = np.einsum("vk,vk->v", weights, source.sum(axis=1)[indices])
+    sums = blended.sum(axis=1)
+    scale = np.divide(target_sums, sums, out=np.zeros_like(sums), where=sums > 0)
+    return blended * scale[:, None]
+
+
+def _decode(sparse_weights, vtx_count, names):
+    return skin_weights.sparse_decode(sparse_weights, vtx_count, names)
+
+
+@pytest.mark.parametrize("k", [1, 4])
+@pytest.mark.parametrize("chunk_size", [7, 1000])
+def test_matches_dense_reference(k, chunk_size):
+    source, names, sparse_weights = _skin(300, 12, seed=k)
+    rng = np.random.default_rng(10 + k)
+    indices = rng.integers(0, len(source), size=(257, k))
+    weights = rng.random((257, k))
+    weights /= weights.sum(axis=1, keepdims=True)
+
+    remapped = skin_weights.remap_sparse(sparse_weights, len(source), names, indices, weights, chunk_size=chunk_size)
+
+    expected = _dense_reference(_decode(sparse_weights, len(source), names), indices, weights)
+    np.testing.assert_allclose(_decode(remapped, len(indices), names), expected, rtol=0, atol=1e-5)
+
+
+def test_identity_map():
+    source, names, sparse_weights = _skin(200, 8, seed=3)
+    points = np.random.default_rng(7).random((200, 3))
+    indices, weights = spatial.closest_point_map(points, points)
+    np.testing.assert_array_equal(indices[:, 0], np.arange(200))
+
+    remapped = skin_weights.remap_sparse(sparse_weights, len(source), names, indices, weights)
+
+    assert set(remapped) == set(sparse_weights)
+    for name, block in sparse_weights.items():
+        np.testing.assert_array_equal(remapped[name]["ix"], block["ix"])
+        np.testing.assert_allclose(remapped[name]["vw"], block["vw"], rtol=0, atol=1e-12)
+
+
+def test_keeps_vertex_sums():
+    source, names, sparse_weights = _skin(150, 10, seed=4)
+    rng = np.random.default_rng(5)
+    indices, weights = spatial.interpolation_map(rng.random((150, 3)), rng.random((180, 3)), k=4)
+
+    remapped = _decode(skin_weights.remap_sparse(sparse_weights, len(source), names, indices, weights), 180, names)
+
+    expected_sums = np.einsum("vk,vk->v", weights, source.sum(axis=1)[indices])
+    np.testing.assert_allclose(remapped.sum(axis=1), expected_sums, rtol=0, atol=1e-4)
+
+
+def test_influence_subset_and_unknown_influences():
+    source, names, sparse_weights = _skin(100, 6, seed=6)
+    sparse_weights = dict(sparse_weights, missing_JNT={"ix": [0, 1], "vw": [1.0, 1.0]})
+    indices = np.arange(100)[::-1, None]
+
+    subset = names[:3]
+    remapped = skin_weights.remap_sparse(sparse_weights, len(source), subset, indices, np.ones((100, 1)))
+
+    assert set(remapped) <= set(subset)
+    expected = _dense_reference(source[:, :3], indices, np.ones((100, 1)))
+    np.testing.assert_allclose(_decode(remapped, 100, subset), expected, rtol=0, atol=1e-5)
+
+
+def test_empty_inputs():
+    indices, weights = np.zeros((5, 1), dtype=np.int64), np.ones((5, 1))
+    assert skin_weights.remap_sparse({}, 10, [], indices, weights) == {}
+    assert skin_weights.remap_sparse({}, 10, ["a_JNT"], indices, weights) == {}
+
+
+def test_decode_flat_drops_out_of_range_vertices():
+    sparse_weights = {
+        "a_JNT": {"ix": [-1, 0, 3, 4], "vw": [0.1, 0.2, 0.3, 0.4]},
+        "b_JNT": {"ix": [-2, 1, 5], "vw": [0.5, 0.6, 0.7]},
+    }
+    flat_indices, values = skin_weights.sparse_decode_flat(sparse_weights, 4, ["a_JNT", "b_JNT"])
+
+    np.testing.assert_array_equal(flat_indices, [0, 3, 6])
+    np.testing.assert_array_equal(values, [0.2, 0.6, 0.3])
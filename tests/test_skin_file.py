@@ -0,0 +1,95 @@
+"""
+Headless checks of the .skn v1 <-> v2 round trip and of the v2 reader lifetime.
+skin_file has no Maya imports, nothing is stubbed.
+"""
+
+import json
+import os
+import sys
+
+import numpy as np
+import pytest
+
+SCRIPTS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "scripts")
+if SCRIPTS_PATH not in sys.path:
+    sys.path.insert(0, SCRIPTS_PATH)
+
+from puiastreTools.utils import skin_file
+
+
+def _v1_data():
+    rng = np.random.default_rng(0)
+    positions = np.round(rng.normal(size=(6, 3)) * [1, 1, 1] + [123456.78901, -98765.4321, 0.00001], 5)
+    return {
+        "body_GEO": [{
+            "name": "body_SKN",
+            "vertex_count": 6,
+            "attributes": {"skinningMethod": 0, "maxInfluences": 4},
+            "influences": ["a_JNT", "b_JNT", "c_JNT"],
+            "sparse_weights": {
+                "a_JNT": {"ix": [0, 1, 2, 5], "vw": [1.0, 0.33333, 0.5, 0.12345]},
+                "b_JNT": {"ix": [1, 2, 3, 4], "vw": [0.66667, 0.5, 1.0, 1.0]},
+                "c_JNT": {"ix": [5], "vw": [0.87655]},
+            },
+            "sparse_blend": {"ix": [2, 3], "vw": [0.25, 0.75]},
+            "positions": positions.ravel().tolist(),
+        }]
+    }
+
+
+@pytest.fixture
+def v1_path(tmp_path):
+    path = str(tmp_path / "v1.skn")
+    with open(path, "w") as f:
+        json.dump(_v1_data(), f, separators=(",", ":"))
+    return path
+
+
+def test_round_trip_is_lossless(v1_path, tmp_path):
+    v2_path, back_path = str(tmp_path / "v2.skn"), str(tmp_path / "back.skn")
+    skin_file.convert_v1_to_v2(v1_path, v2_path)
+    skin_file.convert_v2_to_v1(v2_path, back_path)
+
+    with open(back_path) as f:
+        assert json.load(f) == _v1_data()
+
+
+def test_positions_far_from_origin(v1_path, tmp_path):
+    v2_path = str(tmp_path / "v2.skn")
+    skin_file.convert_v1_to_v2(v1_path, v2_path)
+
+    with skin_file.SknFile(v2_path) as skn:
+        positions = skn["body_GEO"][0]["positions"]
+
+    assert positions.dtype == np.float64
+    np.testing.assert_array_equal(positions, _v1_data()["body_GEO"][0]["positions"])
+
+
+def test_records_outlive_close(v1_path, tmp_path):
+    v2_path = str(tmp_path / "v2.skn")
+    skin_file.convert_v1_to_v2(v1_path, v2_path)
+
+    skn = skin_file.load(v2_path)
+    record = skn["body_GEO"][0]
+    skn.close()
+
+    np.testing.assert_array_equal(record["sparse_weights"]["b_JNT"]["ix"], [1, 2, 3, 4])
+    np.testing.assert_allclose(record["sparse_blend"]["vw"], [0.25, 0.75])
+
+    # Nothing keeps the file mapped, it can be overwritten while the records are alive
+    skin_file.convert_v1_to_v2(v1_path, v2_path)
+    os.replace(v2_path, str(tmp_path / "moved.skn"))
+
+
+def test_quantized_file_keeps_blend_weights(tmp_path):
+    v2_path = str(tmp_path / "game.skn")
+    skin_file.write_v2(v2_path, _v1_data(), quantize=True)
+
+    with skin_file.SknFile(v2_path) as skn:
+        entry = skn.skin_index("body_GEO")[0]
+        record = skn["body_GEO"][0]
+
+    assert entry["vw"]["dtype"] == skin_file.QUANTIZED_DTYPE
+    assert entry["blend_vw"]["dtype"] == skin_file.WEIGHT_DTYPE
+    np.testing.assert_array_equal(record["sparse_blend"]["vw"], np.float32([0.25, 0.75]))
+    np.testing.assert_allclose(record["sparse_weights"]["a_JNT"]["vw"], [1.0, 0.33333, 0.5, 0.12345], atol=0.5 / 65535)
@@ -0,0 +1,154 @@
+"""
+Headless checks of the NumPy KD-tree and the vertex maps built on it, against brute force.
+spatial has no Maya imports, nothing is stubbed.
+"""
+
+import os
+import sys
+
+import numpy as np
+import pytest
+
+SCRIPTS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "scripts")
+if SCRIPTS_PATH not in sys.path:
+    sys.path.insert(0, SCRIPTS_PATH)
+
+from puiastreTools.utils import spatial
+
+
+def _brute_force(points, queries, k):
+    distances = np.sqrt(np.sum((queries[:, None, :] - points[None, :, :]) ** 2, axis=2))
+    return np.sort(distances, axis=1)[:, :k]
+
+
+def _assert_matches_brute_force(points, queries, k, leaf_size=spatial.LEAF_SIZE):
+    distances, indices = spatial.KDTree(points, leaf_size=leaf_size).query(queries, k=k)
+    found = min(k, len(points))
+
+    np.testing.assert_allclose(distances[:, :found], _brute_force(points, queries, found), rtol=0, atol=1e-12)
+    # Indices may differ from brute force on ties, they must point to points at the returned distance
+    np.testing.assert_allclose(np.linalg.norm(points[indices[:, :found]] - queries[:, None, :], axis=2),
+                               distances[:, :found], rtol=0, atol=1e-12)
+    assert all(len(set(row)) == found for row in indices[:, :found].tolist())
+    return distances, indices
+
+
+@pytest.mark.parametrize("count", [1, 2, 15, 16, 17, 500, 3000])
+@pytest.mark.parametrize("k", [1, 4])
+def test_random_points(count, k):
+    rng = np.random.default_rng(count * 10 + k)
+    _assert_matches_brute_force(rng.random((count, 3)), rng.random((200, 3)) * 1.4 - 0.2, k)
+
+
+def test_small_leaves():
+    rng = np.random.default_rng(1)
+    _assert_matches_brute_force(rng.normal(size=(700, 3)), rng.normal(size=(300, 3)), 6, leaf_size=2)
+
+
+def test_duplicate_points():
+    rng = np.random.default_rng(2)
+    unique = rng.random((40, 3))
+    points = np.concatenate([unique, unique, unique[:10], np.zeros((30, 3))])
+    queries = np.concatenate([unique[:20], np.zeros((5, 3)), rng.random((50, 3))])
+
+    distances, _ = _assert_matches_brute_force(points, queries, 4)
+    assert np.all(distances[:20, :2] == 0.0)
+
+
+def test_all_points_identical():
+    distances, indices = _assert_matches_brute_force(np.ones((50, 3)), np.array([[1.0, 1.0, 1.0], [0.0, 1.0, 1.0]]), 3)
+    np.testing.assert_array_equal(distances, [[0.0] * 3, [1.0] * 3])
+
+
+def test_k_bigger_than_point_count():
+    rng = np.random.default_rng(3)
+    points = rng.random((5, 3))
+    distances, indices = _assert_matches_brute_force(points, rng.random((20, 3)), 8)
+
+    assert np.all(indices[:, 5:] == -1)
+    assert np.all(np.isinf(distances[:, 5:]))
+    assert np.array_equal(np.sort(indices[:, :5], axis=1), np.tile(np.arange(5), (20, 1)))
+
+
+@pytest.mark.parametrize("axis", [0, 1, 2])
+def test_planar_points(axis):
+    rng = np.random.default_rng(4 + axis)
+    points = rng.random((1000, 3))
+    points[:, axis] = 0.5
+    queries = rng.random((200, 3))
+    queries[:100, axis] = 0.5
+
+    _assert_matches_brute_force(points, queries, 4)
+
+
+def test_collinear_grid_points():
+    grid = np.stack(np.meshgrid(np.arange(12.0), np.arange(12.0), [0.0], indexing="ij"), axis=-1).reshape(-1, 3)
+    line = np.stack([np.linspace(0, 1, 64), np.zeros(64), np.zeros(64)], axis=1)
+
+    _assert_matches_brute_force(grid, grid[::7] + 0.25, 4)
+    _assert_matches_brute_force(line, np.array([[0.5, 1.0, 0.0], [2.0, 0.0, 0.0], [-1.0, 0.0, 3.0]]), 5)
+
+
+def test_query_chunks():
+    rng = np.random.default_rng(5)
+    points, queries = rng.random((400, 3)), rng.random((333, 3))
+    tree = spatial.KDTree(points)
+
+    chunked = tree.query(queries, k=3, chunk_size=50)
+    whole = tree.query(queries, k=3)
+    np.testing.assert_array_equal(chunked[0], whole[0])
+    np.testing.assert_array_equal(chunked[1], whole[1])
+
+
+def test_empty_tree():
+    with pytest.raises(ValueError):
+        spatial.KDTree(np.zeros((0, 3)))
+
+
+def test_closest_point_map():
+    rng = np.random.default_rng(6)
+    source, target = rng.random((300, 3)), rng.random((120, 3))
+    indices, weights = spatial.closest_point_map(source, target)
+
+    assert indices.shape == weights.shape == (120, 1)
+    assert np.all(weights == 1.0)
+    np.testing.assert_allclose(np.linalg.norm(source[indices[:, 0]] - target, axis=1), _brute_force(source, target, 1)[:, 0])
+
+
+def test_interpolation_map():
+    rng = np.random.default_rng(7)
+    source = rng.random((300, 3))
+    target = np.concatenate([source[:10], rng.random((90, 3))])
+    indices, weights = spatial.interpolation_map(source, target, k=4)
+
+    assert indices.shape == weights.shape == (100, 4)
+    np.testing.assert_allclose(weights.sum(axis=1), 1.0)
+    np.testing.assert_array_equal(indices[:10, 0], np.arange(10))
+    np.testing.assert_array_equal(weights[:10], np.tile([1.0, 0.0, 0.0, 0.0], (10, 1)))
+    # Closer source vertices weigh more
+    assert np.all(np.diff(weights[10:], axis=1) <= 1e-12)
+
+    indices, weights = spatial.interpolation_map(source[:2], target, k=4)
+    assert indices.shape == (100, 2)
+
+
+def test_mirror_map():
+    rng = np.random.default_rng(8)
+    right = rng.random((200, 3)) + [0.1, 0.0, 0.0]
+    center = rng.random((10, 3)) * [0.0, 1.0, 1.0]
+    points = np.concatenate([right, right * [-1.0, 1.0, 1.0], center])
+    order = rng.permutation(len(points))
+    points = points[order]
+
+    mirror, found = spatial.mirror_map(points, axis=0, tolerance=1e-6)
+
+    assert found.all()
+    np.testing.assert_allclose(points[mirror], points * [-1.0, 1.0, 1.0])
+    np.testing.assert_array_equal(mirror[mirror], np.arange(len(points)))
+
+    # A side vertex moved off its mirror loses its mirror, and its mirror loses it
+    moved = int(np.flatnonzero(order == 0)[0])
+    shifted = points.copy()
+    shifted[moved] += [0.0, 0.0, 0.01]
+    _, found = spatial.mirror_map(shifted, axis=0, tolerance=1e-6)
+    assert not found[moved] and not found[mirror[moved]] and found.sum() == len(points) - 2